@@ -542,7 +542,8 @@ class EdafaAdmissionPortal(http.Controller):
             try:
                 template = request.env.ref('edafa_website_branding.admission_confirmation_email', raise_if_not_found=False)
                 if template:
-                    template.sudo().send_mail(admission.id, force_send=True)
+                    # Queued: the mail scheduler sends it, outside of the request
+                    template.sudo().send_mail(admission.id)
             except:
                 pass  # Don't fail if email template doesn't exist yet
             
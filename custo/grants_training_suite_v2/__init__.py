@@ -6,6 +6,9 @@
 # Import models
 from . import models
 
+# Import controllers
+from . import controllers
+
 # Import tests
 # from . import tests  # Temporarily disabled due to import error
 
@@ -13,4 +16,4 @@ from . import models
 # from . import wizard
 
 # Import utils (Phase 2)
-# from . import utils
+from . import utils
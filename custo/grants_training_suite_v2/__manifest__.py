@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 't66',
-    'version': '19.0.1.13.0',
+    'version': '19.0.1.14.0',
     'category': 'Education',
     'summary': 'Training center management from grant intake to certification',
     'description': """
@@ -48,6 +48,7 @@
         'views/intake_batch_views.xml',
         'views/intake_batch_mapping_wizard_views.xml',
         'views/intake_batch_correction_wizard_views.xml',
+        'views/intake_batch_job_views.xml',
         'views/session_template_views.xml',
         'views/enrollment_wizard_views.xml',
         'views/homework_grade_history_views.xml',
@@ -66,6 +67,7 @@
         'views/integration_reports.xml',
         'views/training_dashboard_views.xml',
         'views/notification_system_views.xml',
+        'views/notification_outbox_views.xml',
         'views/certificate_automation_views.xml',
         'views/menu_views.xml',
     ],
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+from odoo import http
+from odoo.http import request
+
+
+class TrainingDashboardController(http.Controller):
+
+    @http.route('/grants_training/dashboard/<int:dashboard_id>/data', type='http', auth='user', methods=['GET'])
+    def dashboard_data(self, dashboard_id, **kwargs):
+        """Serve the pre-serialised dashboard payload, answering 304 when the client copy is current."""
+        dashboard = request.env['gr.training.dashboard'].browse(dashboard_id).exists()
+        if not dashboard:
+            raise request.not_found()
+        dashboard.check_access('read')
+
+        etag, payload = dashboard._get_serialized_payload()
+        headers = [('Cache-Control', 'private, no-cache')]
+        if request.httprequest.if_none_match.contains(etag):
+            response = request.make_response('', headers=headers, status=304)
+        else:
+            response = request.make_response(payload, headers=headers + [('Content-Type', 'application/json')])
+        response.set_etag(etag)
+        return response
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import api, SUPERUSER_ID
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# Certificates moved to attachments per query, to keep the file contents out of memory
+BATCH_SIZE = 100
+
+
+def migrate(cr, version):
+    """Post-migration script for version 19.0.1.14.0 - certificate files stored as attachments.
+
+    ``gr.certificate.certificate_file`` became an attachment field; its former
+    column still holds the files of the existing certificates. They are moved
+    into ``ir.attachment`` and the column is dropped.
+    """
+    if not column_exists(cr, 'gr_certificate', 'certificate_file'):
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Attachment = env['ir.attachment']
+
+    moved = 0
+    last_id = 0
+    while True:
+        cr.execute("""
+            SELECT id, certificate_file
+              FROM gr_certificate
+             WHERE certificate_file IS NOT NULL AND id > %s
+          ORDER BY id
+             LIMIT %s
+        """, (last_id, BATCH_SIZE))
+        rows = cr.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        # The column stored the base64 encoded files, as ``datas`` expects them
+        Attachment.create([{
+            'name': 'certificate_file',
+            'res_model': 'gr.certificate',
+            'res_field': 'certificate_file',
+            'res_id': certificate_id,
+            'datas': bytes(content),
+        } for certificate_id, content in rows])
+        Attachment.invalidate_model()
+        moved += len(rows)
+
+    cr.execute('ALTER TABLE gr_certificate DROP COLUMN certificate_file')
+    _logger.info('Moved %d certificate files to attachments', moved)
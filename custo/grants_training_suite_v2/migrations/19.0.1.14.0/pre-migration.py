@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import ast
+import json
+import logging
+
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# Dashboard analytics turned from Text holding str() of Python values into Json
+ANALYTICS_COLUMNS = (
+    'progress_distribution', 'monthly_enrollments', 'completion_trends', 'top_performers',
+    'struggling_students', 'engagement_metrics', 'course_performance', 'popular_courses',
+    'integration_status_summary',
+)
+
+
+def migrate(cr, version):
+    """Pre-migration script for version 19.0.1.14.0 - JSON dashboard analytics.
+
+    Rewrites the stored analytics as JSON so that the conversion of the columns
+    to jsonb succeeds; values that cannot be read are cleared and recomputed on
+    the next dashboard refresh.
+    """
+    for column in ANALYTICS_COLUMNS:
+        if not column_exists(cr, 'gr_training_dashboard', column):
+            continue
+        cr.execute(f'SELECT id, "{column}" FROM gr_training_dashboard WHERE "{column}" IS NOT NULL')
+        rows = cr.fetchall()
+        cleared = 0
+        for dashboard_id, value in rows:
+            try:
+                converted = json.dumps(ast.literal_eval(value))
+            except (ValueError, SyntaxError, TypeError):
+                converted = None
+                cleared += 1
+            cr.execute(f'UPDATE gr_training_dashboard SET "{column}" = %s WHERE id = %s', (converted, dashboard_id))
+        _logger.info('Converted %d dashboard %s values to JSON (%d cleared)', len(rows), column, cleared)
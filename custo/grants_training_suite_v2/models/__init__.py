@@ -12,6 +12,9 @@ from . import intake_batch_mapping_wizard
 # Model 1.2: Intake Batch Correction Wizard (Phase 3.1.2)
 from . import intake_batch_correction_wizard
 
+# Model 1.3: Intake Batch Background Processing Job
+from . import intake_batch_job
+
 # Model 2: Student
 from . import student
 
@@ -40,13 +43,28 @@ from . import training_program
 # Model 10: Progress Tracker
 from . import progress_tracker
 
+# Model 10.1: eLearning Enrollment (progress push)
+from . import slide_channel_partner
+
 # Phase 3: Advanced Analytics Models
 # Model 11: Training Dashboard
 from . import training_dashboard
 
+# Model 11.1: Training Analytics Daily Facts
+from . import training_analytics_fact
+
+# Model 11.2: Training Dashboard Change Log
+from . import training_dashboard_change
+
 # Model 12: Notification System
 from . import notification_system
 
+# Model 12.1: Notification Outbox and Channel Statistics
+from . import notification_outbox
+
+# Model 12.2: Notification Digest Entries
+from . import notification_digest
+
 # Model 13: Certificate Automation
 from . import certificate_automation
 
@@ -1,12 +1,31 @@
 # -*- coding: utf-8 -*-
 
+import base64
+import hashlib
+import io
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
 
 _logger = logging.getLogger(__name__)
 
+# Success criteria checked before a course completion certificate is created
+CERTIFICATE_CRITERIA = ('overall_progress', 'elearning_progress', 'sessions', 'homework', 'warnings')
+
+# Bulk PDF generation defaults: certificates per wkhtmltopdf run and concurrent runs
+PDF_BATCH_SIZE = 25
+PDF_MAX_WORKERS = 2
+PDF_COMMAND_LINE = '--page-size A4 --orientation Portrait --margin-top 1in --margin-bottom 1in --margin-left 1in --margin-right 1in'
+
+# Version of the PDF pipeline, part of the content hash; bump it to force a re-render of all certificates
+PDF_RENDER_VERSION = 1
+
+
 class Certificate(models.Model):
     _name = 'gr.certificate'
     _description = 'Grants Training Certificate'
@@ -27,6 +46,7 @@ class Certificate(models.Model):
         string='Student',
         required=True,
         tracking=True,
+        index=True,
         help='Student receiving the certificate'
     )
     
@@ -195,6 +215,7 @@ class Certificate(models.Model):
     # Certificate File
     certificate_file = fields.Binary(
         string='Certificate File',
+        attachment=True,
         help='Digital certificate file'
     )
     
@@ -203,6 +224,14 @@ class Certificate(models.Model):
         help='Name of the certificate file'
     )
     
+    pdf_content_hash = fields.Char(
+        string='PDF Content Hash',
+        index=True,
+        copy=False,
+        readonly=True,
+        help='Hash of the rendered HTML and template the stored PDF was generated from'
+    )
+    
     # Delivery Information
     delivery_date = fields.Date(
         string='Delivery Date',
@@ -325,6 +354,12 @@ class Certificate(models.Model):
         
         return certificate
     
+    def write(self, vals):
+        """Forget the content hash when the certificate file is replaced by hand."""
+        if 'certificate_file' in vals and 'pdf_content_hash' not in vals:
+            vals = dict(vals, pdf_content_hash=False)
+        return super(Certificate, self).write(vals)
+    
     def action_issue(self):
         """Action to issue the certificate."""
         self.ensure_one()
@@ -558,35 +593,23 @@ class Certificate(models.Model):
         if not self.template_id:
             raise UserError(_('Please select a template first.'))
         
-        try:
-            # Render the content
-            rendered = self.render_certificate_content()
-            
-            # Generate PDF using report engine
-            pdf_content = self._generate_certificate_pdf(rendered)
-            
-            # Update template usage count
-            self.template_id.action_update_usage_count()
-            
-            # Store the PDF file
-            self.certificate_file = pdf_content
-            self.certificate_filename = f'certificate_{self.name}_{self.student_id.name.replace(" ", "_")}.pdf'
-            
-            _logger.info('Certificate PDF generated successfully for certificate: %s', self.name)
-            
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('Certificate Generated'),
-                    'message': _('Certificate PDF has been generated successfully.'),
-                    'type': 'success',
-                }
+        # Render through the bulk pipeline, which skips the PDF when the content is unchanged
+        stats = self._generate_certificate_pdfs_bulk()
+        if stats['failed']:
+            _logger.error('Error generating certificate PDF for %s: %s', self.name, '; '.join(stats['errors']))
+            raise UserError(_('Error generating certificate PDF: %s') % '; '.join(stats['errors']))
+        
+        _logger.info('Certificate PDF generated successfully for certificate: %s', self.name)
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Certificate Generated'),
+                'message': _('Certificate PDF is already up to date.') if stats['reused'] else _('Certificate PDF has been generated successfully.'),
+                'type': 'success',
             }
-            
-        except Exception as e:
-            _logger.error('Error generating certificate PDF for %s: %s', self.name, str(e))
-            raise UserError(_('Error generating certificate PDF: %s') % str(e))
+        }
     
     def _generate_certificate_pdf(self, rendered_content):
         """Generate PDF content from rendered certificate."""
@@ -597,93 +620,228 @@ class Certificate(models.Model):
         
         # Generate PDF using wkhtmltopdf
         try:
-            pdf_content = self.env['ir.actions.report']._run_wkhtmltopdf(
-                [html_content],
-                landscape=False,
-                specific_paperformat_args={
-                    'command-line': '--page-size A4 --orientation Portrait --margin-top 1in --margin-bottom 1in --margin-left 1in --margin-right 1in'
-                }
-            )
-            return pdf_content
+            return self._run_certificate_wkhtmltopdf([html_content])
         except Exception as e:
             _logger.error('Error in PDF generation: %s', str(e))
             raise UserError(_('PDF generation failed: %s') % str(e))
     
+    @api.model
+    def _run_certificate_wkhtmltopdf(self, bodies):
+        """Run one wkhtmltopdf process over the given certificate HTML documents."""
+        return self.env['ir.actions.report']._run_wkhtmltopdf(
+            bodies,
+            landscape=False,
+            specific_paperformat_args={
+                'command-line': PDF_COMMAND_LINE
+            }
+        )
+    
+    def _store_certificate_pdf(self, pdf_content, content_hash=False):
+        """Store a generated PDF as the certificate file attachment."""
+        self.ensure_one()
+        self.write({
+            'certificate_file': base64.b64encode(pdf_content),
+            'certificate_filename': f'certificate_{self.name}_{self.student_id.name.replace(" ", "_")}.pdf',
+            'pdf_content_hash': content_hash,
+        })
+    
+    def _share_certificate_pdf(self, source, content_hash):
+        """Reuse the stored PDF of a certificate rendered from the same content.
+        
+        The attachment keeps the same checksum, so the filestore holds the file once.
+        """
+        self.ensure_one()
+        self.write({
+            'certificate_file': source.certificate_file,
+            'certificate_filename': f'certificate_{self.name}_{self.student_id.name.replace(" ", "_")}.pdf',
+            'pdf_content_hash': content_hash,
+        })
+    
+    @api.model
+    def _get_pdf_content_hash(self, html_content, template):
+        """Content address of a certificate PDF: the rendered HTML, the template and the PDF pipeline version."""
+        digest = hashlib.sha256()
+        for part in (str(PDF_RENDER_VERSION), PDF_COMMAND_LINE, str(template.id), html_content):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
     def _prepare_certificate_html(self, rendered_content):
         """Prepare complete HTML content for PDF generation."""
         self.ensure_one()
         
-        # Get template styling
-        template = self.template_id
-        
-        # Build complete HTML document
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Certificate - {self.name}</title>
-            <style>
-                @page {{
-                    size: {template.page_width}in {template.page_height}in;
-                    margin: {template.margin_top}in {template.margin_right}in {template.margin_bottom}in {template.margin_left}in;
-                }}
-                body {{
-                    font-family: {template.font_family}, sans-serif;
-                    background-color: {template.background_color};
-                    color: {template.text_color};
-                    margin: 0;
-                    padding: 0;
-                    line-height: 1.6;
-                }}
-                .certificate-container {{
-                    width: 100%;
-                    height: 100%;
-                    position: relative;
-                    display: flex;
-                    flex-direction: column;
-                    justify-content: space-between;
-                }}
-                .certificate-header {{
-                    flex: 0 0 auto;
-                }}
-                .certificate-body {{
-                    flex: 1;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                }}
-                .certificate-footer {{
-                    flex: 0 0 auto;
-                }}
-                .accent {{
-                    color: {template.accent_color};
-                }}
-                h1, h2, h3 {{
-                    margin: 0;
-                }}
-                p {{
-                    margin: 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="certificate-container">
-                <div class="certificate-header">
-                    {rendered_content.get('header', '')}
-                </div>
-                <div class="certificate-body">
-                    {rendered_content.get('body', '')}
-                </div>
-                <div class="certificate-footer">
-                    {rendered_content.get('footer', '')}
-                </div>
-            </div>
-        </body>
-        </html>
+        # Fill the compiled document shell of the template
+        return self.template_id._get_render_plan()['shell'].render({
+            'name': self.name,
+            'header': rendered_content.get('header', ''),
+            'body': rendered_content.get('body', ''),
+            'footer': rendered_content.get('footer', ''),
+        })
+    
+    # ===== Bulk PDF Generation =====
+    
+    @api.model
+    def _get_pdf_batch_settings(self):
+        """Return the bulk PDF batch size and worker count, configurable through system parameters."""
+        params = self.env['ir.config_parameter'].sudo()
+        batch_size = int(params.get_param('grants_training_suite_v2.certificate_pdf_batch_size', PDF_BATCH_SIZE))
+        max_workers = int(params.get_param('grants_training_suite_v2.certificate_pdf_workers', PDF_MAX_WORKERS))
+        return max(batch_size, 1), max(max_workers, 1)
+    
+    def _generate_certificate_pdfs_bulk(self, batch_size=None, max_workers=None):
+        """Generate the PDF of every certificate in the recordset with batched wkhtmltopdf runs.
+        
+        The HTML of all certificates is prepared first and content addressed:
+        a certificate whose stored PDF was generated from the same content is
+        skipped, and one matching another certificate's PDF shares it. The rest
+        is handed to wkhtmltopdf ``batch_size`` documents per run, with at most
+        ``max_workers`` runs at the same time. Each combined PDF is split back
+        per certificate and stored as the certificate file attachment.
+        
+        :return: dict with the run metrics (total, rendered, reused, failed,
+                 batches, fallback_batches, duration, errors)
+        """
+        default_batch_size, default_workers = self._get_pdf_batch_settings()
+        batch_size = batch_size or default_batch_size
+        max_workers = max_workers or default_workers
+        started = time.monotonic()
+        errors = []
+        
+        # Render the templates, build the HTML documents and hash them
+        documents = []
+        for certificate in self:
+            if not certificate.template_id:
+                errors.append(f'{certificate.name}: No template selected')
+                continue
+            try:
+                rendered = certificate.render_certificate_content()
+                html_content = certificate._prepare_certificate_html(rendered)
+                documents.append((certificate, html_content,
+                                  self._get_pdf_content_hash(html_content, certificate.template_id)))
+            except Exception as e:
+                errors.append(f'{certificate.name}: {str(e)}')
+        
+        # Skip up-to-date PDFs and share the ones already stored for the same content
+        stored = {}
+        for source in self.search([
+            ('pdf_content_hash', 'in', list({content_hash for certificate, html_content, content_hash in documents})),
+            ('certificate_file', '!=', False),
+        ]):
+            stored[source.pdf_content_hash] = stored.get(source.pdf_content_hash, self.browse()) | source
+        
+        reused_certificates = self.browse()
+        pending = {}
+        for certificate, html_content, content_hash in documents:
+            sources = stored.get(content_hash)
+            if sources:
+                if certificate not in sources:
+                    certificate._share_certificate_pdf(sources[0], content_hash)
+                reused_certificates |= certificate
+            elif content_hash in pending:
+                pending[content_hash][1] |= certificate
+            else:
+                pending[content_hash] = [html_content, certificate]
+        
+        documents = list(pending.items())
+        batches = [documents[index:index + batch_size] for index in range(0, len(documents), batch_size)]
+        results = self._render_pdf_batches(
+            [[html_content for content_hash, (html_content, certificates) in batch] for batch in batches], max_workers)
+        
+        # Store the PDF of each rendered document
+        rendered_certificates = self.browse()
+        fallback_batches = 0
+        for batch, (pdfs, fallback) in zip(batches, results):
+            fallback_batches += fallback
+            for (content_hash, (html_content, certificates)), (pdf_content, error) in zip(batch, pdfs):
+                if error:
+                    errors.extend(f'{certificate.name}: {error}' for certificate in certificates)
+                    continue
+                certificates[0]._store_certificate_pdf(pdf_content, content_hash)
+                for certificate in certificates[1:]:
+                    certificate._share_certificate_pdf(certificates[0], content_hash)
+                rendered_certificates |= certificates
+        
+        for template in rendered_certificates.template_id:
+            template.write({
+                'usage_count': template.usage_count + len(rendered_certificates.filtered(lambda c: c.template_id == template)),
+                'last_used_date': fields.Datetime.now(),
+            })
+        
+        stats = {
+            'total': len(self),
+            'rendered': len(rendered_certificates),
+            'reused': len(reused_certificates),
+            'failed': len(self) - len(rendered_certificates) - len(reused_certificates),
+            'batches': len(batches),
+            'fallback_batches': fallback_batches,
+            'duration': time.monotonic() - started,
+            'errors': errors,
+        }
+        _logger.info('Bulk certificate PDF generation: %d rendered, %d reused, %d failed in %d batches (%.1fs)',
+                    stats['rendered'], stats['reused'], stats['failed'], stats['batches'], stats['duration'])
+        return stats
+    
+    @api.model
+    def _render_pdf_batches(self, batches, max_workers):
+        """Render the HTML batches with at most ``max_workers`` wkhtmltopdf processes at once.
+        
+        Each worker thread drives one wkhtmltopdf process on its own cursor.
+        Batches run inline when there is a single worker or batch, and in tests.
+        """
+        if max_workers == 1 or len(batches) <= 1 or getattr(threading.current_thread(), 'testing', False):
+            return [self._render_pdf_batch(bodies) for bodies in batches]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._render_pdf_batch_in_worker, batches))
+    
+    @api.model
+    def _render_pdf_batch_in_worker(self, bodies):
+        """Render one batch from a pool thread, with a dedicated cursor."""
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            return env['gr.certificate']._render_pdf_batch(bodies)
+    
+    @api.model
+    def _render_pdf_batch(self, bodies):
+        """Render a batch of certificate documents with a single wkhtmltopdf run.
+        
+        wkhtmltopdf starts every document on a new page, so a combined PDF with
+        one page per document is split back page by page. Any other page count,
+        or a failed run, falls back to one run per document.
+        
+        :return: tuple (list of (pdf_content, error) per document, whether the batch fell back)
         """
+        try:
+            documents = self._split_pdf_pages(self._run_certificate_wkhtmltopdf(bodies), len(bodies))
+            if documents:
+                return [(pdf_content, None) for pdf_content in documents], False
+            _logger.warning('Certificate batch of %d documents did not split per page, rendering one by one', len(bodies))
+        except Exception as e:
+            _logger.warning('Certificate batch PDF generation failed, rendering one by one: %s', str(e))
         
-        return html_content
+        results = []
+        for body in bodies:
+            try:
+                results.append((self._run_certificate_wkhtmltopdf([body]), None))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results, True
+    
+    @api.model
+    def _split_pdf_pages(self, pdf_content, count):
+        """Split a combined PDF into ``count`` single-page PDFs, or return None when the page count differs."""
+        if count == 1:
+            return [pdf_content]
+        reader = PdfFileReader(io.BytesIO(pdf_content), strict=False)
+        if reader.getNumPages() != count:
+            return None
+        documents = []
+        for page_number in range(count):
+            writer = PdfFileWriter()
+            writer.addPage(reader.getPage(page_number))
+            stream = io.BytesIO()
+            writer.write(stream)
+            documents.append(stream.getvalue())
+        return documents
     
     # ===== Phase 5.2: Automated Certificate Generation =====
     
@@ -810,39 +968,101 @@ Training Team
     
     def _find_completed_students_without_certificates(self):
         """Find students who have completed programs but don't have certificates."""
-        completed_students = []
+        eligibility = self._evaluate_certificate_eligibility()
+        if eligibility['not_eligible']:
+            _logger.info('%d completed trackers do not meet the success criteria: %s',
+                        eligibility['not_eligible'], eligibility['failure_counts'])
         
-        # Find students with completed progress trackers
-        completed_trackers = self.env['gr.progress.tracker'].search([
-            ('status', '=', 'completed'),
-            ('completion_date', '!=', False),
+        trackers = self.env['gr.progress.tracker'].browse([
+            row['tracker_id'] for row in eligibility['rows'] if row['eligible']
         ])
+        return [{
+            'student': tracker.student_id,
+            'course': tracker.course_integration_id,
+            'tracker': tracker,
+        } for tracker in trackers]
+    
+    @api.model
+    def _evaluate_certificate_eligibility(self):
+        """Evaluate the success criteria of all completed progress trackers at once.
         
-        for tracker in completed_trackers:
-            student = tracker.student_id
-            course = tracker.course_integration_id
-            
-            # Enhanced success criteria validation
-            if not self._validate_success_criteria(tracker, student, course):
-                _logger.info('Student %s does not meet success criteria for course %s', 
-                           student.name, course.name)
-                continue
-            
-            # Check if student already has a certificate for this course
-            existing_certificate = self.search([
-                ('student_id', '=', student.id),
-                ('course_name', '=', course.name),
-                ('state', 'in', ['issued', 'delivered', 'verified']),
-            ])
-            
-            if not existing_certificate:
-                completed_students.append({
-                    'student': student,
-                    'course': course,
-                    'tracker': tracker,
-                })
+        A single query joins the completed trackers with their course, compares
+        the progress with the course thresholds and flags the trackers whose
+        student already has an issued certificate for the course.
         
-        return completed_students
+        :return: eligibility summary, see ``_summarize_eligibility``
+        """
+        for model_name in ('gr.progress.tracker', 'gr.course.integration', 'gr.student', 'gr.certificate'):
+            self.env[model_name].flush_model()
+        
+        warnings_field = self.env['gr.student']._fields.get('has_warnings')
+        warnings_sql = 'COALESCE(s.has_warnings, FALSE)' if warnings_field and warnings_field.store else 'FALSE'
+        self.env.cr.execute("""
+            SELECT t.id AS tracker_id,
+                   t.student_id,
+                   s.name AS student_name,
+                   c.name AS course_name,
+                   t.overall_progress,
+                   t.elearning_progress,
+                   t.custom_sessions_completed AS sessions_completed,
+                   t.homework_submissions,
+                   t.completion_date,
+                   COALESCE(t.overall_progress, 0) < COALESCE(c.completion_threshold, 0) AS fail_overall_progress,
+                   c.elearning_course_id IS NOT NULL
+                       AND COALESCE(t.elearning_progress, 0) < COALESCE(c.min_elearning_progress, 0) AS fail_elearning_progress,
+                   COALESCE(c.min_sessions_required, 0) > 0
+                       AND COALESCE(t.custom_sessions_completed, 0) < c.min_sessions_required AS fail_sessions,
+                   COALESCE(c.min_homework_required, 0) > 0
+                       AND COALESCE(t.homework_submissions, 0) < c.min_homework_required AS fail_homework,
+                   %s AS fail_warnings,
+                   EXISTS (
+                       SELECT 1
+                         FROM gr_certificate cert
+                        WHERE cert.student_id = t.student_id
+                          AND cert.course_name = c.name
+                          AND cert.state IN ('issued', 'delivered', 'verified')
+                   ) AS has_certificate
+              FROM gr_progress_tracker t
+              JOIN gr_course_integration c ON c.id = t.course_integration_id
+              JOIN gr_student s ON s.id = t.student_id
+             WHERE t.status = 'completed'
+               AND t.completion_date IS NOT NULL
+             ORDER BY t.id
+        """ % warnings_sql)
+        return self._summarize_eligibility(self.env.cr.dictfetchall(), CERTIFICATE_CRITERIA)
+    
+    @api.model
+    def _summarize_eligibility(self, rows, criteria):
+        """Turn eligibility rows into counts per outcome and per failed criterion.
+        
+        Each row carries a ``has_certificate`` flag and one ``fail_<criterion>``
+        flag per criterion.
+        
+        :return: dict with the ``total`` number of rows, the ``eligible``,
+                 ``not_eligible`` and ``already_certified`` counts, the
+                 ``failure_counts`` per criterion and the ``rows`` without a
+                 certificate, each with its ``criteria_failures`` and ``eligible`` flag
+        """
+        summary = {
+            'total': len(rows),
+            'eligible': 0,
+            'not_eligible': 0,
+            'already_certified': 0,
+            'failure_counts': dict.fromkeys(criteria, 0),
+            'rows': [],
+        }
+        for row in rows:
+            if row['has_certificate']:
+                summary['already_certified'] += 1
+                continue
+            failures = [criterion for criterion in criteria if row['fail_' + criterion]]
+            for criterion in failures:
+                summary['failure_counts'][criterion] += 1
+            row['criteria_failures'] = failures
+            row['eligible'] = not failures
+            summary['eligible' if not failures else 'not_eligible'] += 1
+            summary['rows'].append(row)
+        return summary
     
     def _validate_success_criteria(self, tracker, student, course):
         """Validate that student meets all success criteria for certificate generation."""
@@ -888,95 +1108,31 @@ Training Team
         """Generate a comprehensive report of certificate eligibility for dashboard."""
         _logger.info('Generating certificate eligibility report for dashboard')
         
-        # Get all completed students
-        completed_trackers = self.env['gr.progress.tracker'].search([
-            ('status', '=', 'completed'),
-            ('completion_date', '!=', False),
-        ])
+        eligibility = self._evaluate_certificate_eligibility()
+        failure_counts = eligibility['failure_counts']
         
         report_data = {
-            'total_completed_students': len(completed_trackers),
-            'eligible_for_certificates': 0,
-            'not_eligible_for_certificates': 0,
-            'already_have_certificates': 0,
-            'detailed_breakdown': [],
+            'total_completed_students': eligibility['total'],
+            'eligible_for_certificates': eligibility['eligible'],
+            'not_eligible_for_certificates': eligibility['not_eligible'],
+            'already_have_certificates': eligibility['already_certified'],
+            'detailed_breakdown': [{
+                'student_name': row['student_name'],
+                'course_name': row['course_name'],
+                'overall_progress': row['overall_progress'],
+                'elearning_progress': row['elearning_progress'],
+                'sessions_completed': row['sessions_completed'],
+                'homework_submissions': row['homework_submissions'],
+                'completion_date': row['completion_date'],
+                'eligible': row['eligible'],
+                'criteria_failures': row['criteria_failures'],
+                'has_certificate': False,
+            } for row in eligibility['rows']],
             'success_criteria_summary': {
-                'overall_progress_failures': 0,
-                'elearning_progress_failures': 0,
-                'sessions_failures': 0,
-                'homework_failures': 0,
-                'warnings_failures': 0,
+                f'{criterion}_failures': failure_counts[criterion] for criterion in CERTIFICATE_CRITERIA
             }
         }
         
-        for tracker in completed_trackers:
-            student = tracker.student_id
-            course = tracker.course_integration_id
-            
-            # Check if already has certificate
-            existing_certificate = self.search([
-                ('student_id', '=', student.id),
-                ('course_name', '=', course.name),
-                ('state', 'in', ['issued', 'delivered', 'verified']),
-            ])
-            
-            if existing_certificate:
-                report_data['already_have_certificates'] += 1
-                continue
-            
-            # Check success criteria
-            criteria_met = True
-            criteria_failures = []
-            
-            # Overall progress check
-            if tracker.overall_progress < course.completion_threshold:
-                criteria_met = False
-                criteria_failures.append('overall_progress')
-                report_data['success_criteria_summary']['overall_progress_failures'] += 1
-            
-            # eLearning progress check
-            if course.elearning_course_id and tracker.elearning_progress < course.min_elearning_progress:
-                criteria_met = False
-                criteria_failures.append('elearning_progress')
-                report_data['success_criteria_summary']['elearning_progress_failures'] += 1
-            
-            # Sessions check
-            if course.min_sessions_required and tracker.custom_sessions_completed < course.min_sessions_required:
-                criteria_met = False
-                criteria_failures.append('sessions')
-                report_data['success_criteria_summary']['sessions_failures'] += 1
-            
-            # Homework check
-            if course.min_homework_required and tracker.homework_submissions < course.min_homework_required:
-                criteria_met = False
-                criteria_failures.append('homework')
-                report_data['success_criteria_summary']['homework_failures'] += 1
-            
-            # Warnings check
-            if hasattr(student, 'has_warnings') and student.has_warnings:
-                criteria_met = False
-                criteria_failures.append('warnings')
-                report_data['success_criteria_summary']['warnings_failures'] += 1
-            
-            if criteria_met:
-                report_data['eligible_for_certificates'] += 1
-            else:
-                report_data['not_eligible_for_certificates'] += 1
-            
-            # Add detailed breakdown
-            report_data['detailed_breakdown'].append({
-                'student_name': student.name,
-                'course_name': course.name,
-                'overall_progress': tracker.overall_progress,
-                'elearning_progress': tracker.elearning_progress,
-                'sessions_completed': tracker.custom_sessions_completed,
-                'homework_submissions': tracker.homework_submissions,
-                'completion_date': tracker.completion_date,
-                'eligible': criteria_met,
-                'criteria_failures': criteria_failures,
-                'has_certificate': bool(existing_certificate),
-            })
-        
         _logger.info('Certificate eligibility report generated: %d eligible, %d not eligible, %d already have certificates',
                     report_data['eligible_for_certificates'], 
                     report_data['not_eligible_for_certificates'],
@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 
 _logger = logging.getLogger(__name__)
 
+# Automation rules checked before a program certificate is generated
+AUTOMATION_CRITERIA = ('completion_threshold', 'all_courses', 'elearning_completion', 'attendance', 'homework')
+
 
 class CertificateAutomation(models.Model):
     _name = 'gr.certificate.automation'
@@ -119,6 +122,59 @@ class CertificateAutomation(models.Model):
         string='Last Generation Date'
     )
 
+    # PDF Generation Metrics
+    pdf_last_run_date = fields.Datetime(
+        string='Last PDF Run',
+        readonly=True
+    )
+
+    pdf_last_run_rendered = fields.Integer(
+        string='PDFs Rendered (Last Run)',
+        readonly=True
+    )
+
+    pdf_last_run_reused = fields.Integer(
+        string='PDFs Reused (Last Run)',
+        readonly=True,
+        help='Certificates whose PDF was already stored for the same content'
+    )
+
+    pdf_last_run_failed = fields.Integer(
+        string='PDF Failures (Last Run)',
+        readonly=True
+    )
+
+    pdf_last_run_batches = fields.Integer(
+        string='wkhtmltopdf Runs (Last Run)',
+        readonly=True
+    )
+
+    pdf_last_run_duration = fields.Float(
+        string='PDF Run Duration (s)',
+        readonly=True
+    )
+
+    pdf_throughput = fields.Float(
+        string='PDF Throughput (per minute)',
+        readonly=True,
+        help='Certificates rendered per minute during the last PDF run'
+    )
+
+    pdf_total_rendered = fields.Integer(
+        string='Total PDFs Rendered',
+        readonly=True
+    )
+
+    pdf_total_failed = fields.Integer(
+        string='Total PDF Failures',
+        readonly=True
+    )
+
+    pdf_last_errors = fields.Text(
+        string='Last PDF Errors',
+        readonly=True
+    )
+
     # Generated Certificates
     generated_certificates = fields.One2many(
         'gr.certificate',
@@ -177,22 +233,57 @@ class CertificateAutomation(models.Model):
         """Generate certificates for students who meet the program requirements."""
         generated_count = 0
         
-        # Get all students in the training program
-        program_students = self._get_eligible_students()
+        eligibility = self._evaluate_program_eligibility()
+        _logger.info('Automation %s: %d eligible, %d not eligible, %d already certified (failures: %s)',
+                    self.name, eligibility['eligible'], eligibility['not_eligible'],
+                    eligibility['already_certified'], eligibility['failure_counts'])
         
-        for student in program_students:
+        eligible_students = self.env['gr.student'].browse([
+            row['student_id'] for row in eligibility['rows'] if row['eligible']
+        ])
+        certificates = self.env['gr.certificate']
+        for student in eligible_students:
             try:
-                if self._validate_certificate_eligibility(student):
-                    certificate = self._create_certificate_for_student(student)
-                    if certificate:
-                        generated_count += 1
+                certificate = self._create_certificate_for_student(student)
+                if certificate:
+                    generated_count += 1
+                    certificates |= certificate
                         
             except Exception as e:
                 _logger.error('Failed to generate certificate for student %s: %s', student.name, str(e))
                 continue
         
+        # Render the PDFs of the new certificates in batches
+        certificates = certificates.filtered('template_id')
+        if certificates:
+            self._generate_certificate_pdfs(certificates)
+        
         return generated_count
 
+    def _generate_certificate_pdfs(self, certificates):
+        """Render the given certificates' PDFs in bulk and record the run metrics."""
+        self.ensure_one()
+        stats = certificates._generate_certificate_pdfs_bulk()
+        self._record_pdf_metrics(stats)
+        return stats
+
+    def _record_pdf_metrics(self, stats):
+        """Store the throughput and failure metrics of a bulk PDF run."""
+        self.ensure_one()
+        duration = stats['duration']
+        self.write({
+            'pdf_last_run_date': fields.Datetime.now(),
+            'pdf_last_run_rendered': stats['rendered'],
+            'pdf_last_run_reused': stats['reused'],
+            'pdf_last_run_failed': stats['failed'],
+            'pdf_last_run_batches': stats['batches'],
+            'pdf_last_run_duration': duration,
+            'pdf_throughput': stats['rendered'] * 60.0 / duration if duration else 0.0,
+            'pdf_total_rendered': self.pdf_total_rendered + stats['rendered'],
+            'pdf_total_failed': self.pdf_total_failed + stats['failed'],
+            'pdf_last_errors': '\n'.join(stats['errors']) or False,
+        })
+
     def _get_eligible_students(self):
         """Get students eligible for certificate generation."""
         # Get students with progress trackers for this program
@@ -206,68 +297,78 @@ class CertificateAutomation(models.Model):
 
     def _validate_certificate_eligibility(self, student):
         """Validate if student is eligible for certificate generation."""
-        # Check if certificate already exists
-        existing_certificate = self.env['gr.certificate'].search([
-            ('student_id', '=', student.id),
-            ('automation_id', '=', self.id)
-        ])
+        rows = self._evaluate_program_eligibility(student_ids=student.ids)['rows']
+        return bool(rows) and rows[0]['eligible']
+
+    def _evaluate_program_eligibility(self, student_ids=None):
+        """Evaluate the automation rules for all students of the program at once.
         
-        if existing_certificate:
-            return False
+        One query groups the program trackers and the submitted homework per
+        student, compares the student progress with the thresholds and flags
+        students that already have a certificate from this automation.
         
-        # Check completion threshold
-        if student.elearning_progress < self.completion_threshold:
-            return False
+        :param student_ids: optional list restricting the evaluation to these students
+        :return: eligibility summary, see ``gr.certificate._summarize_eligibility``
+        """
+        self.ensure_one()
+        for model_name in ('gr.progress.tracker', 'gr.course.integration', 'gr.student',
+                           'gr.homework.attempt', 'gr.certificate'):
+            self.env[model_name].flush_model()
         
-        # Check if all courses are required and completed
-        if self.require_all_courses:
-            program_courses = self.env['gr.course.integration'].search([
+        params = {
+            'automation_id': self.id,
+            'program_id': self.training_program_id.id,
+            'course_count': self.env['gr.course.integration'].search_count([
                 ('training_program_id', '=', self.training_program_id.id)
-            ])
-            
-            student_trackers = self.env['gr.progress.tracker'].search([
-                ('student_id', '=', student.id),
-                ('course_integration_id', 'in', program_courses.ids)
-            ])
-            
-            if len(student_trackers) < len(program_courses):
-                return False
-            
-            # Check if all courses are completed
-            for tracker in student_trackers:
-                if tracker.status != 'completed':
-                    return False
-        
-        # Check eLearning completion requirement
-        if self.require_elearning_completion:
-            if student.integration_status not in ['completed', 'certified']:
-                return False
-        
-        # Check custom assessment requirement
-        if self.require_custom_assessment:
-            # This would depend on your custom assessment implementation
-            # For now, we'll assume it's satisfied if student has completed courses
-            pass
-        
-        # Check attendance requirement
-        if self.min_attendance_percentage > 0:
-            # This would depend on your attendance tracking implementation
-            # For now, we'll assume it's satisfied if student has good progress
-            if student.elearning_progress < self.min_attendance_percentage:
-                return False
-        
-        # Check homework submission requirement
-        if self.require_homework_submission:
-            # Check if student has submitted required homework
-            homework_attempts = self.env['gr.homework.attempt'].search([
-                ('student_id', '=', student.id),
-                ('status', '=', 'submitted')
-            ])
-            
-            if not homework_attempts:
-                return False
-        
-        return True
+            ]),
+            'completion_threshold': self.completion_threshold or 0.0,
+            'require_all_courses': self.require_all_courses,
+            'require_elearning_completion': self.require_elearning_completion,
+            'min_attendance': self.min_attendance_percentage or 0.0,
+            'require_homework': self.require_homework_submission,
+            'student_ids': tuple(student_ids or ()),
+        }
+        student_filter = 'WHERE s.id IN %(student_ids)s' if student_ids else ''
+        # Custom assessments are not tracked yet, so require_custom_assessment has no criterion
+        self.env.cr.execute("""
+            WITH program_trackers AS (
+                SELECT t.student_id,
+                       COUNT(*) AS tracker_count,
+                       BOOL_AND(t.status = 'completed') AS all_completed
+                  FROM gr_progress_tracker t
+                  JOIN gr_course_integration c ON c.id = t.course_integration_id
+                 WHERE c.training_program_id = %(program_id)s
+                 GROUP BY t.student_id
+            ), homework AS (
+                SELECT h.student_id, COUNT(*) AS submitted_count
+                  FROM gr_homework_attempt h
+                  JOIN program_trackers pt ON pt.student_id = h.student_id
+                 WHERE h.state != 'draft'
+                 GROUP BY h.student_id
+            )
+            SELECT s.id AS student_id,
+                   s.name AS student_name,
+                   COALESCE(s.elearning_progress, 0) < %(completion_threshold)s AS fail_completion_threshold,
+                   %(require_all_courses)s
+                       AND (pt.tracker_count < %(course_count)s OR NOT pt.all_completed) AS fail_all_courses,
+                   %(require_elearning_completion)s
+                       AND COALESCE(s.integration_status, '') NOT IN ('completed', 'certified') AS fail_elearning_completion,
+                   %(min_attendance)s > 0
+                       AND COALESCE(s.elearning_progress, 0) < %(min_attendance)s AS fail_attendance,
+                   %(require_homework)s AND hw.submitted_count IS NULL AS fail_homework,
+                   EXISTS (
+                       SELECT 1
+                         FROM gr_certificate cert
+                        WHERE cert.student_id = s.id
+                          AND cert.automation_id = %(automation_id)s
+                   ) AS has_certificate
+              FROM program_trackers pt
+              JOIN gr_student s ON s.id = pt.student_id
+              LEFT JOIN homework hw ON hw.student_id = s.id
+             {student_filter}
+             ORDER BY s.id
+        """.format(student_filter=student_filter), params)
+        return self.env['gr.certificate']._summarize_eligibility(self.env.cr.dictfetchall(), AUTOMATION_CRITERIA)
 
     def _create_certificate_for_student(self, student):
         """Create certificate for eligible student."""
@@ -334,19 +435,20 @@ class CertificateAutomation(models.Model):
         """Test the automation rules without generating certificates."""
         self.ensure_one()
         
-        eligible_students = self._get_eligible_students()
-        eligible_count = 0
-        
-        for student in eligible_students:
-            if self._validate_certificate_eligibility(student):
-                eligible_count += 1
+        eligibility = self._evaluate_program_eligibility()
+        failures = ', '.join(f'{criterion}: {count}' for criterion, count in eligibility['failure_counts'].items() if count)
+        message = f"Found {eligibility['eligible']} eligible students out of {eligibility['total']} total students."
+        if eligibility['already_certified']:
+            message += f" {eligibility['already_certified']} already have a certificate."
+        if failures:
+            message += f" Failed criteria - {failures}."
         
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': 'Test Results',
-                'message': f'Found {eligible_count} eligible students out of {len(eligible_students)} total students.',
+                'message': message,
                 'type': 'success',
                 'sticky': False,
             }
@@ -370,6 +472,28 @@ class CertificateAutomation(models.Model):
             }
         }
 
+    def action_generate_certificate_pdfs(self):
+        """Render the missing PDFs of the certificates generated by this automation."""
+        self.ensure_one()
+        
+        certificates = self.env['gr.certificate'].search([
+            ('automation_id', '=', self.id),
+            ('template_id', '!=', False),
+            ('certificate_file', '=', False),
+        ])
+        stats = self._generate_certificate_pdfs(certificates)
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'PDF Generation Complete',
+                'message': f"Rendered {stats['rendered']} certificate PDFs in {stats['batches']} batches, {stats['reused']} reused, {stats['failed']} failed.",
+                'type': 'warning' if stats['failed'] else 'success',
+                'sticky': False,
+            }
+        }
+
     @api.model
     def cleanup_failed_certificates(self):
         """Clean up failed certificate generations."""
@@ -218,26 +218,18 @@ class CertificateAutomationWizard(models.Model):
         domain = self._get_certificate_domain()
         certificates = self.env['gr.certificate'].search(domain)
         
-        processed = 0
-        success = 0
-        errors = []
+        # Certificates that already have a PDF count as done, the others are rendered in bulk
+        without_pdf = self.env['gr.certificate'].search(domain + [('certificate_file', '=', False)])
+        to_render = without_pdf.filtered('template_id')
+        without_template = without_pdf - to_render
+        stats = to_render._generate_certificate_pdfs_bulk()
         
-        for certificate in certificates:
-            try:
-                processed += 1
-                
-                if not certificate.certificate_file and certificate.template_id:
-                    certificate.action_generate_certificate_pdf()
-                    success += 1
-                elif certificate.certificate_file:
-                    success += 1  # Already has PDF
-                else:
-                    errors.append(f"Certificate {certificate.name}: No template selected")
-                    
-            except Exception as e:
-                error_msg = f"Certificate {certificate.name}: {str(e)}"
-                errors.append(error_msg)
-                _logger.error(error_msg)
+        processed = len(certificates)
+        errors = [f"Certificate {certificate.name}: No template selected" for certificate in without_template]
+        errors += [f"Certificate {error}" for error in stats['errors']]
+        for error in stats['errors']:
+            _logger.error('Certificate %s', error)
+        success = processed - len(without_template) - stats['failed']
         
         self.processed_count = processed
         self.success_count = success
@@ -1,13 +1,22 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError, ValidationError
 import base64
 from datetime import datetime
 
+from ..utils import certificate_rendering
+
 _logger = logging.getLogger(__name__)
 
+# Fields compiled into the render plan; their values key the cached plans
+RENDER_FIELDS = (
+    'header_content', 'body_content', 'footer_content', 'background_color', 'text_color',
+    'accent_color', 'font_family', 'page_width', 'page_height', 'margin_top', 'margin_bottom',
+    'margin_left', 'margin_right',
+)
+
 class CertificateTemplate(models.Model):
     _name = 'gr.certificate.template'
     _description = 'Certificate Template'
@@ -258,22 +267,57 @@ class CertificateTemplate(models.Model):
             'organization_name': context_data.get('organization_name', 'Training Organization'),
         }
         
-        # Render header content
-        header = self.header_content.format(**context) if self.header_content else ''
-        
-        # Render body content
-        body = self.body_content.format(**context) if self.body_content else ''
-        
-        # Render footer content
-        footer = self.footer_content.format(**context) if self.footer_content else ''
-        
+        # Substitute the placeholders of the compiled header, body and footer
+        plan = self._get_render_plan()
         return {
-            'header': header,
-            'body': body,
-            'footer': footer,
+            'header': plan['header'].render(context),
+            'body': plan['body'].render(context),
+            'footer': plan['footer'].render(context),
             'context': context
         }
     
+    def _get_render_plan(self):
+        """Return the compiled render plan of the template, cached per id and rendered values.
+
+        Edits change the key, even within the transaction that cached the
+        plan, so no cache is cleared on write; plans of edited or deleted
+        templates age out of the cache.
+        """
+        self.ensure_one()
+        if not isinstance(self.id, int):
+            return self._build_render_plan()
+        return self._get_cached_render_plan(self.id, tuple(self[field] for field in RENDER_FIELDS))
+    
+    @tools.ormcache('template_id', 'render_values')
+    def _get_cached_render_plan(self, template_id, render_values):
+        """Compile the render plan of a saved template (cached)."""
+        return self.browse(template_id)._build_render_plan()
+    
+    def _build_render_plan(self):
+        """Parse the template content and build the document shell of its style.
+        
+        :return: dict with the compiled 'header', 'body', 'footer' and 'shell'
+        """
+        self.ensure_one()
+        style = {
+            'page_width': self.page_width,
+            'page_height': self.page_height,
+            'margin_top': self.margin_top,
+            'margin_right': self.margin_right,
+            'margin_bottom': self.margin_bottom,
+            'margin_left': self.margin_left,
+            'font_family': self.font_family,
+            'background_color': self.background_color,
+            'text_color': self.text_color,
+            'accent_color': self.accent_color,
+        }
+        return {
+            'header': certificate_rendering.compile_template(self.header_content),
+            'body': certificate_rendering.compile_template(self.body_content),
+            'footer': certificate_rendering.compile_template(self.footer_content),
+            'shell': certificate_rendering.compile_certificate_shell(style),
+        }
+    
     def action_preview_template(self):
         """Preview the template with sample data."""
         self.ensure_one()
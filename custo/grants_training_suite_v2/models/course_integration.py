@@ -6,6 +6,9 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+# Fields shown by the training dashboard, changes are logged for its incremental refresh
+COURSE_DASHBOARD_FIELDS = ('name', 'status')
+
 
 class CourseIntegration(models.Model):
     _name = 'gr.course.integration'
@@ -122,6 +125,25 @@ class CourseIntegration(models.Model):
             else:
                 record.completion_rate = 0.0
     
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Log the new integrations for the dashboard refresh."""
+        records = super(CourseIntegration, self).create(vals_list)
+        self.env['gr.training.dashboard.change']._log_changes('course')
+        return records
+    
+    def write(self, vals):
+        """Log changes of the fields shown by the dashboards."""
+        result = super(CourseIntegration, self).write(vals)
+        if any(field in vals for field in COURSE_DASHBOARD_FIELDS):
+            self.env['gr.training.dashboard.change']._log_changes('course')
+        return result
+    
+    def unlink(self):
+        """Log the deleted integrations for the dashboard refresh."""
+        self.env['gr.training.dashboard.change']._log_changes('course')
+        return super(CourseIntegration, self).unlink()
+    
     @api.constrains('completion_threshold')
     def _check_completion_threshold(self):
         """Validate completion threshold."""
@@ -1,16 +1,25 @@
 # -*- coding: utf-8 -*-
 
 import base64
-import csv
+import hashlib
 import io
+import itertools
 import json
 import logging
-from datetime import datetime
+import threading
+import time
+from datetime import timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
 
+from ..utils import intake_reader, intake_validation
+
 _logger = logging.getLogger(__name__)
 
+# Upper bound of a session length, used to look up overlapping sessions
+MAX_SESSION_HOURS = 24
+
+
 class IntakeBatch(models.Model):
     _name = 'gr.intake.batch'
     _description = 'Grants Training Intake Batch'
@@ -165,6 +174,12 @@ class IntakeBatch(models.Model):
         help='Number of existing students updated'
     )
     
+    skipped_students_count = fields.Integer(
+        string='Students Skipped',
+        default=0,
+        help='Number of rows skipped during import'
+    )
+    
     import_errors = fields.Text(
         string='Import Errors',
         help='Details of errors during student creation'
@@ -175,6 +190,68 @@ class IntakeBatch(models.Model):
         help='Summary of the import process'
     )
     
+    # Duplicate detection
+    duplicate_policy = fields.Selection([
+        ('update', 'Update Existing Student'),
+        ('skip', 'Skip Row'),
+        ('flag', 'Flag for Review'),
+    ], string='Duplicate Policy', default='update', required=True,
+       help='What to do with rows matching an existing student: update it, skip the row, '
+            'or skip it and list it in the failed records for review')
+    
+    match_on_phone = fields.Boolean(
+        string='Match Duplicates on Phone',
+        default=False,
+        help='Also treat rows with the same phone number as an existing student as duplicates'
+    )
+    
+    match_on_national_id = fields.Boolean(
+        string='Match Duplicates on National ID',
+        default=False,
+        help='Also treat rows with the same national ID as an existing student as duplicates'
+    )
+    
+    # Streaming import engine
+    import_chunk_size = fields.Integer(
+        string='Import Chunk Size',
+        default=1000,
+        help='Number of rows imported and committed together'
+    )
+    
+    import_cursor = fields.Integer(
+        string='Import Cursor',
+        default=0,
+        copy=False,
+        help='Number of file rows already imported. An interrupted import resumes from this row.'
+    )
+    
+    import_checksum = fields.Char(
+        string='Import File Checksum',
+        copy=False,
+        help='Checksum of the file the import cursor refers to'
+    )
+    
+    # Parse-once cache of the uploaded file
+    parsed_cache_file = fields.Binary(
+        string='Parsed File Cache',
+        attachment=True,
+        copy=False,
+        help='Rows of the uploaded file stored as compressed column chunks, reused by validation, preview, mapping and import'
+    )
+    
+    parsed_cache_checksum = fields.Char(
+        string='Parsed Cache Checksum',
+        copy=False,
+        help='Checksum of the uploaded file the parsed cache was built from'
+    )
+    
+    processing_job_ids = fields.One2many(
+        'gr.intake.batch.job',
+        'intake_batch_id',
+        string='Processing Jobs',
+        help='Background jobs processing this batch'
+    )
+    
     # Failed Records Management (Phase 3.1.2)
     failed_records_data = fields.Text(
         string='Failed Records Data',
@@ -367,7 +444,8 @@ class IntakeBatch(models.Model):
             else:
                 record.success_rate = 0.0
     
-    @api.depends('state', 'upload_progress', 'mapping_progress', 'validation_progress', 'processing_progress')
+    @api.depends('state', 'upload_progress', 'mapping_progress', 'validation_progress', 'processing_progress',
+                 'import_cursor', 'total_records')
     def _compute_progress_percentage(self):
         """Compute overall progress percentage."""
         for record in self:
@@ -382,7 +460,10 @@ class IntakeBatch(models.Model):
             }
             
             # Base progress from state
-            if record.state in stage_values:
+            if record.state == 'validated' and record.processing_progress == 'in_progress' and record.total_records:
+                # Live progress of a running import: the processing stage covers 75% -> 100%
+                progress = 75.0 + 25.0 * min(record.import_cursor / record.total_records, 1.0)
+            elif record.state in stage_values:
                 progress = stage_values[record.state]
             elif record.state == 'error':
                 # If error, show progress up to the failed stage
@@ -401,11 +482,14 @@ class IntakeBatch(models.Model):
             
             record.progress_percentage = progress
     
-    @api.depends('state', 'upload_progress', 'mapping_progress', 'validation_progress', 'processing_progress')
+    @api.depends('state', 'upload_progress', 'mapping_progress', 'validation_progress', 'processing_progress',
+                 'import_cursor', 'total_records')
     def _compute_current_stage(self):
         """Compute current stage description."""
         for record in self:
-            if record.state == 'draft':
+            if record.state == 'validated' and record.processing_progress == 'in_progress':
+                record.current_stage = 'Processing - %d / %d rows imported' % (record.import_cursor, record.total_records)
+            elif record.state == 'draft':
                 record.current_stage = 'Ready to Upload'
             elif record.state == 'uploaded':
                 record.current_stage = 'File Uploaded - Ready for Mapping'
@@ -504,12 +588,11 @@ class IntakeBatch(models.Model):
             # Set upload progress to in_progress
             self.upload_progress = 'in_progress'
             
-            # Parse file and count records
-            records = self._parse_file()
-            self.total_records = len(records)
+            # Parse file once (cached for the next steps) and count records
+            self.total_records = sum(1 for record in self._iter_parsed_records())
             
             # Validate that we have records
-            if not records:
+            if not self.total_records:
                 self.upload_progress = 'failed'
                 raise UserError(_('No records found in the uploaded file. Please check the file format and content.'))
             
@@ -610,43 +693,12 @@ class IntakeBatch(models.Model):
             # Set processing progress to in_progress
             self.processing_progress = 'in_progress'
             
-            # Parse file again
-            _logger.info('Parsing file for batch %s', self.name)
-            records = self._parse_file()
-            _logger.info('File parsed successfully: %d records found', len(records))
-            
-            # Create students
-            _logger.info('Creating students for batch %s', self.name)
-            created_students = self._create_students(records)
-            
-            # Update counters and progress
-            self.processed_records = len(created_students) + self.updated_students_count
-            self.processing_date = fields.Datetime.now()
-            self.state = 'processed'
-            self.processing_progress = 'completed'
-            
-            # Log the processing
-            _logger.info('File processed for batch %s: %d created, %d updated', 
-                        self.name, self.created_students_count, self.updated_students_count)
-            
-            # Send success notification
-            error_count = len(self.import_errors.split(chr(10))) if self.import_errors else 0
-            notification_type = 'warning' if error_count > 0 else 'success'
-            
-            success_message = f"Batch '{self.name}' has been successfully processed. " \
-                            f"{self.created_students_count} students created, {self.updated_students_count} updated."
-            if error_count > 0:
-                success_message += f" {error_count} errors encountered."
-            
-            success_details = {
-                'total_records': len(records),
-                'students_created': self.created_students_count,
-                'students_updated': self.updated_students_count,
-                'errors': error_count,
-                'processing_time': str(fields.Datetime.now() - self.upload_date) if self.upload_date else 'Unknown'
-            }
-            
-            self._send_batch_notification(notification_type, success_message, success_details)
+            # Stream the file chunk by chunk, resuming an interrupted import if possible
+            self._prepare_import_cursor()
+            _logger.info('Importing students for batch %s starting at row %d', self.name, self.import_cursor + 1)
+            self._run_streaming_import()
+            self._finalize_streaming_import()
+            self._notify_import_completed()
             
             # Prepare success message with statistics
             message = f"Import completed successfully!\n"
@@ -687,232 +739,47 @@ class IntakeBatch(models.Model):
             
             raise UserError(_('Error processing file: %s') % str(e))
     
+    def _notify_import_completed(self):
+        """Log the end of the import and notify the batch recipients."""
+        self.ensure_one()
+        # Log the processing
+        _logger.info('File processed for batch %s: %d created, %d updated', 
+                    self.name, self.created_students_count, self.updated_students_count)
+        
+        # Send success notification
+        error_count = len(self.import_errors.split(chr(10))) if self.import_errors else 0
+        notification_type = 'warning' if error_count > 0 else 'success'
+        
+        success_message = f"Batch '{self.name}' has been successfully processed. " \
+                        f"{self.created_students_count} students created, {self.updated_students_count} updated."
+        if error_count > 0:
+            success_message += f" {error_count} errors encountered."
+        
+        success_details = {
+            'total_records': self.import_cursor,
+            'students_created': self.created_students_count,
+            'students_updated': self.updated_students_count,
+            'errors': error_count,
+            'processing_time': str(fields.Datetime.now() - self.upload_date) if self.upload_date else 'Unknown'
+        }
+        
+        self._send_batch_notification(notification_type, success_message, success_details)
+    
     def _parse_file(self):
-        """Parse the uploaded file and return records."""
+        """Return the records of the uploaded file, parsed once and then read from the parsed cache."""
         if not self.file_data:
             return []
         
         try:
-            # Decode file data
-            file_data = base64.b64decode(self.file_data)
-            
-            _logger.info('Parsing file: filename=%s, file_type=%s', self.filename, self.file_type)
-            
-            if self.file_type == 'csv':
-                return self._parse_csv(file_data)
-            elif self.file_type == 'xlsx':
-                return self._parse_excel(file_data)
-            else:
-                _logger.error('Unsupported file type: %s (filename: %s)', self.file_type, self.filename)
-                raise UserError(_('Unsupported file type: %s') % self.file_type)
-                
+            _logger.info('Reading file: filename=%s, file_type=%s', self.filename, self.file_type)
+            return list(self._iter_parsed_records())
         except Exception as e:
             _logger.error('Error parsing file: %s', str(e))
             raise UserError(_('Error parsing file: %s') % str(e))
     
-    def _parse_csv(self, file_data):
-        """Parse CSV file and return records."""
-        try:
-            # Convert bytes to string
-            file_content = file_data.decode('utf-8')
-            _logger.info('CSV content length: %d characters', len(file_content))
-            
-            # Parse CSV
-            csv_reader = csv.DictReader(io.StringIO(file_content))
-            records = list(csv_reader)
-            
-            _logger.info('CSV parsed successfully: %d records found', len(records))
-            if records:
-                _logger.info('CSV headers: %s', list(records[0].keys()))
-                # Debug: Log the first record to see what data is being parsed
-                _logger.info('First record data: %s', records[0])
-            
-            return records
-            
-        except Exception as e:
-            _logger.error('Error parsing CSV: %s', str(e))
-            raise UserError(_('Error parsing CSV file: %s') % str(e))
-    
-    def _parse_excel(self, file_data):
-        """Parse Excel file and return records."""
-        try:
-            # Determine file format and choose appropriate parser
-            if self.filename.endswith('.xlsx'):
-                # For .xlsx files, try pandas with openpyxl first
-                try:
-                    import pandas as pd
-                    _logger.info('Parsing .xlsx file using pandas with openpyxl')
-                    
-                    excel_file = io.BytesIO(file_data)
-                    df = pd.read_excel(excel_file, engine='openpyxl')
-                    records = df.fillna('').to_dict('records')
-                    
-                    _logger.info('Excel parsed successfully: %d records found', len(records))
-                    if records:
-                        _logger.info('Excel headers: %s', list(records[0].keys()))
-                    
-                    return records
-                    
-                except ImportError:
-                    raise UserError(_('Excel .xlsx files require pandas and openpyxl libraries. Please install: pip install pandas openpyxl'))
-                except Exception as e:
-                    raise UserError(_('Error parsing .xlsx file with pandas: %s') % str(e))
-                    
-            elif self.filename.endswith('.xls'):
-                # For .xls files, try pandas with xlrd first, then fallback to xlrd only
-                try:
-                    import pandas as pd
-                    _logger.info('Parsing .xls file using pandas with xlrd')
-                    
-                    excel_file = io.BytesIO(file_data)
-                    df = pd.read_excel(excel_file, engine='xlrd')
-                    records = df.fillna('').to_dict('records')
-                    
-                    _logger.info('Excel parsed successfully: %d records found', len(records))
-                    if records:
-                        _logger.info('Excel headers: %s', list(records[0].keys()))
-                    
-                    return records
-                    
-                except ImportError:
-                    # Fallback to xlrd only
-                    _logger.warning('pandas not available, falling back to xlrd only')
-                    return self._parse_excel_xlrd(file_data)
-                except Exception as e:
-                    _logger.warning('pandas failed, falling back to xlrd: %s', str(e))
-                    return self._parse_excel_xlrd(file_data)
-            else:
-                raise UserError(_('Unsupported Excel format. Please use .xlsx or .xls files.'))
-
-        except UserError:
-            # Re-raise UserError as-is
-            raise
-        except Exception as e:
-            _logger.error('Unexpected error parsing Excel: %s', str(e))
-            raise UserError(_('Error parsing Excel file: %s') % str(e))
-    
-    def _parse_excel_xlrd(self, file_data):
-        """Parse Excel file using xlrd (fallback method)."""
-        try:
-            import xlrd
-            
-            # Create a BytesIO object from the file data
-            excel_file = io.BytesIO(file_data)
-            
-            # Open workbook
-            workbook = xlrd.open_workbook(file_contents=excel_file.read())
-            sheet = workbook.sheet_by_index(0)  # Use first sheet
-            
-            # Get headers from first row
-            headers = [str(cell.value) for cell in sheet.row(0)]
-            _logger.info('Excel headers (xlrd): %s', headers)
-            
-            # Convert rows to dictionaries
-            records = []
-            for row_idx in range(1, sheet.nrows):  # Skip header row
-                row_data = {}
-                for col_idx, header in enumerate(headers):
-                    cell_value = sheet.cell(row_idx, col_idx).value
-                    # Convert cell value to string, handle empty cells
-                    row_data[header] = str(cell_value) if cell_value else ''
-                records.append(row_data)
-            
-            _logger.info('Excel parsed successfully (xlrd): %d records found', len(records))
-            return records
-            
-        except Exception as e:
-            _logger.error('Error parsing Excel with xlrd: %s', str(e))
-            raise UserError(_('Error parsing Excel file with xlrd: %s') % str(e))
-    
     def _validate_records(self, records):
         """Validate records and return list of errors with detailed feedback."""
-        errors = []
-        warnings = []
-        
-        # Required fields (updated for Phase 1.1 enhancements)
-        required_fields = ['name', 'name_arabic', 'name_english', 'email']
-        optional_fields = ['phone', 'birth_date', 'gender', 'nationality', 'native_language', 'english_level', 'has_certificate']
-        
-        # Track duplicate emails and names
-        email_set = set()
-        name_set = set()
-        
-        for i, record in enumerate(records, 1):
-            # Check required fields
-            for field in required_fields:
-                if not record.get(field) or str(record.get(field)).strip() == '':
-                    errors.append(f'Row {i}: Missing required field "{field}"')
-            
-            # Validate email format and uniqueness
-            email = record.get('email', '').strip()
-            if email:
-                if '@' not in email or '.' not in email.split('@')[-1]:
-                    errors.append(f'Row {i}: Invalid email format "{email}"')
-                elif email.lower() in email_set:
-                    errors.append(f'Row {i}: Duplicate email address "{email}"')
-                else:
-                    email_set.add(email.lower())
-            
-            # Validate name uniqueness (warning, not error)
-            name = record.get('name', '').strip()
-            if name:
-                if name in name_set:
-                    warnings.append(f'Row {i}: Duplicate name "{name}" (may be intentional)')
-                else:
-                    name_set.add(name)
-            
-            # Validate birth_date format if provided
-            birth_date = record.get('birth_date', '').strip()
-            if birth_date:
-                try:
-                    # Try to parse common date formats
-                    datetime.strptime(birth_date, '%Y-%m-%d')
-                except ValueError:
-                    try:
-                        datetime.strptime(birth_date, '%d/%m/%Y')
-                    except ValueError:
-                        try:
-                            datetime.strptime(birth_date, '%m/%d/%Y')
-                        except ValueError:
-                            errors.append(f'Row {i}: Invalid date format for birth_date "{birth_date}". Use YYYY-MM-DD format.')
-            
-            # Validate gender if provided
-            gender = record.get('gender', '').strip().lower()
-            if gender and gender not in ['male', 'female', 'm', 'f']:
-                errors.append(f'Row {i}: Invalid gender "{record.get("gender")}". Use "male", "female", "m", or "f".')
-            
-            # Validate english_level if provided
-            english_level = record.get('english_level', '').strip().lower()
-            valid_levels = ['beginner', 'elementary', 'intermediate', 'upper_intermediate', 'advanced']
-            if english_level and english_level not in valid_levels:
-                errors.append(f'Row {i}: Invalid english_level "{record.get("english_level")}". Valid options: {", ".join(valid_levels)}')
-            
-            # Validate has_certificate if provided
-            has_cert = record.get('has_certificate', '').strip().lower()
-            if has_cert and has_cert not in ['true', 'false', 'yes', 'no', '1', '0']:
-                errors.append(f'Row {i}: Invalid has_certificate value "{record.get("has_certificate")}". Use "true"/"false" or "yes"/"no".')
-            
-            # Validate certificate consistency
-            if has_cert in ['true', 'yes', '1']:
-                cert_type = record.get('certificate_type', '').strip()
-                cert_date = record.get('certificate_date', '').strip()
-                if not cert_type and not cert_date:
-                    warnings.append(f'Row {i}: Has certificate is true but no certificate details provided')
-                elif cert_date:
-                    try:
-                        datetime.strptime(cert_date, '%Y-%m-%d')
-                    except ValueError:
-                        errors.append(f'Row {i}: Invalid certificate_date format "{cert_date}". Use YYYY-MM-DD format.')
-            
-            # Validate birth date reasonableness (warning)
-            if birth_date:
-                try:
-                    parsed_date = datetime.strptime(birth_date, '%Y-%m-%d')
-                    current_year = datetime.now().year
-                    if parsed_date.year < 1900 or parsed_date.year > current_year:
-                        warnings.append(f'Row {i}: Birth date "{birth_date}" seems unusual')
-                except ValueError:
-                    pass  # Already handled above
+        errors, warnings, failed_records = self._run_columnar_validation(records)
         
         # Store warnings for later reference (Phase 2.3 enhancement)
         if warnings:
@@ -924,129 +791,7 @@ class IntakeBatch(models.Model):
     
     def _validate_records_with_details(self, records):
         """Validate records and return detailed error information for failed records management."""
-        errors = []
-        warnings = []
-        failed_records = []
-        
-        # Required fields (updated for Phase 1.1 enhancements)
-        required_fields = ['name', 'name_arabic', 'name_english', 'email']
-        optional_fields = ['phone', 'birth_date', 'gender', 'nationality', 'native_language', 'english_level', 'has_certificate']
-        
-        # Track duplicate emails and names
-        email_set = set()
-        name_set = set()
-        
-        for i, record in enumerate(records, 1):
-            record_errors = []
-            record_warnings = []
-            
-            # Check required fields
-            for field in required_fields:
-                if not record.get(field) or str(record.get(field)).strip() == '':
-                    error_msg = f'Missing required field "{field}"'
-                    errors.append(f'Row {i}: {error_msg}')
-                    record_errors.append(error_msg)
-            
-            # Validate email format and uniqueness
-            email = record.get('email', '').strip()
-            if email:
-                if '@' not in email or '.' not in email.split('@')[-1]:
-                    error_msg = f'Invalid email format "{email}"'
-                    errors.append(f'Row {i}: {error_msg}')
-                    record_errors.append(error_msg)
-                elif email.lower() in email_set:
-                    error_msg = f'Duplicate email address "{email}"'
-                    errors.append(f'Row {i}: {error_msg}')
-                    record_errors.append(error_msg)
-                else:
-                    email_set.add(email.lower())
-            
-            # Validate name uniqueness (warning, not error)
-            name = record.get('name', '').strip()
-            if name:
-                if name in name_set:
-                    warning_msg = f'Duplicate name "{name}" (may be intentional)'
-                    warnings.append(f'Row {i}: {warning_msg}')
-                    record_warnings.append(warning_msg)
-                else:
-                    name_set.add(name)
-            
-            # Validate birth_date format if provided
-            birth_date = record.get('birth_date', '').strip()
-            if birth_date:
-                try:
-                    # Try to parse common date formats
-                    datetime.strptime(birth_date, '%Y-%m-%d')
-                except ValueError:
-                    try:
-                        datetime.strptime(birth_date, '%d/%m/%Y')
-                    except ValueError:
-                        try:
-                            datetime.strptime(birth_date, '%m/%d/%Y')
-                        except ValueError:
-                            error_msg = f'Invalid date format for birth_date "{birth_date}". Use YYYY-MM-DD format.'
-                            errors.append(f'Row {i}: {error_msg}')
-                            record_errors.append(error_msg)
-            
-            # Validate gender if provided
-            gender = record.get('gender', '').strip().lower()
-            if gender and gender not in ['male', 'female', 'm', 'f']:
-                error_msg = f'Invalid gender "{record.get("gender")}". Use "male", "female", "m", or "f".'
-                errors.append(f'Row {i}: {error_msg}')
-                record_errors.append(error_msg)
-            
-            # Validate english_level if provided
-            english_level = record.get('english_level', '').strip().lower()
-            valid_levels = ['beginner', 'elementary', 'intermediate', 'upper_intermediate', 'advanced']
-            if english_level and english_level not in valid_levels:
-                error_msg = f'Invalid english_level "{record.get("english_level")}". Valid options: {", ".join(valid_levels)}'
-                errors.append(f'Row {i}: {error_msg}')
-                record_errors.append(error_msg)
-            
-            # Validate has_certificate if provided
-            has_cert = record.get('has_certificate', '').strip().lower()
-            if has_cert and has_cert not in ['true', 'false', 'yes', 'no', '1', '0']:
-                error_msg = f'Invalid has_certificate value "{record.get("has_certificate")}". Use "true"/"false" or "yes"/"no".'
-                errors.append(f'Row {i}: {error_msg}')
-                record_errors.append(error_msg)
-            
-            # Validate certificate consistency
-            if has_cert in ['true', 'yes', '1']:
-                cert_type = record.get('certificate_type', '').strip()
-                cert_date = record.get('certificate_date', '').strip()
-                if not cert_type and not cert_date:
-                    warning_msg = f'Has certificate is true but no certificate details provided'
-                    warnings.append(f'Row {i}: {warning_msg}')
-                    record_warnings.append(warning_msg)
-                elif cert_date:
-                    try:
-                        datetime.strptime(cert_date, '%Y-%m-%d')
-                    except ValueError:
-                        error_msg = f'Invalid certificate_date format "{cert_date}". Use YYYY-MM-DD format.'
-                        errors.append(f'Row {i}: {error_msg}')
-                        record_errors.append(error_msg)
-            
-            # Validate birth date reasonableness (warning)
-            if birth_date:
-                try:
-                    parsed_date = datetime.strptime(birth_date, '%Y-%m-%d')
-                    current_year = datetime.now().year
-                    if parsed_date.year < 1900 or parsed_date.year > current_year:
-                        warning_msg = f'Birth date "{birth_date}" seems unusual'
-                        warnings.append(f'Row {i}: {warning_msg}')
-                        record_warnings.append(warning_msg)
-                except ValueError:
-                    pass  # Already handled above
-            
-            # Store failed record if it has errors
-            if record_errors:
-                failed_records.append({
-                    'row_number': i,
-                    'data': record,
-                    'errors': record_errors,
-                    'warnings': record_warnings,
-                    'status': 'failed'
-                })
+        errors, warnings, failed_records = self._run_columnar_validation(records)
         
         # Store warnings for later reference
         if warnings:
@@ -1069,6 +814,43 @@ class IntakeBatch(models.Model):
         
         return errors
     
+    def _run_columnar_validation(self, records):
+        """Validate the rows chunk by chunk, one column at a time.
+        
+        Rules live in ``utils.intake_validation``; duplicate emails and names
+        are tracked across chunks by the validator.
+        
+        :return: tuple (error lines, warning lines, failed record dicts)
+        """
+        validator = intake_validation.IntakeValidator()
+        errors = []
+        warnings = []
+        failed_records = []
+        
+        chunk_size = self._get_import_chunk_size()
+        for chunk_index, chunk in enumerate(intake_reader.chunked(records, chunk_size)):
+            result = validator.validate(chunk)
+            for index, record in enumerate(chunk):
+                if not (result.errors[index] or result.warnings[index]):
+                    continue
+                row_number = chunk_index * chunk_size + index + 1
+                record_errors = result.error_messages(index)
+                record_warnings = result.warning_messages(index)
+                errors.extend(f'Row {row_number}: {message}' for message in record_errors)
+                warnings.extend(f'Row {row_number}: {message}' for message in record_warnings)
+                
+                # Keep failed records for the correction interface
+                if record_errors:
+                    failed_records.append({
+                        'row_number': row_number,
+                        'data': record,
+                        'errors': record_errors,
+                        'warnings': record_warnings,
+                        'status': 'failed'
+                    })
+        
+        return errors, warnings, failed_records
+    
     def action_download_template(self):
         """Download a sample Excel template for student data import with validation rules."""
         try:
@@ -1207,114 +989,29 @@ class IntakeBatch(models.Model):
     
     def _create_students(self, records):
         """Create student records from validated data with duplicate detection and statistics."""
-        created_students = []
-        updated_students = []
-        skipped_students = []
+        Student = self.env['gr.student']
+        created_students = Student.browse()
+        updated_students = Student.browse()
+        skipped_rows = []
         errors = []
         
         _logger.info('Starting to create students from %d records', len(records))
         
-        for i, record in enumerate(records, 1):
-            try:
-                # Parse birth_date if provided
-                birth_date = None
-                if record.get('birth_date'):
-                    try:
-                        birth_date = datetime.strptime(record.get('birth_date'), '%Y-%m-%d').date()
-                    except ValueError:
-                        _logger.warning('Invalid birth_date format for student %d: %s', i, record.get('birth_date'))
-                
-                # Parse certificate_date if provided
-                certificate_date = None
-                if record.get('certificate_date'):
-                    try:
-                        certificate_date = datetime.strptime(record.get('certificate_date'), '%Y-%m-%d').date()
-                    except ValueError:
-                        _logger.warning('Invalid certificate_date format for student %d: %s', i, record.get('certificate_date'))
-                
-                # Parse has_certificate boolean
-                has_certificate = False
-                if record.get('has_certificate'):
-                    has_cert_str = record.get('has_certificate').lower().strip()
-                    has_certificate = has_cert_str in ['true', '1', 'yes', 'y']
-                
-                # Parse birth_date with multiple format support
-                birth_date = None
-                if record.get('birth_date'):
-                    birth_date_str = record.get('birth_date').strip()
-                    try:
-                        birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        try:
-                            birth_date = datetime.strptime(birth_date_str, '%d/%m/%Y').date()
-                        except ValueError:
-                            try:
-                                birth_date = datetime.strptime(birth_date_str, '%m/%d/%Y').date()
-                            except ValueError:
-                                _logger.warning('Invalid birth_date format for student %d: %s', i, birth_date_str)
-                
-                # Check for existing student by email (duplicate detection)
-                email = record.get('email')
-                existing_student = None
-                if email:
-                    existing_student = self.env['gr.student'].search([
-                        ('email', '=', email)
-                    ], limit=1)
-                
-                # Prepare student values
-                student_vals = {
-                    'name': record.get('name'),
-                    'name_arabic': record.get('name_arabic'),
-                    'name_english': record.get('name_english'),
-                    'email': email,
-                    'phone': record.get('phone'),
-                    'birth_date': birth_date,
-                    'gender': record.get('gender'),
-                    'nationality': record.get('nationality'),
-                    'native_language': record.get('native_language'),
-                    'english_level': record.get('english_level'),
-                    'has_certificate': has_certificate,
-                    'certificate_type': record.get('certificate_type'),
-                    'certificate_date': certificate_date,
-                    'intake_batch_id': self.id,
-                    'state': 'draft',
-                }
-                
-                if existing_student:
-                    # Update existing student with new data
-                    _logger.info('Updating existing student %d: %s (ID: %s)', i, student_vals['name'], existing_student.id)
-                    
-                    # Remove intake_batch_id from update (keep original batch)
-                    update_vals = student_vals.copy()
-                    del update_vals['intake_batch_id']
-                    
-                    existing_student.write(update_vals)
-                    updated_students.append(existing_student)
-                    _logger.info('Student %d updated successfully', i)
-                else:
-                    # Create new student
-                    _logger.info('Creating new student %d: %s with birth_date=%s, has_certificate=%s, english_level=%s', 
-                               i, student_vals['name'], birth_date, has_certificate, record.get('english_level'))
-                    student = self.env['gr.student'].create(student_vals)
-                    created_students.append(student)
-                    _logger.info('Student %d created successfully with ID: %s', i, student.id)
-                
-            except Exception as e:
-                error_msg = f'Row {i}: Error creating student "{record.get("name", "Unknown")}": {str(e)}'
-                errors.append(error_msg)
-                _logger.error('Error creating student %d from record %s: %s', i, record, str(e))
-                continue
-        
-        # Generate import summary
-        total_processed = len(created_students) + len(updated_students)
-        total_errors = len(errors)
-        total_skipped = len(skipped_students)
+        validator = intake_validation.IntakeValidator()
+        chunk_size = self._get_import_chunk_size()
+        for chunk_index, chunk in enumerate(intake_reader.chunked(records, chunk_size)):
+            created, updated, skipped, chunk_errors = self._import_student_chunk(
+                chunk, start_row=chunk_index * chunk_size + 1, validator=validator)
+            created_students |= created
+            updated_students |= updated
+            skipped_rows.extend(skipped)
+            errors.extend(chunk_errors)
         
         _logger.info('Student import completed: %d created, %d updated, %d errors, %d skipped out of %d records', 
-                    len(created_students), len(updated_students), total_errors, total_skipped, len(records))
+                    len(created_students), len(updated_students), len(errors), len(skipped_rows), len(records))
         
         # Store import statistics in the batch
-        self._store_import_statistics(created_students, updated_students, errors, skipped_students)
+        self._store_import_statistics(created_students, updated_students, errors, skipped_rows)
         
         return created_students
     
@@ -1325,6 +1022,7 @@ class IntakeBatch(models.Model):
         # Update counts
         self.created_students_count = len(created_students)
         self.updated_students_count = len(updated_students)
+        self.skipped_students_count = len(skipped_students)
         
         # Store errors
         if errors:
@@ -1332,31 +1030,40 @@ class IntakeBatch(models.Model):
         else:
             self.import_errors = False
         
-        # Create summary
+        self.import_summary = self._build_import_summary(created_students, updated_students, errors)
+    
+    def _build_import_summary(self, created_sample, updated_sample, errors):
+        """Build the import summary text from the batch counters and a sample of students."""
+        self.ensure_one()
+        
+        created_count = self.created_students_count
+        updated_count = self.updated_students_count
+        skipped_count = self.skipped_students_count
+        
         summary_lines = []
         summary_lines.append(f"IMPORT SUMMARY - {fields.Datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         summary_lines.append("=" * 60)
-        summary_lines.append(f"Total Records Processed: {len(created_students) + len(updated_students) + len(errors) + len(skipped_students)}")
-        summary_lines.append(f"✅ Students Created: {len(created_students)}")
-        summary_lines.append(f"🔄 Students Updated: {len(updated_students)}")
+        summary_lines.append(f"Total Records Processed: {created_count + updated_count + len(errors) + skipped_count}")
+        summary_lines.append(f"✅ Students Created: {created_count}")
+        summary_lines.append(f"🔄 Students Updated: {updated_count}")
         summary_lines.append(f"❌ Errors: {len(errors)}")
-        summary_lines.append(f"⏭️ Skipped: {len(skipped_students)}")
+        summary_lines.append(f"⏭️ Skipped: {skipped_count}")
         summary_lines.append("")
         
-        if created_students:
+        if created_count:
             summary_lines.append("NEW STUDENTS CREATED:")
-            for student in created_students[:10]:  # Show first 10
+            for student in created_sample[:10]:  # Show first 10
                 summary_lines.append(f"  • {student.name} ({student.email})")
-            if len(created_students) > 10:
-                summary_lines.append(f"  ... and {len(created_students) - 10} more")
+            if created_count > 10:
+                summary_lines.append(f"  ... and {created_count - 10} more")
             summary_lines.append("")
         
-        if updated_students:
+        if updated_count:
             summary_lines.append("EXISTING STUDENTS UPDATED:")
-            for student in updated_students[:10]:  # Show first 10
+            for student in updated_sample[:10]:  # Show first 10
                 summary_lines.append(f"  • {student.name} ({student.email})")
-            if len(updated_students) > 10:
-                summary_lines.append(f"  ... and {len(updated_students) - 10} more")
+            if updated_count > 10:
+                summary_lines.append(f"  ... and {updated_count - 10} more")
             summary_lines.append("")
         
         if errors:
@@ -1366,7 +1073,342 @@ class IntakeBatch(models.Model):
             if len(errors) > 5:
                 summary_lines.append(f"  ... and {len(errors) - 5} more errors")
         
-        self.import_summary = '\n'.join(summary_lines)
+        return '\n'.join(summary_lines)
+    
+    # ===== STREAMING IMPORT ENGINE =====
+    
+    def _get_file_attachment(self, field_name='file_data'):
+        """Return the attachment backing a binary field (the uploaded file by default)."""
+        self.ensure_one()
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', field_name),
+            ('res_id', '=', self.id),
+        ], limit=1)
+    
+    def _get_file_checksum(self):
+        """Return a checksum identifying the content of the uploaded file."""
+        self.ensure_one()
+        attachment = self._get_file_attachment()
+        if attachment.checksum:
+            return attachment.checksum
+        if self.file_data:
+            return hashlib.sha1(base64.b64decode(self.file_data)).hexdigest()
+        return False
+    
+    def _open_file_stream(self, field_name='file_data'):
+        """Open the uploaded file (or another binary field) as a binary stream.
+        
+        Files kept in the filestore are read straight from disk so the whole
+        content never has to be base64-decoded in memory.
+        """
+        self.ensure_one()
+        attachment = self._get_file_attachment(field_name)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        if attachment:
+            return io.BytesIO(attachment.raw or b'')
+        return io.BytesIO(base64.b64decode(self[field_name] or b''))
+    
+    def _ensure_parsed_cache(self):
+        """Build the parsed-file cache unless it already matches the uploaded file.
+        
+        The cache is keyed by the checksum of the file content, so uploading a
+        new file invalidates it while validate, preview, mapping and import of
+        the same file all share a single parse.
+        """
+        self.ensure_one()
+        checksum = self._get_file_checksum()
+        if not checksum or (self.parsed_cache_checksum == checksum and self.parsed_cache_file):
+            return
+        
+        buffer = io.BytesIO()
+        with self._open_file_stream() as stream:
+            headers, row_count = intake_reader.write_columnar_cache(stream, self.filename, buffer)
+        self.write({
+            'parsed_cache_file': base64.b64encode(buffer.getvalue()),
+            'parsed_cache_checksum': checksum,
+        })
+        _logger.info('Parsed file cache built for batch %s: %d rows, %d columns, %d bytes',
+                    self.name, row_count, len(headers), len(buffer.getvalue()))
+    
+    def _iter_parsed_records(self):
+        """Yield the rows of the uploaded file (without column mapping) from the parsed cache."""
+        self.ensure_one()
+        self._ensure_parsed_cache()
+        if not self.parsed_cache_checksum:
+            return
+        with self._open_file_stream('parsed_cache_file') as stream:
+            yield from intake_reader.iter_columnar_records(stream)
+    
+    def _iter_file_records(self):
+        """Yield the file rows one at a time with the column mapping applied."""
+        self.ensure_one()
+        mapping = json.loads(self.column_mapping) if self.column_mapping else {}
+        for record in self._iter_parsed_records():
+            if mapping:
+                record = {field: record.get(column, '') for field, column in mapping.items() if column}
+            yield record
+    
+    def _get_import_chunk_size(self):
+        """Return the number of rows imported per chunk."""
+        return max(self.import_chunk_size or 1000, 1)
+    
+    def _can_commit_import(self):
+        """Whether the import may commit/rollback the transaction (never inside tests)."""
+        return not (getattr(threading.current_thread(), 'testing', False)
+                    or self.env.context.get('intake_import_no_commit'))
+    
+    def _commit_import_chunk(self):
+        """Commit the current chunk so that a crash only loses the chunk in progress."""
+        if self._can_commit_import():
+            self.env.cr.commit()
+    
+    def _rollback_import_chunk(self):
+        """Discard the chunk in progress, going back to the last committed chunk."""
+        if self._can_commit_import():
+            self.env.cr.rollback()
+    
+    def _prepare_import_cursor(self):
+        """Reset the import cursor unless it points into the current file."""
+        self.ensure_one()
+        checksum = self._get_file_checksum()
+        if self.import_cursor and self.import_checksum == checksum:
+            _logger.info('Resuming import of batch %s at row %d', self.name, self.import_cursor + 1)
+            return self.import_cursor
+        
+        self.write({
+            'import_cursor': 0,
+            'import_checksum': checksum,
+            'processed_records': 0,
+            'created_students_count': 0,
+            'updated_students_count': 0,
+            'skipped_students_count': 0,
+            'import_errors': False,
+            'import_summary': False,
+        })
+        return 0
+    
+    def _run_streaming_import(self, deadline=None, should_stop=None):
+        """Import the file chunk by chunk from the current cursor position.
+        
+        Each chunk is validated column by column, does one bulk duplicate lookup
+        and one ``create`` for the new students, then advances the cursor and
+        commits.
+        
+        :param deadline: optional ``time.monotonic()`` value after which no new chunk is started
+        :param should_stop: optional callable checked after each chunk to interrupt the import
+        :return: True when the end of the file was reached, False when interrupted
+        """
+        self.ensure_one()
+        chunk_size = self._get_import_chunk_size()
+        records = itertools.islice(self._iter_file_records(), self.import_cursor, None)
+        validator = intake_validation.IntakeValidator()
+        
+        for chunk in intake_reader.chunked(records, chunk_size):
+            created, updated, skipped, errors = self._import_student_chunk(
+                chunk, start_row=self.import_cursor + 1, validator=validator)
+            self._record_chunk_progress(len(chunk), created, updated, skipped, errors)
+            self._commit_import_chunk()
+            _logger.info('Batch %s: imported rows up to %d (%d created, %d updated, %d errors)',
+                        self.name, self.import_cursor, len(created), len(updated), len(errors))
+            if (deadline and time.monotonic() >= deadline) or (should_stop and should_stop()):
+                return False
+        return True
+    
+    def _record_chunk_progress(self, row_count, created, updated, skipped, errors):
+        """Advance the import cursor and the running import statistics after a chunk."""
+        self.ensure_one()
+        import_errors = self.import_errors
+        if errors:
+            import_errors = '\n'.join(([import_errors] if import_errors else []) + errors)
+        
+        self.write({
+            'import_cursor': self.import_cursor + row_count,
+            'created_students_count': self.created_students_count + len(created),
+            'updated_students_count': self.updated_students_count + len(updated),
+            'skipped_students_count': self.skipped_students_count + len(skipped),
+            'processed_records': self.processed_records + len(created) + len(updated),
+            'import_errors': import_errors,
+        })
+    
+    def _finalize_streaming_import(self):
+        """Mark the batch as processed and build the import summary."""
+        self.ensure_one()
+        created_sample = self.env['gr.student'].search([('intake_batch_id', '=', self.id)], limit=10)
+        errors = self.import_errors.split('\n') if self.import_errors else []
+        self.write({
+            'import_summary': self._build_import_summary(created_sample, self.env['gr.student'], errors),
+            'processing_date': fields.Datetime.now(),
+            'state': 'processed',
+            'processing_progress': 'completed',
+        })
+    
+    def _prepare_student_vals(self, row):
+        """Convert a validated row (typed values from the columnar validator) into ``gr.student`` values."""
+        vals = {
+            'name': row['name'],
+            'name_arabic': row['name_arabic'],
+            'name_english': row['name_english'],
+            'email': row['email'],
+            'phone': row['phone'],
+            'birth_date': row['birth_date'],
+            'gender': row['gender'],
+            'nationality': row['nationality'],
+            'native_language': row['native_language'],
+            'english_level': row['english_level'],
+            'has_certificate': row['has_certificate'],
+            'certificate_type': row['certificate_type'],
+            'certificate_date': row['certificate_date'],
+            'intake_batch_id': self.id,
+            'state': 'draft',
+        }
+        if row['national_id']:
+            vals['national_id'] = row['national_id']
+        return vals
+    
+    def _import_student_chunk(self, records, start_row=1, validator=None):
+        """Create or update the students of one chunk of rows.
+        
+        The chunk is validated and coerced column by column, existing students
+        are looked up with a single query for the whole chunk and new students
+        are created with a single ``create`` call.
+        
+        :param validator: ``IntakeValidator`` shared by the chunks of one file
+        :return: tuple (created students, updated students, skipped row numbers, error messages)
+        """
+        self.ensure_one()
+        Student = self.env['gr.student']
+        errors = []
+        skipped = []
+        
+        # Repeated emails are not errors here: they are matched like any other duplicate below
+        result = (validator or intake_validation.IntakeValidator()).validate(records)
+        ignored = intake_validation.ERROR_DUPLICATE_EMAIL
+        rows = []
+        for index in range(len(result)):
+            row_number = start_row + index
+            if result.errors[index] & ~ignored:
+                errors.append(f'Row {row_number}: {"; ".join(result.error_messages(index, ignore=ignored))}')
+                continue
+            rows.append((row_number, self._prepare_student_vals(result.typed_row(index))))
+        
+        # Duplicate detection: one lookup for all keys of the chunk
+        matches = Student._find_existing_students(
+            emails=[vals.get('email') for _, vals in rows],
+            phones=[vals.get('phone') for _, vals in rows] if self.match_on_phone else (),
+            national_ids=[vals.get('national_id') for _, vals in rows] if self.match_on_national_id else (),
+        )
+        
+        to_create = []
+        to_update = []
+        flagged = []
+        seen_keys = set()
+        for row_number, vals in rows:
+            keys = self._get_duplicate_keys(vals)
+            if seen_keys.intersection(keys):
+                skipped.append(row_number)
+                _logger.info('Skipping row %d: student already imported in this chunk', row_number)
+                continue
+            seen_keys.update(keys)
+            
+            student_id, matched_on = False, False
+            for key_type, key in keys:
+                if key in matches[key_type]:
+                    student_id, matched_on = matches[key_type][key], key_type
+                    break
+            
+            if not student_id:
+                to_create.append((row_number, vals))
+            elif self.duplicate_policy == 'update':
+                to_update.append((row_number, student_id, vals))
+            elif self.duplicate_policy == 'skip':
+                skipped.append(row_number)
+            else:
+                skipped.append(row_number)
+                flagged.append((row_number, vals, student_id, matched_on))
+        
+        if flagged:
+            self._flag_duplicate_rows(flagged)
+        
+        created = self._bulk_create_students(to_create, errors)
+        
+        updated_ids = []
+        for row_number, student_id, vals in to_update:
+            # Keep the original batch of existing students
+            update_vals = dict(vals)
+            del update_vals['intake_batch_id']
+            try:
+                with self.env.cr.savepoint():
+                    Student.browse(student_id).write(update_vals)
+                updated_ids.append(student_id)
+            except Exception as e:
+                errors.append(f'Row {row_number}: Error creating student "{vals.get("name") or "Unknown"}": {str(e)}')
+                _logger.error('Error updating student from row %d: %s', row_number, str(e))
+        
+        return created, Student.browse(updated_ids), skipped, errors
+    
+    def _get_duplicate_keys(self, vals):
+        """Return the (key type, normalised key) pairs used to match a row to existing students."""
+        Student = self.env['gr.student']
+        keys = [('email', Student._normalize_email(vals.get('email')))]
+        if self.match_on_phone:
+            keys.append(('phone', Student._normalize_phone(vals.get('phone'))))
+        if self.match_on_national_id:
+            keys.append(('national_id', Student._normalize_national_id(vals.get('national_id'))))
+        return [(key_type, key) for key_type, key in keys if key]
+    
+    def _flag_duplicate_rows(self, flagged):
+        """Record rows matching an existing student as failed records for review."""
+        self.ensure_one()
+        failed_data = {}
+        if self.failed_records_data:
+            try:
+                failed_data = json.loads(self.failed_records_data)
+            except (json.JSONDecodeError, TypeError):
+                failed_data = {}
+        failed_records = failed_data.get('failed_records', [])
+        
+        for row_number, vals, student_id, matched_on in flagged:
+            data = {key: value for key, value in vals.items() if key not in ('intake_batch_id', 'state')}
+            failed_records.append({
+                'row_number': row_number,
+                'data': json.loads(json.dumps(data, default=str)),
+                'errors': [f'Possible duplicate of existing student ID {student_id} (matched on {matched_on})'],
+                'warnings': [],
+                'status': 'duplicate',
+                'duplicate_student_id': student_id,
+            })
+        
+        failed_data.update({
+            'failed_records': failed_records,
+            'total_failed': len(failed_records),
+            'batch_id': self.id,
+            'batch_name': self.name,
+        })
+        self.failed_records_data = json.dumps(failed_data, indent=2)
+    
+    def _bulk_create_students(self, to_create, errors):
+        """Create students with one ``create`` call, isolating bad rows on failure."""
+        Student = self.env['gr.student']
+        if not to_create:
+            return Student.browse()
+        
+        try:
+            with self.env.cr.savepoint():
+                return Student.create([vals for _, vals in to_create])
+        except Exception as e:
+            _logger.warning('Bulk student creation failed for batch %s, retrying row by row: %s', self.name, str(e))
+        
+        created_ids = []
+        for row_number, vals in to_create:
+            try:
+                with self.env.cr.savepoint():
+                    created_ids.append(Student.create(vals).id)
+            except Exception as e:
+                errors.append(f'Row {row_number}: Error creating student "{vals.get("name") or "Unknown"}": {str(e)}')
+                _logger.error('Error creating student from row %d: %s', row_number, str(e))
+        return Student.browse(created_ids)
     
     # ===== EXCEL TEMPLATE VALIDATION METHODS =====
     
@@ -1611,19 +1653,47 @@ class IntakeBatch(models.Model):
         if self.total_records <= 1000:
             return self.action_process_file()
         
-        # For large batches, show confirmation dialog
+        # Large batches are processed by the background job queue
+        return self.action_process_in_background()
+    
+    def action_process_in_background(self):
+        """Queue the batch for processing by the background job cron."""
+        self.ensure_one()
+        
+        if self.state != 'validated':
+            raise UserError(_('Please validate the file first.'))
+        
+        if self.processing_job_ids.filtered(lambda job: job.state in ('pending', 'running')):
+            raise UserError(_('This batch is already queued for processing.'))
+        
+        job = self.env['gr.intake.batch.job'].create({'intake_batch_id': self.id})
+        self.processing_progress = 'in_progress'
+        job._trigger_processing()
+        
+        _logger.info('Batch %s queued for background processing (job %s)', self.name, job.id)
+        
         return {
-            'name': _('Process Large Batch'),
-            'type': 'ir.actions.act_window',
-            'res_model': 'gr.intake.batch.large.process.wizard',
-            'view_mode': 'form',
-            'target': 'new',
-            'context': {
-                'default_intake_batch_id': self.id,
-                'default_total_records': self.total_records,
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Processing Queued'),
+                'message': _('Batch %s (%d records) will be processed in the background. Progress is updated as rows are imported.') % (self.name, self.total_records),
+                'type': 'info',
             }
         }
     
+    def action_view_processing_jobs(self):
+        """View background processing jobs of this batch."""
+        self.ensure_one()
+        return {
+            'name': _('Processing Jobs - %s') % self.name,
+            'type': 'ir.actions.act_window',
+            'res_model': 'gr.intake.batch.job',
+            'view_mode': 'list,form',
+            'domain': [('intake_batch_id', '=', self.id)],
+            'context': {'default_intake_batch_id': self.id},
+        }
+    
     # ===== NOTIFICATION METHODS (Phase 3.1.3) =====
     
     def _get_notification_recipients(self):
@@ -1677,13 +1747,17 @@ class IntakeBatch(models.Model):
                 'recipients': [{'id': r.id, 'name': r.name, 'email': r.email} for r in recipients]
             }
             
-            # Send email notifications
-            if self.email_notification_enabled:
-                self._send_email_notifications(recipients, notification_data)
-            
-            # Send in-app notifications
-            if self.in_app_notification_enabled:
-                self._send_in_app_notifications(recipients, notification_data)
+            if self.env['gr.notification.digest.entry']._get_digest_window():
+                # Collect into the recipients' digests
+                self._add_notification_to_digest(recipients, notification_data)
+            else:
+                # Send email notifications
+                if self.email_notification_enabled:
+                    self._send_email_notifications(recipients, notification_data)
+                
+                # Send in-app notifications
+                if self.in_app_notification_enabled:
+                    self._send_in_app_notifications(recipients, notification_data)
             
             # Update batch notification fields
             self.write({
@@ -1700,6 +1774,22 @@ class IntakeBatch(models.Model):
         except Exception as e:
             _logger.error('Error sending notification for batch %s: %s', self.name, str(e))
     
+    def _add_notification_to_digest(self, recipients, notification_data):
+        """Collect a batch notification into the digests of the recipients."""
+        common = {
+            'subject': f"Batch Notification: {notification_data['batch_name']}",
+            'message': notification_data['message'],
+            'res_model': 'gr.intake.batch',
+            'res_id': self.id,
+        }
+        vals_list = []
+        for recipient in recipients:
+            if self.email_notification_enabled and recipient.email:
+                vals_list.append(dict(common, channel='email', recipient_email=recipient.email))
+            if self.in_app_notification_enabled:
+                vals_list.append(dict(common, channel='activity', recipient_user_id=recipient.id))
+        self.env['gr.notification.digest.entry']._add_entries(vals_list)
+    
     def _send_email_notifications(self, recipients, notification_data):
         """Send email notifications to recipients."""
         try:
@@ -1712,18 +1802,20 @@ class IntakeBatch(models.Model):
                 # Fallback to generic template
                 template = self.env.ref('grants_training_suite_v2.email_template_batch_notification_generic')
             
-            # Send email to each recipient
+            # Render an email per recipient, sent by the notification outbox
+            mails = self.env['mail.mail']
             for recipient in recipients:
                 if recipient.email:
-                    template.send_mail(self.id, force_send=True, email_values={
+                    mails |= mails.browse(template.send_mail(self.id, email_values={
                         'email_to': recipient.email,
                         'recipient_name': recipient.name,
                         'notification_type': notification_data['notification_type'],
                         'message': notification_data['message'],
                         'batch_name': notification_data['batch_name'],
                         'details': notification_data['details'],
-                    })
-                    _logger.info('Sent email notification to %s (%s)', recipient.name, recipient.email)
+                    }))
+                    _logger.info('Queued email notification to %s (%s)', recipient.name, recipient.email)
+            self.env['gr.notification.outbox']._enqueue_mails(mails)
             
         except Exception as e:
             _logger.error('Error sending email notifications: %s', str(e))
@@ -1822,43 +1914,23 @@ class IntakeBatch(models.Model):
     def action_create_sessions_for_batch(self):
         """Create course sessions for all students in this batch."""
         self.ensure_one()
-        
-        if self.state != 'processed':
-            raise UserError(_('Batch must be processed before creating sessions.'))
-        
-        if not self.session_creation_enabled:
-            raise UserError(_('Session creation is disabled for this batch.'))
+        self._check_session_creation_allowed()
         
         try:
-            # Get all students from this batch
-            students = self.env['gr.student'].search([
-                ('intake_batch_id', '=', self.id)
-            ])
-            
-            if not students:
-                raise UserError(_('No students found in this batch.'))
-            
-            created_sessions = []
-            errors = []
             session_creation_start = fields.Datetime.now()
-            
-            for student in students:
-                try:
-                    session = self._create_session_for_student(student)
-                    if session:
-                        created_sessions.append(session)
-                except Exception as e:
-                    error_msg = f'Error creating session for student {student.name}: {str(e)}'
-                    errors.append(error_msg)
-                    _logger.error(error_msg)
+            created_sessions, plan = self._create_sessions_bulk()
+            errors = [f"Error creating session for student {error['student_name']}: {error['error']}"
+                      for error in plan['errors']]
+            scheduled_count = len(created_sessions.filtered(lambda s: s.state == 'scheduled'))
             
             # Update batch with session creation results
             self.write({
                 'sessions_created_count': len(created_sessions),
-                'sessions_scheduled_count': len([s for s in created_sessions if s.state == 'scheduled']),
+                'sessions_scheduled_count': scheduled_count,
                 'session_creation_date': session_creation_start,
                 'session_creation_errors': '\n'.join(errors) if errors else False,
-                'session_creation_summary': self._generate_session_creation_summary(created_sessions, errors)
+                'session_creation_summary': self._generate_session_creation_summary(
+                    created_sessions, errors, plan['conflicts'])
             })
             
             # Send notification about session creation
@@ -1870,22 +1942,23 @@ class IntakeBatch(models.Model):
                 
                 self._send_batch_notification(notification_type, message, {
                     'sessions_created': len(created_sessions),
-                    'sessions_scheduled': len([s for s in created_sessions if s.state == 'scheduled']),
+                    'sessions_scheduled': scheduled_count,
+                    'conflicts': len(plan['conflicts']),
                     'errors': len(errors),
-                    'students_processed': len(students)
+                    'students_processed': plan['students']
                 })
             
-            _logger.info('Session creation completed for batch %s: %d sessions created, %d errors', 
-                        self.name, len(created_sessions), len(errors))
+            _logger.info('Session creation completed for batch %s: %d sessions created, %d conflicts, %d errors', 
+                        self.name, len(created_sessions), len(plan['conflicts']), len(errors))
             
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('Sessions Created'),
-                    'message': _('Successfully created %d sessions. %d errors encountered.') % 
-                              (len(created_sessions), len(errors)),
-                    'type': 'warning' if errors else 'success',
+                    'message': _('Successfully created %d sessions. %d conflicts skipped, %d errors encountered.') % 
+                              (len(created_sessions), len(plan['conflicts']), len(errors)),
+                    'type': 'warning' if errors or plan['conflicts'] else 'success',
                     'sticky': True,
                 }
             }
@@ -1894,33 +1967,164 @@ class IntakeBatch(models.Model):
             _logger.error('Error creating sessions for batch %s: %s', self.name, str(e))
             raise UserError(_('Error creating sessions: %s') % str(e))
     
-    def _create_session_for_student(self, student):
-        """Create a course session for a specific student."""
+    def action_preview_sessions_for_batch(self):
+        """Dry run of the session creation: show the planned schedule without creating anything."""
+        self.ensure_one()
+        self._check_session_creation_allowed()
+        
         try:
-            # Determine session parameters
-            session_date = self._calculate_session_date(student)
-            session_duration = self.default_session_duration
-            session_type = self.default_session_type
-            
-            # Use session template if available
-            session_vals = {
-                'name': f"Session - {student.name} - {session_date.strftime('%Y-%m-%d %H:%M')}",
-                'student_id': student.id,
-                'session_date': session_date,
-                'session_duration': session_duration,
-                'session_type': session_type,
-                'state': 'scheduled',
-                'session_topic': self._get_default_session_topic(student),
-                'session_objectives': self._get_default_session_objectives(student),
+            __, plan = self._create_sessions_bulk(dry_run=True)
+        except Exception as e:
+            _logger.error('Error planning sessions for batch %s: %s', self.name, str(e))
+            raise UserError(_('Error planning sessions: %s') % str(e))
+        
+        message = f"Session Plan (dry run):\n"
+        message += f"• Students: {plan['students']}\n"
+        message += f"• Sessions planned: {len(plan['schedule'])}\n"
+        message += f"• Conflicts: {len(plan['conflicts'])}\n"
+        message += f"• Errors: {len(plan['errors'])}\n\n"
+        for item in plan['schedule'][:5]:
+            message += f"  - {item['student_name']}: {item['session_date']}\n"
+        if len(plan['schedule']) > 5:
+            message += f"  ... and {len(plan['schedule']) - 5} more sessions\n"
+        for conflict in plan['conflicts'][:5]:
+            message += f"  ⚠️ {conflict['student_name']}: overlaps {conflict['conflicting_session']}\n"
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Session Plan'),
+                'message': message,
+                'type': 'warning' if plan['conflicts'] or plan['errors'] else 'info',
+                'sticky': True,
             }
+        }
+    
+    def _check_session_creation_allowed(self):
+        """Raise if sessions cannot be created for this batch."""
+        if self.state != 'processed':
+            raise UserError(_('Batch must be processed before creating sessions.'))
+        
+        if not self.session_creation_enabled:
+            raise UserError(_('Session creation is disabled for this batch.'))
+    
+    def _create_sessions_bulk(self, dry_run=False):
+        """Plan the sessions of all batch students and create them chunk by chunk.
+        
+        :param dry_run: only compute the plan, nothing is written
+        :return: tuple (created sessions, plan summary). The summary is a dict with
+                 the number of ``students``, the planned ``schedule`` and the
+                 ``conflicts`` and ``errors`` found, one dict per student.
+        """
+        self.ensure_one()
+        students = self.env['gr.student'].search([
+            ('intake_batch_id', '=', self.id)
+        ])
+        
+        if not students:
+            raise UserError(_('No students found in this batch.'))
+        
+        planned, conflicts, errors = self._plan_batch_sessions(students)
+        plan = {
+            'students': len(students),
+            'schedule': [{
+                'student_id': student.id,
+                'student_name': student.name,
+                'session_date': fields.Datetime.to_string(vals['session_date']),
+                'session_duration': vals['session_duration'],
+                'session_type': vals['session_type'],
+            } for student, vals in planned],
+            'conflicts': conflicts,
+            'errors': errors,
+        }
+        
+        if dry_run:
+            return self.env['gr.course.session'], plan
+        return self._create_planned_sessions(planned, errors), plan
+    
+    def _plan_batch_sessions(self, students):
+        """Compute the session values of all students in memory.
+        
+        Planned sessions overlapping a scheduled session the student already has
+        are reported as conflicts; existing sessions are read with one query.
+        
+        :return: tuple (list of (student, session values), conflicts, errors)
+        """
+        planned = []
+        errors = []
+        for student in students:
+            try:
+                planned.append((student, self._prepare_session_vals(student)))
+            except Exception as e:
+                errors.append({'student_id': student.id, 'student_name': student.name, 'error': str(e)})
+                _logger.error('Error planning session for student %s: %s', student.name, str(e))
+        
+        if not planned:
+            return planned, [], errors
+        
+        # Existing sessions around the planned slots, grouped by student
+        starts = [vals['session_date'] for __, vals in planned]
+        existing = self.env['gr.course.session'].search_read([
+            ('student_id', 'in', [student.id for student, __ in planned]),
+            ('state', 'in', ('scheduled', 'in_progress')),
+            ('session_date', '>', min(starts) - timedelta(hours=MAX_SESSION_HOURS)),
+            ('session_date', '<', max(starts) + timedelta(hours=MAX_SESSION_HOURS)),
+        ], ['student_id', 'name', 'session_date', 'session_duration'])
+        sessions_by_student = {}
+        for session in existing:
+            sessions_by_student.setdefault(session['student_id'][0], []).append(session)
+        
+        conflicts = []
+        free = []
+        for student, vals in planned:
+            start = vals['session_date']
+            end = start + timedelta(hours=vals['session_duration'] or 0)
+            overlapping = next((
+                session for session in sessions_by_student.get(student.id, [])
+                if session['session_date'] < end
+                and start < session['session_date'] + timedelta(hours=session['session_duration'] or 0)
+            ), None)
+            if overlapping:
+                conflicts.append({
+                    'student_id': student.id,
+                    'student_name': student.name,
+                    'session_date': fields.Datetime.to_string(start),
+                    'conflicting_session_id': overlapping['id'],
+                    'conflicting_session': overlapping['name'],
+                })
+            else:
+                free.append((student, vals))
+        
+        return free, conflicts, errors
+    
+    def _create_planned_sessions(self, planned, errors):
+        """Create planned sessions with one ``create`` per chunk, isolating bad rows on failure."""
+        Session = self.env['gr.course.session'].with_context(tracking_disable=True)
+        session_ids = []
+        
+        for chunk in intake_reader.chunked(planned, self._get_import_chunk_size()):
+            try:
+                with self.env.cr.savepoint():
+                    session_ids.extend(Session.create([vals for __, vals in chunk]).ids)
+                continue
+            except Exception as e:
+                _logger.warning('Bulk session creation failed for batch %s, retrying one by one: %s', self.name, str(e))
             
-            # Apply template if available
-            if self.session_template_id:
-                template_vals = self._apply_session_template(session_vals)
-                session_vals.update(template_vals)
-            
-            # Create the session
-            session = self.env['gr.course.session'].create(session_vals)
+            for student, vals in chunk:
+                try:
+                    with self.env.cr.savepoint():
+                        session_ids.append(Session.create(vals).id)
+                except Exception as e:
+                    errors.append({'student_id': student.id, 'student_name': student.name, 'error': str(e)})
+                    _logger.error('Error creating session for student %s: %s', student.name, str(e))
+        
+        return self.env['gr.course.session'].browse(session_ids)
+    
+    def _create_session_for_student(self, student):
+        """Create a course session for a specific student."""
+        try:
+            session = self.env['gr.course.session'].create(self._prepare_session_vals(student))
             
             _logger.info('Created session %s for student %s', session.name, student.name)
             return session
@@ -1929,6 +2133,28 @@ class IntakeBatch(models.Model):
             _logger.error('Error creating session for student %s: %s', student.name, str(e))
             raise e
     
+    def _prepare_session_vals(self, student):
+        """Return the values of the session planned for a student (no database writes)."""
+        # Determine session parameters
+        session_date = self._calculate_session_date(student)
+        
+        session_vals = {
+            'name': f"Session - {student.name} - {session_date.strftime('%Y-%m-%d %H:%M')}",
+            'student_id': student.id,
+            'session_date': session_date,
+            'session_duration': self.default_session_duration,
+            'session_type': self.default_session_type,
+            'state': 'scheduled',
+            'session_topic': self._get_default_session_topic(student),
+            'session_objectives': self._get_default_session_objectives(student),
+        }
+        
+        # Apply template if available
+        if self.session_template_id:
+            session_vals.update(self._apply_session_template(session_vals))
+        
+        return session_vals
+    
     def _calculate_session_date(self, student):
         """Calculate appropriate session date for student."""
         from datetime import datetime, timedelta
@@ -1984,12 +2210,13 @@ class IntakeBatch(models.Model):
         
         return template_vals
     
-    def _generate_session_creation_summary(self, created_sessions, errors):
+    def _generate_session_creation_summary(self, created_sessions, errors, conflicts=()):
         """Generate summary of session creation process."""
         summary_lines = [
             f"Session Creation Summary for Batch: {self.name}",
             f"Date: {fields.Datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             f"Total Sessions Created: {len(created_sessions)}",
+            f"Total Conflicts: {len(conflicts)}",
             f"Total Errors: {len(errors)}",
             ""
         ]
@@ -2000,6 +2227,13 @@ class IntakeBatch(models.Model):
                 summary_lines.append(f"  - {session.name} ({session.student_id.name})")
             summary_lines.append("")
         
+        if conflicts:
+            summary_lines.append("Conflicts (not created):")
+            for conflict in conflicts:
+                summary_lines.append(f"  - {conflict['student_name']} at {conflict['session_date']} "
+                                     f"overlaps {conflict['conflicting_session']}")
+            summary_lines.append("")
+        
         if errors:
             summary_lines.append("Errors:")
             for error in errors:
@@ -2176,11 +2410,8 @@ class IntakeBatch(models.Model):
             raise UserError(_('Please upload a file first.'))
         
         try:
-            # Parse file
-            if self.file_type == 'csv':
-                records = self._parse_csv(self.file_data)
-            else:
-                records = self._parse_excel(self.file_data)
+            # Parse file (served from the parsed cache)
+            records = self._parse_file()
             
             if not records:
                 raise UserError(_('No data found in the uploaded file.'))
@@ -2333,6 +2564,11 @@ class IntakeBatch(models.Model):
                 'label': 'Certificate Date',
                 'required': False,
                 'help': 'Date certificate was obtained'
+            },
+            'national_id': {
+                'label': 'National ID',
+                'required': False,
+                'help': 'National identity or iqama number (used for duplicate detection)'
             }
         }
     
@@ -2346,12 +2582,9 @@ class IntakeBatch(models.Model):
         # Set mapping progress to in_progress
         self.mapping_progress = 'in_progress'
         
-        # Parse file to get available columns
+        # Read the first rows to get available columns
         try:
-            if self.file_type == 'csv':
-                records = self._parse_csv(self.file_data)
-            else:
-                records = self._parse_excel(self.file_data)
+            records = list(itertools.islice(self._iter_parsed_records(), 3))
             
             if not records:
                 self.mapping_progress = 'failed'
@@ -2414,7 +2647,8 @@ class IntakeBatch(models.Model):
             'english_level': ['english_level', 'english', 'level', 'proficiency'],
             'has_certificate': ['has_certificate', 'certificate', 'cert'],
             'certificate_type': ['certificate_type', 'cert_type', 'certification'],
-            'certificate_date': ['certificate_date', 'cert_date', 'certification_date']
+            'certificate_date': ['certificate_date', 'cert_date', 'certification_date'],
+            'national_id': ['national_id', 'nationalid', 'id_number', 'iqama']
         }
         
         # Try to match columns
@@ -2473,26 +2707,12 @@ class IntakeBatch(models.Model):
             raise UserError(_('No column mapping found. Please configure column mapping first.'))
         
         try:
-            mapping = json.loads(self.column_mapping)
+            # Read the parsed rows with the mapping applied
+            mapped_records = list(self._iter_file_records())
             
-            # Parse file
-            if self.file_type == 'csv':
-                raw_records = self._parse_csv(self.file_data)
-            else:
-                raw_records = self._parse_excel(self.file_data)
-            
-            if not raw_records:
+            if not mapped_records:
                 raise UserError(_('No data found in the uploaded file.'))
             
-            # Apply mapping to transform records
-            mapped_records = []
-            for record in raw_records:
-                mapped_record = {}
-                for field, column in mapping.items():
-                    if column and column in record:
-                        mapped_record[field] = record[column]
-                mapped_records.append(mapped_record)
-            
             # Update total records count
             self.total_records = len(mapped_records)
             
@@ -2551,9 +2771,14 @@ class IntakeBatch(models.Model):
         # Reset import statistics fields (Phase 2.4)
         self.created_students_count = 0
         self.updated_students_count = 0
+        self.skipped_students_count = 0
         self.import_errors = False
         self.import_summary = False
         
+        # Reset streaming import cursor
+        self.import_cursor = 0
+        self.import_checksum = False
+        
         # Reset progress tracking fields (Phase 3.1)
         self.upload_progress = 'pending'
         self.mapping_progress = 'pending'
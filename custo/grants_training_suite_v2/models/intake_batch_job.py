@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+import traceback
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Namespace of the PostgreSQL advisory locks taken while a job slice runs
+JOB_LOCK_NAMESPACE = 4827
+
+
+class IntakeBatchJob(models.Model):
+    _name = 'gr.intake.batch.job'
+    _description = 'Intake Batch Background Processing Job'
+    _order = 'id desc'
+
+    name = fields.Char(
+        string='Job',
+        compute='_compute_name',
+        store=True
+    )
+
+    intake_batch_id = fields.Many2one(
+        'gr.intake.batch',
+        string='Intake Batch',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ], string='Status', default='pending', required=True, index=True)
+
+    requested_by_id = fields.Many2one(
+        'res.users',
+        string='Requested By',
+        default=lambda self: self.env.user,
+        help='User who queued the job'
+    )
+
+    time_slice = fields.Integer(
+        string='Time Slice (seconds)',
+        default=lambda self: self._default_time_slice(),
+        help='Maximum time a single cron run spends on this job before yielding'
+    )
+
+    attempt_count = fields.Integer(
+        string='Attempts',
+        default=0,
+        help='Number of failed attempts'
+    )
+
+    max_attempts = fields.Integer(
+        string='Max Attempts',
+        default=3,
+        help='The job is marked as failed after this many consecutive errors'
+    )
+
+    slice_count = fields.Integer(
+        string='Slices Run',
+        default=0,
+        help='Number of time slices the job has been processed in'
+    )
+
+    date_queued = fields.Datetime(
+        string='Queued On',
+        default=fields.Datetime.now
+    )
+
+    date_started = fields.Datetime(
+        string='Started On'
+    )
+
+    date_finished = fields.Datetime(
+        string='Finished On'
+    )
+
+    last_error = fields.Text(
+        string='Last Error'
+    )
+
+    # Progress mirrored from the batch for the job list
+    rows_done = fields.Integer(
+        related='intake_batch_id.import_cursor',
+        string='Rows Imported'
+    )
+
+    total_records = fields.Integer(
+        related='intake_batch_id.total_records',
+        string='Total Rows'
+    )
+
+    progress_percentage = fields.Float(
+        related='intake_batch_id.progress_percentage',
+        string='Progress (%)'
+    )
+
+    @api.depends('intake_batch_id')
+    def _compute_name(self):
+        """Compute job display name from the batch."""
+        for job in self:
+            job.name = _('Import %s') % (job.intake_batch_id.name or '')
+
+    @api.model
+    def _default_time_slice(self):
+        """Default slice length, configurable through a system parameter."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'grants_training_suite_v2.intake_job_time_slice', 120))
+
+    # ===== USER ACTIONS =====
+
+    def action_cancel(self):
+        """Cancel pending or running jobs. A running slice stops after its current chunk."""
+        for job in self:
+            if job.state not in ('pending', 'running'):
+                raise UserError(_('Only pending or running jobs can be cancelled.'))
+        self.write({
+            'state': 'cancelled',
+            'date_finished': fields.Datetime.now(),
+        })
+        for job in self:
+            job.intake_batch_id.processing_progress = 'pending'
+            _logger.info('Intake job %s cancelled at row %d', job.id, job.intake_batch_id.import_cursor)
+        return True
+
+    def action_retry(self):
+        """Re-queue failed or cancelled jobs; the import resumes from the batch cursor."""
+        for job in self:
+            if job.state not in ('failed', 'cancelled'):
+                raise UserError(_('Only failed or cancelled jobs can be retried.'))
+            if job.intake_batch_id.state == 'error':
+                job.intake_batch_id.state = 'validated'
+        self.write({
+            'state': 'pending',
+            'attempt_count': 0,
+            'last_error': False,
+            'date_finished': False,
+        })
+        self.intake_batch_id.write({'processing_progress': 'in_progress'})
+        self._trigger_processing()
+        return True
+
+    # ===== PROCESSING =====
+
+    @api.model
+    def _trigger_processing(self):
+        """Wake up the processing cron instead of waiting for its next run."""
+        cron = self.env.ref('grants_training_suite_v2.ir_cron_process_intake_jobs', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _cron_process_jobs(self, time_budget=None):
+        """Process queued jobs in bounded time slices.
+
+        Called by the cron. Jobs locked by another worker are skipped, and the
+        cron re-triggers itself while work remains.
+        """
+        budget = time_budget or int(self.env['ir.config_parameter'].sudo().get_param(
+            'grants_training_suite_v2.intake_job_cron_budget', 300))
+        cron_deadline = time.monotonic() + budget
+
+        jobs = self.search([('state', 'in', ('pending', 'running'))], order='id')
+        for job in jobs:
+            if time.monotonic() >= cron_deadline:
+                break
+            if not job._acquire_lock():
+                continue
+            try:
+                deadline = min(cron_deadline, time.monotonic() + (job.time_slice or 120))
+                job._run_slice(deadline)
+            finally:
+                job._release_lock()
+
+        if self.search_count([('state', 'in', ('pending', 'running'))]):
+            self._trigger_processing()
+        return True
+
+    def _acquire_lock(self):
+        """Take a session-level advisory lock so only one worker runs a job."""
+        self.ensure_one()
+        self.env.cr.execute('SELECT pg_try_advisory_lock(%s, %s)', (JOB_LOCK_NAMESPACE, self.id))
+        return self.env.cr.fetchone()[0]
+
+    def _release_lock(self):
+        """Release the advisory lock taken by ``_acquire_lock``."""
+        self.ensure_one()
+        self.env.cr.execute('SELECT pg_advisory_unlock(%s, %s)', (JOB_LOCK_NAMESPACE, self.id))
+
+    def _is_cancelled(self):
+        """Read the committed job state, so a cancel from the UI is seen between chunks."""
+        self.ensure_one()
+        self.flush_model(['state'])
+        self.env.cr.execute('SELECT state FROM gr_intake_batch_job WHERE id = %s', (self.id,))
+        row = self.env.cr.fetchone()
+        return not row or row[0] == 'cancelled'
+
+    def _run_slice(self, deadline):
+        """Run one time slice of the job until the deadline or the end of the file."""
+        self.ensure_one()
+        batch = self.intake_batch_id
+
+        if self.state == 'pending':
+            if batch.state != 'validated':
+                self.write({'state': 'failed', 'last_error': _('Batch %s is not validated.') % batch.name})
+                return
+            batch._prepare_import_cursor()
+            self.write({'state': 'running', 'date_started': self.date_started or fields.Datetime.now()})
+            batch.processing_progress = 'in_progress'
+            batch._commit_import_chunk()
+
+        try:
+            completed = batch._run_streaming_import(deadline=deadline, should_stop=self._is_cancelled)
+            self.slice_count += 1
+            if self._is_cancelled():
+                return
+            if completed:
+                batch._finalize_streaming_import()
+                batch._notify_import_completed()
+                self.write({'state': 'done', 'date_finished': fields.Datetime.now()})
+                _logger.info('Intake job %s finished for batch %s', self.id, batch.name)
+            batch._commit_import_chunk()
+        except Exception as e:
+            batch._rollback_import_chunk()
+            self._handle_slice_error(e)
+
+    def _handle_slice_error(self, error):
+        """Record a failed slice; give up after ``max_attempts`` consecutive errors."""
+        self.ensure_one()
+        _logger.error('Intake job %s failed: %s', self.id, str(error))
+        attempts = self.attempt_count + 1
+        vals = {
+            'attempt_count': attempts,
+            'last_error': '%s\n\n%s' % (error, traceback.format_exc()),
+        }
+        if attempts >= self.max_attempts:
+            vals.update({'state': 'failed', 'date_finished': fields.Datetime.now()})
+            self.intake_batch_id.write({
+                'state': 'error',
+                'processing_progress': 'failed',
+                'validation_errors': str(error),
+            })
+            self.intake_batch_id._send_batch_notification(
+                'error',
+                f"Batch '{self.intake_batch_id.name}' processing failed with error: {error}",
+                {'error_type': 'Processing Error', 'error_message': str(error)},
+            )
+        self.write(vals)
+        self.intake_batch_id._commit_import_chunk()
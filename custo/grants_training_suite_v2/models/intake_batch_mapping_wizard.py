@@ -94,6 +94,11 @@ class IntakeBatchMappingWizard(models.TransientModel):
         string='Certificate Date',
         help='Map to certificate date field'
     )
+    
+    national_id_mapping = fields.Char(
+        string='National ID',
+        help='Map to national ID field'
+    )
 
     @api.model
     def default_get(self, fields_list):
@@ -168,7 +173,8 @@ class IntakeBatchMappingWizard(models.TransientModel):
                 'english_level': 'english_level_mapping',
                 'has_certificate': 'has_certificate_mapping',
                 'certificate_type': 'certificate_type_mapping',
-                'certificate_date': 'certificate_date_mapping'
+                'certificate_date': 'certificate_date_mapping',
+                'national_id': 'national_id_mapping'
             }
             
             update_vals = {}
@@ -207,7 +213,8 @@ class IntakeBatchMappingWizard(models.TransientModel):
             'english_level': self.english_level_mapping,
             'has_certificate': self.has_certificate_mapping,
             'certificate_type': self.certificate_type_mapping,
-            'certificate_date': self.certificate_date_mapping
+            'certificate_date': self.certificate_date_mapping,
+            'national_id': self.national_id_mapping
         }
         
         # Only include mapped fields (skip empty mappings)
@@ -228,7 +235,8 @@ class IntakeBatchMappingWizard(models.TransientModel):
                         'english_level': 'English Level',
                         'has_certificate': 'Has Certificate',
                         'certificate_type': 'Certificate Type',
-                        'certificate_date': 'Certificate Date'
+                        'certificate_date': 'Certificate Date',
+                        'national_id': 'National ID'
                     }
                     raise UserError(_('Column "%s" not found in file for %s. Available columns: %s') % 
                                   (column, field_labels[field], ', '.join(available_columns)))
@@ -281,7 +289,8 @@ class IntakeBatchMappingWizard(models.TransientModel):
                 'english_level': self.english_level_mapping,
                 'has_certificate': self.has_certificate_mapping,
                 'certificate_type': self.certificate_type_mapping,
-                'certificate_date': self.certificate_date_mapping
+                'certificate_date': self.certificate_date_mapping,
+                'national_id': self.national_id_mapping
             }
             
             # Apply mapping to preview records
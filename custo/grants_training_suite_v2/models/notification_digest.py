@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+from markupsafe import Markup
+from odoo import models, fields, api, _
+
+_logger = logging.getLogger(__name__)
+
+# Default digest window in minutes; 0 sends every notification on its own
+DIGEST_WINDOW = 0
+
+
+class NotificationDigestEntry(models.Model):
+    _name = 'gr.notification.digest.entry'
+    _description = 'Notification Digest Entry'
+    _order = 'id'
+
+    channel = fields.Selection([
+        ('email', 'Email'),
+        ('activity', 'Activity'),
+        ('sms', 'SMS'),
+    ], string='Channel', required=True)
+
+    recipient_key = fields.Char(
+        string='Recipient Key',
+        required=True,
+        index=True,
+        help='Email address, user id or phone number the entries are grouped on'
+    )
+
+    recipient_email = fields.Char(string='Recipient Email')
+    recipient_user_id = fields.Many2one('res.users', string='Recipient User', ondelete='cascade')
+    recipient_phone = fields.Char(string='Recipient Phone')
+
+    subject = fields.Char(string='Subject', required=True)
+    message = fields.Text(string='Message')
+
+    res_model = fields.Char(
+        string='Source Model',
+        help='Model of the record the event is about; digest activities are attached to it'
+    )
+    res_id = fields.Integer(string='Source Record')
+
+    notification_id = fields.Many2one(
+        'gr.progress.notification',
+        string='Notification',
+        ondelete='cascade'
+    )
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+    ], string='Status', default='pending', required=True, index=True)
+
+    digest_date = fields.Datetime(string='Digest Date', readonly=True)
+
+    # ===== COLLECTING =====
+
+    @api.model
+    def _get_digest_window(self):
+        """Digest window in minutes, configurable through a system parameter; 0 disables digests."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'grants_training_suite_v2.notification_digest_window', DIGEST_WINDOW))
+
+    @api.model
+    def _add_entries(self, vals_list):
+        """Collect events for the next digest of their recipients."""
+        for vals in vals_list:
+            if vals['channel'] == 'email':
+                vals['recipient_key'] = vals['recipient_email'].strip().lower()
+            elif vals['channel'] == 'activity':
+                vals['recipient_key'] = str(vals['recipient_user_id'])
+            else:
+                vals['recipient_key'] = vals['recipient_phone']
+        entries = self.sudo().create(vals_list)
+        cron = self.env.ref('grants_training_suite_v2.ir_cron_send_notification_digests', raise_if_not_found=False)
+        if cron and entries:
+            cron._trigger(fields.Datetime.now() + timedelta(minutes=self._get_digest_window()))
+        return entries
+
+    # ===== SENDING =====
+
+    @api.model
+    def _cron_send_digests(self):
+        """Send one message per recipient and channel whose oldest pending entry is past the window."""
+        cutoff = fields.Datetime.now() - timedelta(minutes=self._get_digest_window())
+        groups = {}
+        for entry in self.search([('state', '=', 'pending')]):
+            groups.setdefault((entry.channel, entry.recipient_key), []).append(entry)
+
+        due_ids = []
+        mail_vals_list = []
+        activity_vals_list = []
+        sms_list = []
+        for (channel, _key), entries in groups.items():
+            if min(entry.create_date for entry in entries) > cutoff:
+                continue
+            digest = self.browse([entry.id for entry in entries])
+            due_ids.extend(digest.ids)
+            if channel == 'email':
+                mail_vals_list.append(digest._prepare_digest_mail_vals())
+            elif channel == 'activity':
+                activity_vals_list.append(digest._prepare_digest_activity_vals())
+            else:
+                sms_list.append((digest[0].recipient_phone, digest._render_digest_text()))
+
+        outbox = self.env['gr.notification.outbox']
+        outbox._enqueue_mails(self.env['mail.mail'].sudo().create(mail_vals_list))
+        outbox._enqueue_activities(activity_vals_list)
+        for phone, text in sms_list:
+            outbox._enqueue_sms(phone, text)
+
+        self.browse(due_ids).write({'state': 'sent', 'digest_date': fields.Datetime.now()})
+        _logger.info('Sent %d notification digests covering %d events',
+                     len(mail_vals_list) + len(activity_vals_list) + len(sms_list), len(due_ids))
+        return len(due_ids)
+
+    def _get_digest_subject(self):
+        """Subject of a digest: the event subject when alone, a count otherwise."""
+        if len(self) == 1:
+            return self.subject
+        return _('%s new notifications') % len(self)
+
+    def _render_digest_html(self):
+        """Render the entries as one HTML message."""
+        items = Markup('').join(
+            Markup('<li><strong>%s</strong><br/>%s</li>') % (entry.subject, entry.message or '')
+            for entry in self
+        )
+        return Markup('<p>%s</p><ul>%s</ul>') % (_('You have %s new notifications:') % len(self), items)
+
+    def _render_digest_text(self):
+        """Render the entries as one plain text message."""
+        return '\n'.join(f'- {entry.subject}: {entry.message or ""}' for entry in self)
+
+    def _prepare_digest_mail_vals(self):
+        """Values of the ``mail.mail`` sending the digest."""
+        return {
+            'subject': self._get_digest_subject(),
+            'body_html': self._render_digest_html(),
+            'email_to': self[0].recipient_email,
+            'auto_delete': True,
+        }
+
+    def _prepare_digest_activity_vals(self):
+        """Values of the activity carrying the digest, attached to the source of the latest entry."""
+        latest = self[-1]
+        return {
+            'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
+            'res_model': latest.res_model,
+            'res_id': latest.res_id,
+            'user_id': latest.recipient_user_id.id,
+            'summary': self._get_digest_subject(),
+            'note': str(self._render_digest_html()),
+            'date_deadline': fields.Date.to_string(fields.Date.today()),
+        }
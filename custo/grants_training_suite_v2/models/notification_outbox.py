@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from datetime import datetime, timedelta
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Outbox items dispatched per channel and per worker run
+DISPATCH_BATCH_SIZE = 100
+
+# Default dispatch rate of each channel, in items per minute
+CHANNEL_RATES = {
+    'email': 120,
+    'activity': 1000,
+    'sms': 60,
+}
+
+# Delivery attempts before an item is given up
+MAX_ATTEMPTS = 5
+
+# Delay before the first retry, doubled on each further attempt, and its ceiling
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 3600
+
+# Scheduled date keeping queued emails away from the standard mail scheduler until dispatched
+HELD_MAIL_DATE = datetime(9999, 12, 31)
+
+
+class NotificationOutbox(models.Model):
+    _name = 'gr.notification.outbox'
+    _description = 'Outbound Notification Queue'
+    _order = 'id desc'
+
+    channel = fields.Selection([
+        ('email', 'Email'),
+        ('activity', 'Activity'),
+        ('sms', 'SMS'),
+    ], string='Channel', required=True, index=True)
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ], string='Status', default='pending', required=True, index=True)
+
+    notification_id = fields.Many2one(
+        'gr.progress.notification',
+        string='Notification',
+        ondelete='cascade',
+        index='btree_not_null'
+    )
+
+    mail_id = fields.Many2one(
+        'mail.mail',
+        string='Email',
+        ondelete='set null',
+        help='Rendered email, sent by the dispatcher'
+    )
+
+    payload = fields.Json(
+        string='Payload',
+        help='Activity values or SMS number and text'
+    )
+
+    attempt_count = fields.Integer(
+        string='Attempts',
+        default=0,
+        readonly=True
+    )
+
+    next_attempt_date = fields.Datetime(
+        string='Next Attempt',
+        default=fields.Datetime.now,
+        index=True
+    )
+
+    sent_date = fields.Datetime(
+        string='Sent Date',
+        readonly=True
+    )
+
+    latency = fields.Float(
+        string='Latency (s)',
+        compute='_compute_latency',
+        store=True,
+        help='Seconds between queuing and delivery'
+    )
+
+    last_error = fields.Text(
+        string='Last Error',
+        readonly=True
+    )
+
+    @api.depends('sent_date')
+    def _compute_latency(self):
+        """Compute the delay between queuing and delivery."""
+        for item in self:
+            if item.sent_date and item.create_date:
+                item.latency = (item.sent_date - item.create_date).total_seconds()
+            else:
+                item.latency = 0.0
+
+    # ===== QUEUING =====
+
+    @api.model
+    def _enqueue_mails(self, mails, notification=None):
+        """Queue rendered ``mail.mail`` records; SMTP happens in the dispatcher.
+
+        The mails are held back from the standard mail scheduler, which would
+        otherwise send (and auto-delete) them outside the channel rate.
+        """
+        if not mails:
+            return self.browse()
+        mails.sudo().write({'scheduled_date': HELD_MAIL_DATE})
+        items = self.sudo().create([{
+            'channel': 'email',
+            'mail_id': mail.id,
+            'notification_id': notification.id if notification else False,
+        } for mail in mails])
+        self._trigger_dispatch()
+        return items
+
+    @api.model
+    def _enqueue_activities(self, vals_list, notification=None):
+        """Queue ``mail.activity`` values, created by the dispatcher in batches."""
+        if not vals_list:
+            return self.browse()
+        items = self.sudo().create([{
+            'channel': 'activity',
+            'payload': vals,
+            'notification_id': notification.id if notification else False,
+        } for vals in vals_list])
+        self._trigger_dispatch()
+        return items
+
+    @api.model
+    def _enqueue_sms(self, phone, message, notification=None):
+        """Queue an SMS."""
+        items = self.sudo().create({
+            'channel': 'sms',
+            'payload': {'phone': phone, 'message': message},
+            'notification_id': notification.id if notification else False,
+        })
+        self._trigger_dispatch()
+        return items
+
+    @api.model
+    def _trigger_dispatch(self, at=None):
+        """Wake up the dispatcher instead of waiting for its next run."""
+        cron = self.env.ref('grants_training_suite_v2.ir_cron_dispatch_notification_outbox', raise_if_not_found=False)
+        if cron:
+            cron._trigger(at)
+
+    # ===== USER ACTIONS =====
+
+    def action_retry(self):
+        """Re-queue failed or cancelled items."""
+        for item in self:
+            if item.state not in ('failed', 'cancelled'):
+                raise UserError(_('Only failed or cancelled items can be retried.'))
+        self.write({
+            'state': 'pending',
+            'attempt_count': 0,
+            'next_attempt_date': fields.Datetime.now(),
+        })
+        self._trigger_dispatch()
+        return True
+
+    def action_cancel(self):
+        """Drop pending items."""
+        for item in self:
+            if item.state != 'pending':
+                raise UserError(_('Only pending items can be cancelled.'))
+        self.write({'state': 'cancelled'})
+        self.mail_id.filtered(lambda mail: mail.state in ('outgoing', 'exception')).write({'state': 'cancel'})
+        return True
+
+    # ===== DISPATCHING =====
+
+    @api.model
+    def _get_channel_rate(self, channel):
+        """Items per minute allowed on ``channel``, configurable through a system parameter."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            f'grants_training_suite_v2.notification_rate_{channel}', CHANNEL_RATES[channel]))
+
+    @api.model
+    def _cron_dispatch(self, batch_size=None):
+        """Drain the outbox, one rate-limited batch per channel.
+
+        Called by the cron, which re-triggers itself while due items remain,
+        at the next minute when a channel is over its rate.
+        """
+        batch_size = batch_size or int(self.env['ir.config_parameter'].sudo().get_param(
+            'grants_training_suite_v2.notification_dispatch_batch_size', DISPATCH_BATCH_SIZE))
+        stats = self.env['gr.notification.channel.stats']
+        retrigger_at = None
+        dispatched = 0
+
+        for channel in CHANNEL_RATES:
+            now = fields.Datetime.now()
+            recent = self.search_count([
+                ('channel', '=', channel),
+                ('state', '=', 'sent'),
+                ('sent_date', '>', now - timedelta(minutes=1)),
+            ])
+            limit = min(batch_size, self._get_channel_rate(channel) - recent)
+            due_domain = [('channel', '=', channel), ('state', '=', 'pending'), ('next_attempt_date', '<=', now)]
+            if limit <= 0:
+                # Over the rate: wait for the next minute
+                if self.search_count(due_domain, limit=1):
+                    at = now + timedelta(minutes=1)
+                    retrigger_at = min(retrigger_at, at) if retrigger_at else at
+                continue
+
+            items = self.search(due_domain, order='id', limit=limit + 1)
+            batch, remaining = items[:limit], items[limit:]
+            if not batch:
+                continue
+
+            start = time.time()
+            errors = getattr(batch, f'_dispatch_{channel}')()
+            duration = time.time() - start
+            batch._record_results(errors)
+            stats._record_batch(channel, batch, errors, duration)
+            dispatched += len(batch)
+
+            if remaining:
+                at = now if limit == batch_size else now + timedelta(minutes=1)
+                retrigger_at = min(retrigger_at, at) if retrigger_at else at
+
+        if retrigger_at:
+            self._trigger_dispatch(retrigger_at)
+        return dispatched
+
+    def _dispatch_email(self):
+        """Send the emails of the batch; ``mail.mail`` reuses one SMTP connection per mail server.
+
+        Returns ``{item_id: error}`` for the items that failed.
+        """
+        errors = {}
+        missing = self.filtered(lambda item: not item.mail_id)
+        for item in missing:
+            errors[item.id] = 'The email was deleted before being sent.'
+
+        mails = (self - missing).mail_id
+        mails.filtered(lambda mail: mail.state == 'exception').write({'state': 'outgoing'})
+        mails.write({'scheduled_date': False})
+        mails.send(raise_exception=False)
+
+        for item in self - missing:
+            mail = item.mail_id.exists()
+            if mail and mail.state != 'sent':
+                errors[item.id] = mail.failure_reason or _('Email left in state %s') % mail.state
+        return errors
+
+    def _dispatch_activity(self):
+        """Create the activities of the batch at once, one by one when the batch fails."""
+        activities = self.env['mail.activity'].sudo()
+        try:
+            with self.env.cr.savepoint():
+                activities.create([item.payload for item in self])
+            return {}
+        except Exception as e:
+            _logger.warning('Activity batch failed, creating activities one by one: %s', str(e))
+
+        errors = {}
+        for item in self:
+            try:
+                with self.env.cr.savepoint():
+                    activities.create(item.payload)
+            except Exception as e:
+                errors[item.id] = str(e)
+        return errors
+
+    def _dispatch_sms(self):
+        """Deliver the SMS of the batch."""
+        # SMS functionality would require additional SMS gateway integration
+        # For now, just log the SMS notification
+        for item in self:
+            _logger.info('SMS notification would be sent to: %s - %s',
+                         item.payload.get('phone'), item.payload.get('message'))
+        return {}
+
+    def _record_results(self, errors):
+        """Mark delivered items as sent and schedule the retries of the failed ones."""
+        now = fields.Datetime.now()
+        delivered = self.filtered(lambda item: item.id not in errors)
+        delivered.write({'state': 'sent', 'sent_date': now, 'last_error': False})
+        delivered.filtered(lambda item: item.channel == 'email').notification_id.write({'email_sent': True})
+
+        for item in self - delivered:
+            attempts = item.attempt_count + 1
+            vals = {'attempt_count': attempts, 'last_error': errors[item.id]}
+            if attempts >= MAX_ATTEMPTS or (item.channel == 'email' and not item.mail_id):
+                vals['state'] = 'failed'
+            else:
+                delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+                vals['next_attempt_date'] = now + timedelta(seconds=delay)
+            item.write(vals)
+            _logger.warning('Outbox item %s (%s) failed, attempt %d: %s',
+                            item.id, item.channel, attempts, errors[item.id])
+
+        # Wake the dispatcher up for the earliest retry
+        retries = (self - delivered).filtered(lambda item: item.state == 'pending')
+        if retries:
+            self._trigger_dispatch(min(retries.mapped('next_attempt_date')))
+
+
+class NotificationChannelStats(models.Model):
+    _name = 'gr.notification.channel.stats'
+    _description = 'Notification Channel Throughput and Latency'
+    _order = 'channel'
+
+    channel = fields.Selection([
+        ('email', 'Email'),
+        ('activity', 'Activity'),
+        ('sms', 'SMS'),
+    ], string='Channel', required=True)
+
+    sent_count = fields.Integer(string='Sent', readonly=True)
+    failed_count = fields.Integer(string='Failed Attempts', readonly=True)
+    batch_count = fields.Integer(string='Batches', readonly=True)
+    total_latency = fields.Float(string='Total Latency (s)', readonly=True)
+
+    avg_latency = fields.Float(
+        string='Average Latency (s)',
+        compute='_compute_avg_latency',
+        help='Average delay between queuing and delivery'
+    )
+
+    last_dispatch_date = fields.Datetime(string='Last Dispatch', readonly=True)
+    last_batch_size = fields.Integer(string='Last Batch Size', readonly=True)
+    last_batch_duration = fields.Float(string='Last Batch Duration (s)', readonly=True)
+    last_throughput = fields.Float(
+        string='Last Throughput (items/s)',
+        readonly=True,
+        help='Items dispatched per second by the last batch'
+    )
+
+    _sql_constraints = [
+        ('channel_unique', 'UNIQUE(channel)', 'There is only one statistics record per channel.'),
+    ]
+
+    @api.depends('sent_count', 'total_latency')
+    def _compute_avg_latency(self):
+        """Compute the average delivery latency."""
+        for stats in self:
+            stats.avg_latency = stats.total_latency / stats.sent_count if stats.sent_count else 0.0
+
+    @api.model
+    def _record_batch(self, channel, items, errors, duration):
+        """Add a dispatched batch to the counters of its channel."""
+        stats = self.search([('channel', '=', channel)], limit=1) or self.create({'channel': channel})
+        delivered = items.filtered(lambda item: item.id not in errors)
+        stats.write({
+            'sent_count': stats.sent_count + len(delivered),
+            'failed_count': stats.failed_count + len(errors),
+            'batch_count': stats.batch_count + 1,
+            'total_latency': stats.total_latency + sum(delivered.mapped('latency')),
+            'last_dispatch_date': fields.Datetime.now(),
+            'last_batch_size': len(items),
+            'last_batch_duration': duration,
+            'last_throughput': len(items) / duration if duration else 0.0,
+        })
+        return stats
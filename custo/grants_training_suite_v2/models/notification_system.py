@@ -7,6 +7,21 @@ from datetime import datetime, timedelta
 
 _logger = logging.getLogger(__name__)
 
+# Progress milestones, in increasing threshold order
+MILESTONE_THRESHOLDS = (
+    {'threshold': 25, 'type': '25_percent', 'message': 'Congratulations! You\'ve reached 25% completion.'},
+    {'threshold': 50, 'type': '50_percent', 'message': 'Great progress! You\'re halfway through the course.'},
+    {'threshold': 75, 'type': '75_percent', 'message': 'Excellent work! You\'ve completed 75% of the course.'},
+    {'threshold': 90, 'type': '90_percent', 'message': 'Almost there! You\'re at 90% completion.'},
+    {'threshold': 100, 'type': '100_percent', 'message': 'Congratulations! You\'ve completed the course!'},
+)
+
+# Queued notifications sent per run of the sending cron
+SEND_BATCH_SIZE = 200
+
+# Sending attempts before a queued notification is marked failed
+MAX_SEND_ATTEMPTS = 5
+
 
 class ProgressNotification(models.Model):
     _name = 'gr.progress.notification'
@@ -67,7 +82,8 @@ class ProgressNotification(models.Model):
         ('draft', 'Draft'),
         ('sent', 'Sent'),
         ('read', 'Read'),
-        ('archived', 'Archived')
+        ('archived', 'Archived'),
+        ('failed', 'Failed')
     ], string='Status', default='draft')
 
     sent_date = fields.Datetime(
@@ -129,21 +145,44 @@ class ProgressNotification(models.Model):
         help='Condition that triggered this notification'
     )
 
+    send_queued = fields.Boolean(
+        string='Queued for Sending',
+        default=False,
+        index=True,
+        copy=False,
+        help='Draft notification waiting for the sending cron'
+    )
+
+    send_attempts = fields.Integer(
+        string='Sending Attempts',
+        default=0,
+        copy=False,
+        help='Failed attempts of the sending cron; the notification is marked failed after too many'
+    )
+
     def action_send_notification(self):
-        """Send the notification through configured channels."""
+        """Send the notification through configured channels.
+
+        With a digest window configured, notifications other than urgent ones
+        are collected into the next digest of each recipient instead.
+        """
+        digest_mode = bool(self.env['gr.notification.digest.entry']._get_digest_window())
         for notification in self:
             try:
-                # Send in-app notification
-                if notification.in_app_notification:
-                    notification._send_in_app_notification()
-                
-                # Send email notification
-                if notification.email_sent or notification.recipient_email:
-                    notification._send_email_notification()
-                
-                # Send SMS notification
-                if notification.sms_sent or notification.recipient_phone:
-                    notification._send_sms_notification()
+                if digest_mode and notification.priority != 'urgent':
+                    notification._add_to_digest()
+                else:
+                    # Send in-app notification
+                    if notification.in_app_notification:
+                        notification._send_in_app_notification()
+                    
+                    # Send email notification
+                    if notification.email_sent or notification.recipient_email:
+                        notification._send_email_notification()
+                    
+                    # Send SMS notification
+                    if notification.sms_sent or notification.recipient_phone:
+                        notification._send_sms_notification()
                 
                 notification.status = 'sent'
                 notification.sent_date = fields.Datetime.now()
@@ -155,20 +194,20 @@ class ProgressNotification(models.Model):
                 raise UserError(_('Failed to send notification: %s') % str(e))
 
     def _send_in_app_notification(self):
-        """Send in-app notification."""
-        # Create mail.activity for in-app notification
-        self.env['mail.activity'].create({
+        """Queue the in-app notification in the outbox."""
+        # Create mail.activity for in-app notification, from the outbox
+        self.env['gr.notification.outbox']._enqueue_activities([{
             'activity_type_id': self._get_activity_type_id(),
             'res_id': self.id,
             'res_model': 'gr.progress.notification',
             'user_id': self.recipient_user_id.id or self.student_id.assigned_agent_id.user_id.id or 1,
             'summary': self.name,
             'note': self.message,
-            'date_deadline': fields.Date.today(),
-        })
+            'date_deadline': fields.Date.to_string(fields.Date.today()),
+        }], notification=self)
 
     def _send_email_notification(self):
-        """Send email notification."""
+        """Render the email notification and queue it in the outbox."""
         if not self.recipient_email:
             return
         
@@ -176,21 +215,39 @@ class ProgressNotification(models.Model):
         mail_template = self.env.ref('grants_training_suite_v2.email_template_progress_notification', False)
         
         if mail_template:
-            mail_template.send_mail(self.id, force_send=True)
+            mail = self.env['mail.mail'].browse(mail_template.send_mail(self.id))
         else:
             # Fallback: create simple email
-            self.env['mail.mail'].create({
+            mail = self.env['mail.mail'].create({
                 'subject': self.name,
                 'body_html': f'<p>{self.message}</p>',
                 'email_to': self.recipient_email,
                 'auto_delete': True,
-            }).send()
+            })
+        self.env['gr.notification.outbox']._enqueue_mails(mail, notification=self)
 
     def _send_sms_notification(self):
-        """Send SMS notification."""
-        # SMS functionality would require additional SMS gateway integration
-        # For now, just log the SMS notification
-        _logger.info('SMS notification would be sent to: %s - %s', self.recipient_phone, self.message)
+        """Queue the SMS notification in the outbox."""
+        self.env['gr.notification.outbox']._enqueue_sms(self.recipient_phone, self.message, notification=self)
+
+    def _add_to_digest(self):
+        """Collect the notification into the digests of its recipients, one per channel."""
+        common = {
+            'subject': self.name,
+            'message': self.message,
+            'res_model': 'gr.progress.notification',
+            'res_id': self.id,
+            'notification_id': self.id,
+        }
+        vals_list = []
+        if self.in_app_notification:
+            vals_list.append(dict(common, channel='activity', recipient_user_id=(
+                self.recipient_user_id.id or self.student_id.assigned_agent_id.user_id.id or 1)))
+        if self.recipient_email:
+            vals_list.append(dict(common, channel='email', recipient_email=self.recipient_email))
+        if self.recipient_phone:
+            vals_list.append(dict(common, channel='sms', recipient_phone=self.recipient_phone))
+        self.env['gr.notification.digest.entry']._add_entries(vals_list)
 
     def _get_activity_type_id(self):
         """Get appropriate activity type based on notification type."""
@@ -224,74 +281,112 @@ class ProgressNotification(models.Model):
             ('write_date', '>=', (datetime.now() - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S'))
         ])
         
-        created_count = 0
+        notifications = self._create_milestone_notifications_bulk(recent_trackers)
         
-        for tracker in recent_trackers:
-            # Check for milestone achievements
-            milestone = self._check_milestone_achievement(tracker)
+        _logger.info('Created %d milestone notifications', len(notifications))
+        return len(notifications)
+
+    @api.model
+    def _create_milestone_notifications_bulk(self, trackers):
+        """Create the milestone notifications of ``trackers`` at once and queue them for sending."""
+        if not trackers:
+            return self.browse()
+        
+        # Milestones already notified, pending notifications included, in one query;
+        # failed notifications are created again
+        notified = {}
+        for tracker, milestone_type in self._read_group([
+            ('progress_tracker_id', 'in', trackers.ids),
+            ('milestone_type', 'in', [milestone['type'] for milestone in MILESTONE_THRESHOLDS]),
+            ('status', '!=', 'failed'),
+        ], ['progress_tracker_id', 'milestone_type'], []):
+            notified.setdefault(tracker.id, set()).add(milestone_type)
+        
+        vals_list = []
+        for tracker in trackers:
+            milestone = self._check_milestone_achievement(tracker, notified.get(tracker.id, ()))
             if milestone:
-                notification = self._create_milestone_notification(tracker, milestone)
-                if notification:
-                    created_count += 1
+                vals_list.append(self._prepare_milestone_notification_vals(tracker, milestone))
         
-        _logger.info('Created %d milestone notifications', created_count)
-        return created_count
+        notifications = self.create(vals_list)
+        notifications._queue_sending()
+        return notifications
 
-    def _check_milestone_achievement(self, tracker):
-        """Check if tracker has achieved any new milestones."""
+    def _check_milestone_achievement(self, tracker, notified_types):
+        """Return the first milestone reached by ``tracker`` that is not in ``notified_types``."""
         progress = tracker.overall_progress
+        for milestone in MILESTONE_THRESHOLDS:
+            if progress >= milestone['threshold'] and milestone['type'] not in notified_types:
+                return milestone
+        return None
+
+    def _prepare_milestone_notification_vals(self, tracker, milestone):
+        """Values of the milestone notification of the tracker."""
+        return {
+            'name': f'Progress Milestone - {tracker.student_id.name}',
+            'student_id': tracker.student_id.id,
+            'progress_tracker_id': tracker.id,
+            'notification_type': 'milestone',
+            'milestone_type': milestone['type'],
+            'message': milestone['message'],
+            'progress_value': tracker.overall_progress,
+            'recipient_user_id': tracker.student_id.assigned_agent_id.user_id.id if tracker.student_id.assigned_agent_id else None,
+            'recipient_email': tracker.student_id.email,
+            'priority': 'normal',
+            'auto_generated': True,
+            'trigger_condition': f'Progress reached {milestone["threshold"]}%',
+            'status': 'draft'
+        }
+
+    # ===== DEFERRED SENDING =====
+
+    def _queue_sending(self):
+        """Hand the notifications to the sending cron instead of sending them in this transaction."""
+        if not self:
+            return
+        self.write({'send_queued': True})
+        self._trigger_sending()
+
+    @api.model
+    def _trigger_sending(self):
+        """Wake up the sending cron instead of waiting for its next run."""
+        cron = self.env.ref('grants_training_suite_v2.ir_cron_send_queued_notifications', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _cron_send_queued_notifications(self, batch_size=None):
+        """Send the queued draft notifications, one batch per run.
+
+        A notification that fails to send is rolled back on its own and stays
+        queued for the next runs, after the notifications never tried; it is
+        marked failed after ``MAX_SEND_ATTEMPTS`` attempts.
+        """
+        batch_size = batch_size or int(self.env['ir.config_parameter'].sudo().get_param(
+            'grants_training_suite_v2.notification_send_batch_size', SEND_BATCH_SIZE))
+        queued = self.search(
+            [('send_queued', '=', True), ('status', '=', 'draft')], order='send_attempts, id', limit=batch_size + 1)
         
-        # Define milestone thresholds
-        milestones = [
-            {'threshold': 25, 'type': '25_percent', 'message': 'Congratulations! You\'ve reached 25% completion.'},
-            {'threshold': 50, 'type': '50_percent', 'message': 'Great progress! You\'re halfway through the course.'},
-            {'threshold': 75, 'type': '75_percent', 'message': 'Excellent work! You\'ve completed 75% of the course.'},
-            {'threshold': 90, 'type': '90_percent', 'message': 'Almost there! You\'re at 90% completion.'},
-            {'threshold': 100, 'type': '100_percent', 'message': 'Congratulations! You\'ve completed the course!'},
-        ]
+        sent = 0
+        for notification in queued[:batch_size]:
+            try:
+                with self.env.cr.savepoint():
+                    notification.action_send_notification()
+                    notification.send_queued = False
+                sent += 1
+            except Exception as e:
+                _logger.error('Failed to send queued notification %s: %s', notification.name, str(e))
+                attempts = notification.send_attempts + 1
+                if attempts >= MAX_SEND_ATTEMPTS:
+                    notification.write({'send_attempts': attempts, 'send_queued': False, 'status': 'failed'})
+                else:
+                    notification.send_attempts = attempts
         
-        # Check if any milestone was just achieved
-        for milestone in milestones:
-            if progress >= milestone['threshold']:
-                # Check if we already sent this milestone notification
-                existing_notification = self.search([
-                    ('progress_tracker_id', '=', tracker.id),
-                    ('milestone_type', '=', milestone['type']),
-                    ('status', 'in', ['sent', 'read'])
-                ])
-                
-                if not existing_notification:
-                    return milestone
+        if sent and len(queued) > batch_size:
+            self._trigger_sending()
         
-        return None
-
-    def _create_milestone_notification(self, tracker, milestone):
-        """Create a milestone notification for the tracker."""
-        try:
-            notification = self.create({
-                'name': f'Progress Milestone - {tracker.student_id.name}',
-                'student_id': tracker.student_id.id,
-                'progress_tracker_id': tracker.id,
-                'notification_type': 'milestone',
-                'milestone_type': milestone['type'],
-                'message': milestone['message'],
-                'progress_value': tracker.overall_progress,
-                'recipient_user_id': tracker.student_id.assigned_agent_id.user_id.id if tracker.student_id.assigned_agent_id else None,
-                'recipient_email': tracker.student_id.email,
-                'priority': 'normal',
-                'auto_generated': True,
-                'trigger_condition': f'Progress reached {milestone["threshold"]}%',
-                'status': 'draft'
-            })
-            
-            # Auto-send the notification
-            notification.action_send_notification()
-            
-            return notification
-            
-        except Exception as e:
-            _logger.error('Failed to create milestone notification: %s', str(e))
-            return None
+        _logger.info('Sent %d queued notifications', sent)
+        return sent
 
     @api.model
     def create_stalled_progress_alerts(self):
@@ -2,10 +2,32 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
 
 _logger = logging.getLogger(__name__)
 
+# Weights of the eLearning and custom training scores in the overall progress
+ELEARNING_WEIGHT = 0.7
+CUSTOM_WEIGHT = 0.3
+
+# Precommit data key holding the enrollments whose completion changed
+PENDING_ENROLLMENTS_KEY = 'gr.progress.tracker.pending_enrollments'
+
+# System parameter holding the start of the last reconciliation pass
+SYNC_WATERMARK_KEY = 'grants_training_suite_v2.elearning_sync_last_run'
+
+# Overlap of two reconciliation passes, covering transactions still open at the last run
+SYNC_OVERLAP_MINUTES = 10
+
+# Fields aggregated into the training dashboard facts (directly or through overall_progress)
+TRACKER_FACT_FIELDS = (
+    'course_integration_id', 'status', 'elearning_progress', 'custom_sessions_completed', 'homework_submissions',
+)
+
 
 class ProgressTracker(models.Model):
     _name = 'gr.progress.tracker'
@@ -36,6 +58,7 @@ class ProgressTracker(models.Model):
     elearning_enrollment_id = fields.Many2one(
         'slide.channel.partner',
         string='eLearning Enrollment',
+        index='btree_not_null',
         help='The eLearning enrollment record'
     )
     
@@ -92,23 +115,47 @@ class ProgressTracker(models.Model):
         help='Number of days taken to complete the course'
     )
     
+    def init(self):
+        """Index the write dates scanned by the reconciliation pass and the creation dates of the daily facts."""
+        create_index(self.env.cr, 'gr_progress_tracker_write_date_index', 'gr_progress_tracker', ['write_date'])
+        create_index(self.env.cr, 'gr_progress_tracker_create_date_index', 'gr_progress_tracker', ['create_date'])
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Queue the dashboard facts of the new trackers' creation day for a rebuild."""
+        trackers = super(ProgressTracker, self).create(vals_list)
+        self.env['gr.training.analytics.fact']._mark_dirty('tracker', trackers)
+        self.env['gr.training.dashboard.change']._log_changes('tracker', trackers)
+        return trackers
+    
+    def write(self, vals):
+        """Queue the dashboard facts for a rebuild when aggregated fields change."""
+        result = super(ProgressTracker, self).write(vals)
+        if any(field in vals for field in TRACKER_FACT_FIELDS):
+            self.env['gr.training.analytics.fact']._mark_dirty('tracker', self)
+            self.env['gr.training.dashboard.change']._log_changes('tracker', self)
+        return result
+    
+    def unlink(self):
+        """Rebuild the dashboard facts of the deleted trackers' creation days."""
+        self.env['gr.training.analytics.fact']._mark_dirty('tracker', self)
+        self.env['gr.training.dashboard.change']._log_changes('tracker', self)
+        return super(ProgressTracker, self).unlink()
+    
     @api.depends('elearning_progress', 'custom_sessions_completed', 'homework_submissions')
     def _compute_overall_progress(self):
         """Compute overall progress percentage."""
         for record in self:
-            # Weighted calculation: 70% eLearning, 30% custom training
-            elearning_weight = 0.7
-            custom_weight = 0.3
-            
-            # eLearning progress (0-100%)
-            elearning_score = record.elearning_progress
-            
-            # Custom training score (based on sessions and homework)
-            # This is a simplified calculation - can be enhanced
-            custom_score = min(100.0, (record.custom_sessions_completed * 10) + (record.homework_submissions * 5))
-            
-            # Calculate overall progress
-            record.overall_progress = (elearning_score * elearning_weight) + (custom_score * custom_weight)
+            record.overall_progress = self._get_overall_progress(
+                record.elearning_progress, record.custom_sessions_completed, record.homework_submissions)
+    
+    @api.model
+    def _get_overall_progress(self, elearning_progress, sessions_completed, homework_submissions):
+        """Weighted overall progress: 70% eLearning, 30% custom training."""
+        # Custom training score (based on sessions and homework)
+        # This is a simplified calculation - can be enhanced
+        custom_score = min(100.0, (sessions_completed * 10) + (homework_submissions * 5))
+        return (elearning_progress * ELEARNING_WEIGHT) + (custom_score * CUSTOM_WEIGHT)
     
     @api.depends('start_date', 'completion_date')
     def _compute_days_to_complete(self):
@@ -195,38 +242,149 @@ class ProgressTracker(models.Model):
     
     @api.model
     def sync_all_elearning_progress(self):
-        """Batch synchronization of all eLearning progress."""
+        """Reconciliation pass behind the push from the enrollments.
+
+        Completion changes reach the trackers when the enrollment is written
+        (see ``_queue_enrollment_sync``); this pass only re-checks the
+        enrollments and trackers changed since the previous run, or all of
+        them on the first run.
+        """
         _logger.info('Starting batch eLearning progress synchronization...')
+        params = self.env['ir.config_parameter'].sudo()
+        last_run = params.get_param(SYNC_WATERMARK_KEY)
+        run_start = fields.Datetime.now()
         
-        # Get all active progress trackers with eLearning enrollments
-        trackers = self.search([
-            ('elearning_enrollment_id', '!=', False),
-            ('status', 'in', ['not_started', 'in_progress'])
-        ])
+        if last_run:
+            since = fields.Datetime.to_datetime(last_run) - timedelta(minutes=SYNC_OVERLAP_MINUTES)
+            result = self._sync_elearning_progress('(e.write_date >= %s OR t.write_date >= %s)', (since, since))
+        else:
+            result = self._sync_elearning_progress()
         
-        sync_count = 0
-        error_count = 0
+        params.set_param(SYNC_WATERMARK_KEY, fields.Datetime.to_string(run_start))
+        return result
+    
+    # ===== PUSH FROM THE ENROLLMENTS =====
+    
+    @api.model
+    def _queue_enrollment_sync(self, enrollments):
+        """Sync the trackers of ``enrollments`` once, before commit."""
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(PENDING_ENROLLMENTS_KEY)
+        if pending is None:
+            pending = precommit.data[PENDING_ENROLLMENTS_KEY] = set()
+            precommit.add(self.sudo()._sync_pending_enrollments)
+        pending.update(enrollments.ids)
+    
+    @api.model
+    def _sync_pending_enrollments(self):
+        """Sync the trackers of the enrollments queued by ``_queue_enrollment_sync``."""
+        enrollment_ids = self.env.cr.precommit.data.pop(PENDING_ENROLLMENTS_KEY, None)
+        if not enrollment_ids:
+            return None
+        try:
+            with self.env.cr.savepoint():
+                return self._sync_elearning_progress('e.id IN %s', (tuple(enrollment_ids),))
+        except Exception as e:
+            # The reconciliation pass catches up; never block the enrollment update
+            _logger.error('Failed to push eLearning progress of enrollments %s: %s', sorted(enrollment_ids), str(e))
+            return None
+    
+    @api.model
+    def _sync_elearning_progress(self, where='TRUE', params=()):
+        """Sync the active trackers matching ``where`` (on ``t`` the tracker, ``e`` the enrollment).
+
+        The enrollment completions are read in one query and compared with the
+        stored progress in memory. Only changed trackers are written, grouped
+        by new value, and the start/complete transitions are applied with one
+        write per transition.
+        """
+        start = time.time()
         
-        for tracker in trackers:
-            try:
-                old_progress = tracker.elearning_progress
-                tracker.action_sync_with_elearning()
-                
-                if old_progress != tracker.elearning_progress:
-                    sync_count += 1
-                    
-            except Exception as e:
-                error_count += 1
-                _logger.error('Failed to sync progress for tracker %s: %s', tracker.id, str(e))
+        self.flush_model()
+        self.env['slide.channel.partner'].flush_model(['completion'])
+        self.env['gr.course.integration'].flush_model(['completion_threshold'])
+        self.env.cr.execute(f"""
+            SELECT t.id, t.elearning_progress, t.status, t.custom_sessions_completed, t.homework_submissions,
+                   c.completion_threshold, COALESCE(e.completion, 0)
+              FROM gr_progress_tracker t
+              JOIN slide_channel_partner e ON e.id = t.elearning_enrollment_id
+              JOIN gr_course_integration c ON c.id = t.course_integration_id
+             WHERE t.status IN ('not_started', 'in_progress')
+               AND {where}
+        """, params)
+        rows = self.env.cr.fetchall()
+        
+        by_progress = defaultdict(list)
+        transitions = defaultdict(list)
+        failed_ids = set()
+        for tracker_id, old_progress, status, sessions, homework, threshold, progress in rows:
+            if not 0 <= progress <= 100:
+                failed_ids.add(tracker_id)
+                _logger.error('Failed to sync progress for tracker %s: invalid progress %s', tracker_id, progress)
                 continue
+            if progress != old_progress:
+                by_progress[progress].append(tracker_id)
+            
+            # Auto-start if not started and progress > 0, auto-complete if threshold met
+            started = status == 'not_started' and progress > 0
+            overall = self._get_overall_progress(progress, sessions, homework)
+            completed = (status == 'in_progress' or started) and overall >= (threshold or 0.0)
+            if started or completed:
+                transitions[(started, completed)].append(tracker_id)
+        
+        changed_ids = set()
+        for progress, tracker_ids in by_progress.items():
+            self._sync_write(tracker_ids, {'elearning_progress': progress}, changed_ids, failed_ids)
+        
+        now = fields.Datetime.now()
+        for (started, completed), tracker_ids in transitions.items():
+            vals = {'status': 'completed' if completed else 'in_progress'}
+            if started:
+                vals['start_date'] = now
+            if completed:
+                vals['completion_date'] = now
+            tracker_ids = [tracker_id for tracker_id in tracker_ids if tracker_id not in failed_ids]
+            self._sync_write(tracker_ids, vals, changed_ids, failed_ids)
         
-        _logger.info('Batch synchronization completed: %d updated, %d errors', sync_count, error_count)
+        changed_ids -= failed_ids
+        unchanged_count = len(rows) - len(changed_ids) - len(failed_ids)
+        duration = time.time() - start
+        _logger.info('Batch synchronization completed in %.2fs: %d changed, %d unchanged, %d errors',
+                     duration, len(changed_ids), unchanged_count, len(failed_ids))
         return {
-            'sync_count': sync_count,
-            'error_count': error_count,
-            'total_processed': len(trackers)
+            'sync_count': len(changed_ids),
+            'unchanged_count': unchanged_count,
+            'error_count': len(failed_ids),
+            'total_processed': len(rows),
+            'duration': duration,
         }
     
+    @api.model
+    def _sync_write(self, tracker_ids, vals, changed_ids, failed_ids):
+        """Apply ``vals`` to the trackers at once, then one by one if the grouped write fails.
+
+        The trackers are added to ``changed_ids`` or, when their write fails, to ``failed_ids``.
+        """
+        trackers = self.browse(tracker_ids)
+        if not trackers:
+            return
+        try:
+            with self.env.cr.savepoint():
+                trackers.write(vals)
+            changed_ids.update(tracker_ids)
+            return
+        except Exception as e:
+            _logger.warning('Grouped progress sync failed, writing trackers one by one: %s', str(e))
+        
+        for tracker in trackers:
+            try:
+                with self.env.cr.savepoint():
+                    tracker.write(vals)
+                changed_ids.add(tracker.id)
+            except Exception as e:
+                failed_ids.add(tracker.id)
+                _logger.error('Failed to sync progress for tracker %s: %s', tracker.id, str(e))
+    
     @api.model
     def monitor_progress_and_alerts(self):
         """Monitor progress and send alerts for stalled students."""
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+from odoo.tools.sql import create_index
+
+
+class SlideChannelPartner(models.Model):
+    _inherit = 'slide.channel.partner'
+
+    def init(self):
+        """Index the write dates scanned by the progress reconciliation pass."""
+        create_index(self.env.cr, 'slide_channel_partner_write_date_index', 'slide_channel_partner', ['write_date'])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Push the initial completion of the new enrollments to their progress trackers."""
+        enrollments = super(SlideChannelPartner, self).create(vals_list)
+        if any('completion' in vals for vals in vals_list):
+            self.env['gr.progress.tracker']._queue_enrollment_sync(enrollments)
+        return enrollments
+
+    def write(self, vals):
+        """Push completion changes to the progress trackers, coalesced until commit."""
+        result = super(SlideChannelPartner, self).write(vals)
+        if 'completion' in vals:
+            self.env['gr.progress.tracker']._queue_enrollment_sync(self)
+        return result
@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import re
 from datetime import datetime, date
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.sql import create_index
 
 _logger = logging.getLogger(__name__)
 
+# Fields aggregated into the training dashboard facts
+STUDENT_FACT_FIELDS = ('integration_status', 'intake_date')
+
+# Fields shown by the training dashboard, changes are logged for its incremental refresh
+STUDENT_DASHBOARD_FIELDS = STUDENT_FACT_FIELDS + ('name',)
+
 class Student(models.Model):
     _name = 'gr.student'
     _description = 'Grants Training Student'
@@ -48,6 +56,37 @@ class Student(models.Model):
         help='Student phone number'
     )
     
+    national_id = fields.Char(
+        string='National ID',
+        tracking=True,
+        help='National identity or iqama number'
+    )
+    
+    # Duplicate detection keys (normalised copies used by intake imports)
+    email_normalized = fields.Char(
+        string='Normalized Email',
+        compute='_compute_dedup_keys',
+        store=True,
+        index=True,
+        help='Lower-cased, trimmed email used for duplicate detection'
+    )
+    
+    phone_normalized = fields.Char(
+        string='Normalized Phone',
+        compute='_compute_dedup_keys',
+        store=True,
+        index=True,
+        help='Phone digits used for duplicate detection'
+    )
+    
+    national_id_normalized = fields.Char(
+        string='Normalized National ID',
+        compute='_compute_dedup_keys',
+        store=True,
+        index=True,
+        help='National ID without spaces or separators used for duplicate detection'
+    )
+    
     # Personal Information
     birth_date = fields.Date(
         string='Birth Date',
@@ -265,6 +304,78 @@ class Student(models.Model):
         help='Reason for eligibility or rejection'
     )
     
+    def init(self):
+        """Index the creation dates the daily dashboard facts are refreshed by."""
+        create_index(self.env.cr, 'gr_student_create_date_index', 'gr_student', ['create_date'])
+    
+    @api.depends('email', 'phone', 'national_id')
+    def _compute_dedup_keys(self):
+        """Compute the normalised duplicate detection keys."""
+        for record in self:
+            record.email_normalized = self._normalize_email(record.email)
+            record.phone_normalized = self._normalize_phone(record.phone)
+            record.national_id_normalized = self._normalize_national_id(record.national_id)
+    
+    @api.model
+    def _normalize_email(self, email):
+        """Return the duplicate detection key of an email address."""
+        email = (email or '').strip().lower()
+        return email or False
+    
+    @api.model
+    def _normalize_phone(self, phone):
+        """Return the duplicate detection key of a phone number (digits only, no leading zeros)."""
+        digits = re.sub(r'\D', '', phone or '').lstrip('0')
+        return digits or False
+    
+    @api.model
+    def _normalize_national_id(self, national_id):
+        """Return the duplicate detection key of a national ID."""
+        key = re.sub(r'[\s\-./]', '', national_id or '').upper()
+        return key or False
+    
+    @api.model
+    def _find_existing_students(self, emails=(), phones=(), national_ids=()):
+        """Look up existing students by their normalised keys in a single query.
+        
+        The given values are normalised before matching. When several students
+        share a key, the oldest one wins.
+        
+        :return: dict with keys ``email``, ``phone`` and ``national_id``, each
+                 mapping a normalised key to a student id
+        """
+        keys = {
+            'email': {key for key in map(self._normalize_email, emails) if key},
+            'phone': {key for key in map(self._normalize_phone, phones) if key},
+            'national_id': {key for key in map(self._normalize_national_id, national_ids) if key},
+        }
+        matches = {'email': {}, 'phone': {}, 'national_id': {}}
+        
+        domains = []
+        if keys['email']:
+            domains.append([('email_normalized', 'in', list(keys['email']))])
+        if keys['phone']:
+            domains.append([('phone_normalized', 'in', list(keys['phone']))])
+        if keys['national_id']:
+            domains.append([('national_id_normalized', 'in', list(keys['national_id']))])
+        if not domains:
+            return matches
+        
+        domain = domains[0]
+        for extra_domain in domains[1:]:
+            domain = ['|'] + domain + extra_domain
+        
+        students = self.with_context(active_test=False).search_read(
+            domain, ['email_normalized', 'phone_normalized', 'national_id_normalized'], order='id')
+        for student in students:
+            for key_type, field_name in (('email', 'email_normalized'),
+                                         ('phone', 'phone_normalized'),
+                                         ('national_id', 'national_id_normalized')):
+                value = student[field_name]
+                if value and value in keys[key_type]:
+                    matches[key_type].setdefault(value, student['id'])
+        return matches
+    
     @api.depends('birth_date')
     def _compute_age(self):
         """Compute age from birth date."""
@@ -521,6 +632,8 @@ class Student(models.Model):
             # Log creation
             _logger.info('Student created: %s (%s)', student.name, student.email)
         
+        self.env['gr.training.analytics.fact']._mark_dirty('student', students)
+        self.env['gr.training.dashboard.change']._log_changes('student', students)
         return students
     
     def write(self, vals):
@@ -533,8 +646,20 @@ class Student(models.Model):
             for record in self:
                 record._assess_eligibility()
         
+        # Keep the dashboard facts of the students' creation days up to date
+        if any(field in vals for field in STUDENT_FACT_FIELDS):
+            self.env['gr.training.analytics.fact']._mark_dirty('student', self)
+        if any(field in vals for field in STUDENT_DASHBOARD_FIELDS):
+            self.env['gr.training.dashboard.change']._log_changes('student', self)
+        
         return result
     
+    def unlink(self):
+        """Rebuild the dashboard facts of the deleted students' creation days."""
+        self.env['gr.training.analytics.fact']._mark_dirty('student', self)
+        self.env['gr.training.dashboard.change']._log_changes('student', self)
+        return super(Student, self).unlink()
+    
     def _assess_eligibility(self):
         """Assess student eligibility and update state."""
         self.ensure_one()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Precommit data key holding the creation days whose facts must be rebuilt
+PENDING_DAYS_KEY = 'gr.training.analytics.fact.pending_days'
+
+# Advisory lock taken by the jobs rebuilding facts, so that only one runs at a time
+FACT_REFRESH_LOCK = 47110012
+
+# Source model of each fact type
+FACT_SOURCES = {
+    'student': 'gr.student',
+    'tracker': 'gr.progress.tracker',
+}
+
+# Labels of the progress buckets, in the order of the progress_* columns
+PROGRESS_RANGES = ('0-25%', '25-50%', '50-75%', '75-100%')
+
+FACT_COLUMNS = """fact_type, date, course_integration_id, status, record_count, progress_sum,
+                  progress_0_25, progress_25_50, progress_50_75, progress_75_100,
+                  completion_days_sum, completion_days_count"""
+
+# Aggregates of the source tables per creation day, {where} restricts the days
+FACT_QUERIES = {
+    'student': """
+        SELECT 'student' AS fact_type,
+               s.create_date::date AS date,
+               NULL::integer AS course_integration_id,
+               s.integration_status AS status,
+               COUNT(*) AS record_count,
+               0.0 AS progress_sum,
+               0 AS progress_0_25, 0 AS progress_25_50, 0 AS progress_50_75, 0 AS progress_75_100,
+               COALESCE(SUM(s.create_date::date - s.intake_date::date)
+                        FILTER (WHERE s.integration_status IN ('completed', 'certified')
+                                  AND s.intake_date IS NOT NULL), 0) AS completion_days_sum,
+               COUNT(*) FILTER (WHERE s.integration_status IN ('completed', 'certified')
+                                  AND s.intake_date IS NOT NULL) AS completion_days_count
+          FROM gr_student s
+         WHERE {where}
+      GROUP BY s.create_date::date, s.integration_status
+    """,
+    'tracker': """
+        SELECT 'tracker' AS fact_type,
+               t.create_date::date AS date,
+               t.course_integration_id AS course_integration_id,
+               t.status AS status,
+               COUNT(*) AS record_count,
+               SUM(COALESCE(t.overall_progress, 0)) AS progress_sum,
+               COUNT(*) FILTER (WHERE COALESCE(t.overall_progress, 0) < 25) AS progress_0_25,
+               COUNT(*) FILTER (WHERE t.overall_progress >= 25 AND t.overall_progress < 50) AS progress_25_50,
+               COUNT(*) FILTER (WHERE t.overall_progress >= 50 AND t.overall_progress < 75) AS progress_50_75,
+               COUNT(*) FILTER (WHERE t.overall_progress >= 75) AS progress_75_100,
+               0 AS completion_days_sum,
+               0 AS completion_days_count
+          FROM gr_progress_tracker t
+         WHERE {where}
+      GROUP BY t.create_date::date, t.course_integration_id, t.status
+    """,
+}
+
+# Table alias used by each fact query
+FACT_ALIASES = {
+    'student': 's',
+    'tracker': 't',
+}
+
+
+class TrainingAnalyticsFact(models.Model):
+    _name = 'gr.training.analytics.fact'
+    _description = 'Training Analytics Daily Fact'
+    _order = 'date desc, fact_type, course_integration_id, status'
+    _log_access = False
+
+    fact_type = fields.Selection([
+        ('student', 'Student'),
+        ('tracker', 'Progress Tracker'),
+    ], string='Fact Type', required=True, index=True)
+
+    date = fields.Date(
+        string='Date',
+        required=True,
+        index=True,
+        help='Creation day of the aggregated records'
+    )
+
+    course_integration_id = fields.Many2one(
+        'gr.course.integration',
+        string='Course Integration',
+        index=True,
+        ondelete='cascade'
+    )
+
+    status = fields.Char(
+        string='Status',
+        help='Student integration status or progress tracker status'
+    )
+
+    record_count = fields.Integer(string='Records')
+    progress_sum = fields.Float(string='Progress Sum')
+    progress_0_25 = fields.Integer(string='Progress 0-25%')
+    progress_25_50 = fields.Integer(string='Progress 25-50%')
+    progress_50_75 = fields.Integer(string='Progress 50-75%')
+    progress_75_100 = fields.Integer(string='Progress 75-100%')
+    completion_days_sum = fields.Float(string='Completion Days Sum')
+    completion_days_count = fields.Integer(string='Completions With Intake Date')
+
+    def init(self):
+        """Fill an empty fact table."""
+        self.env.cr.execute('SELECT 1 FROM gr_training_analytics_fact LIMIT 1')
+        if not self.env.cr.fetchone():
+            for fact_type in FACT_SOURCES:
+                self._refresh_days(fact_type)
+
+    # ===== INCREMENTAL MAINTENANCE =====
+
+    @api.model
+    def _mark_dirty(self, fact_type, records):
+        """Mark the creation days of ``records`` dirty; their facts are rebuilt by ``_refresh_pending_days``.
+
+        Writers only append markers before commit, so concurrent transactions
+        touching the same day never update the same fact rows.
+        """
+        days = {record.create_date.date() for record in records if record.create_date}
+        if not days:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(PENDING_DAYS_KEY)
+        if pending is None:
+            pending = precommit.data[PENDING_DAYS_KEY] = {fact_type: set() for fact_type in FACT_SOURCES}
+            precommit.add(self.sudo()._flush_dirty_days)
+        pending[fact_type].update(days)
+
+    @api.model
+    def _flush_dirty_days(self):
+        """Write the dirty days queued by ``_mark_dirty``."""
+        pending = self.env.cr.precommit.data.pop(PENDING_DAYS_KEY, None) or {}
+        self.env['gr.training.analytics.fact.dirty'].sudo().create([
+            {'fact_type': fact_type, 'date': day}
+            for fact_type, days in pending.items() for day in sorted(days)
+        ])
+
+    @api.model
+    def _refresh_pending_days(self):
+        """Rebuild the facts of the days marked dirty, then drop their markers.
+
+        Called by its cron and before the dashboards refresh. Skipped while
+        another job rebuilds facts; markers committed after this transaction
+        started stay for the next run.
+        """
+        self._flush_dirty_days()
+        self.env.cr.execute('SELECT pg_try_advisory_xact_lock(%s)', (FACT_REFRESH_LOCK,))
+        if not self.env.cr.fetchone()[0]:
+            return 0
+        self.env.cr.execute('DELETE FROM gr_training_analytics_fact_dirty RETURNING fact_type, date')
+        pending = {}
+        for fact_type, day in self.env.cr.fetchall():
+            pending.setdefault(fact_type, set()).add(day)
+        self.env['gr.training.analytics.fact.dirty'].invalidate_model()
+        for fact_type, days in pending.items():
+            self._refresh_days(fact_type, days)
+        return sum(len(days) for days in pending.values())
+
+    @api.model
+    def _refresh_days(self, fact_type, days=None):
+        """Rebuild the facts of one type for the given creation days (all days when None)."""
+        self.env[FACT_SOURCES[fact_type]].flush_model()
+        alias = FACT_ALIASES[fact_type]
+        params = {'fact_type': fact_type}
+        if days:
+            days = sorted(days)
+            where = (f'{alias}.create_date >= %(start)s AND {alias}.create_date < %(end)s '
+                     f'AND {alias}.create_date::date = ANY(%(days)s)')
+            params.update(start=days[0], end=days[-1] + timedelta(days=1), days=days)
+            delete_filter = 'AND date = ANY(%(days)s)'
+        else:
+            where = 'TRUE'
+            delete_filter = ''
+
+        self.env.cr.execute(
+            f'DELETE FROM gr_training_analytics_fact WHERE fact_type = %(fact_type)s {delete_filter}', params)
+        self.env.cr.execute(
+            f'INSERT INTO gr_training_analytics_fact ({FACT_COLUMNS}) '
+            + FACT_QUERIES[fact_type].format(where=where), params)
+        self.invalidate_model()
+
+    # ===== RECONCILIATION =====
+
+    @api.model
+    def _count_mismatches(self, fact_type):
+        """Count the facts that differ from a fresh aggregate of the source table."""
+        self.env[FACT_SOURCES[fact_type]].flush_model()
+        self.env.cr.execute("""
+            WITH fresh AS ({query}),
+                 stored AS (SELECT * FROM gr_training_analytics_fact WHERE fact_type = %(fact_type)s)
+            SELECT COUNT(*)
+              FROM fresh
+              FULL OUTER JOIN stored
+                ON stored.date = fresh.date
+               AND stored.course_integration_id IS NOT DISTINCT FROM fresh.course_integration_id
+               AND stored.status IS NOT DISTINCT FROM fresh.status
+             WHERE stored.id IS NULL
+                OR fresh.date IS NULL
+                OR stored.record_count != fresh.record_count
+                OR ABS(stored.progress_sum - fresh.progress_sum) > 0.001
+                OR stored.completion_days_count != fresh.completion_days_count
+                OR ABS(stored.completion_days_sum - fresh.completion_days_sum) > 0.001
+        """.format(query=FACT_QUERIES[fact_type].format(where='TRUE')), {'fact_type': fact_type})
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _cron_reconcile_facts(self):
+        """Nightly job: compare the facts with the source tables and rebuild them from scratch."""
+        self.env.cr.execute('SELECT pg_advisory_xact_lock(%s)', (FACT_REFRESH_LOCK,))
+        mismatches = {}
+        for fact_type in FACT_SOURCES:
+            mismatches[fact_type] = self._count_mismatches(fact_type)
+            self._refresh_days(fact_type)
+        if any(mismatches.values()):
+            _logger.warning('Training analytics facts reconciled, mismatching rows: %s', mismatches)
+        else:
+            _logger.info('Training analytics facts reconciled, no mismatch found')
+        return mismatches
+
+
+class TrainingAnalyticsFactDirty(models.Model):
+    _name = 'gr.training.analytics.fact.dirty'
+    _description = 'Training Analytics Dirty Day'
+    _order = 'id'
+    _log_access = False
+
+    fact_type = fields.Selection([
+        ('student', 'Student'),
+        ('tracker', 'Progress Tracker'),
+    ], string='Fact Type', required=True)
+
+    date = fields.Date(
+        string='Date',
+        required=True,
+        help='Creation day whose facts must be rebuilt'
+    )
@@ -2,11 +2,41 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+import json
 import logging
+import time
 from datetime import datetime, timedelta
 
+from .training_analytics_fact import PROGRESS_RANGES
+
 _logger = logging.getLogger(__name__)
 
+# Student integration statuses counted as enrolled and as completed
+ENROLLED_STATUSES = ('enrolled', 'in_progress', 'completed', 'certified')
+COMPLETED_STATUSES = ('completed', 'certified')
+
+# Analytics stored as JSON, each shown in the form through a read-only text field
+ANALYTICS_JSON_FIELDS = (
+    'progress_distribution', 'monthly_enrollments', 'completion_trends', 'top_performers',
+    'struggling_students', 'engagement_metrics', 'course_performance', 'popular_courses',
+    'integration_status_summary',
+)
+
+# Version of the get_dashboard_data payload layout, part of the cache key and ETag
+PAYLOAD_VERSION = 1
+
+# Compute method of each dashboard section and the change log sources it reads
+DASHBOARD_SECTIONS = {
+    'kpi': ('_compute_kpi_metrics', ('student', 'tracker', 'course')),
+    'progress': ('_compute_progress_analytics', ('student', 'tracker')),
+    'student': ('_compute_student_analytics', ('student', 'tracker')),
+    'course': ('_compute_course_analytics', ('tracker', 'course')),
+    'integration': ('_compute_integration_analytics', ('student',)),
+}
+
+# Sections computed over all records rather than over the dashboard date window
+UNWINDOWED_SECTIONS = ('student',)
+
 
 class TrainingDashboard(models.Model):
     _name = 'gr.training.dashboard'
@@ -78,58 +108,58 @@ class TrainingDashboard(models.Model):
     )
 
     # Progress Analytics
-    progress_distribution = fields.Text(
+    progress_distribution = fields.Json(
         string='Progress Distribution',
         compute='_compute_progress_analytics',
         store=True
     )
 
-    monthly_enrollments = fields.Text(
+    monthly_enrollments = fields.Json(
         string='Monthly Enrollments',
         compute='_compute_progress_analytics',
         store=True
     )
 
-    completion_trends = fields.Text(
+    completion_trends = fields.Json(
         string='Completion Trends',
         compute='_compute_progress_analytics',
         store=True
     )
 
     # Student Performance Analytics
-    top_performers = fields.Text(
+    top_performers = fields.Json(
         string='Top Performers',
         compute='_compute_student_analytics',
         store=True
     )
 
-    struggling_students = fields.Text(
+    struggling_students = fields.Json(
         string='Struggling Students',
         compute='_compute_student_analytics',
         store=True
     )
 
-    engagement_metrics = fields.Text(
+    engagement_metrics = fields.Json(
         string='Engagement Metrics',
         compute='_compute_student_analytics',
         store=True
     )
 
     # Course Analytics
-    course_performance = fields.Text(
+    course_performance = fields.Json(
         string='Course Performance',
         compute='_compute_course_analytics',
         store=True
     )
 
-    popular_courses = fields.Text(
+    popular_courses = fields.Json(
         string='Popular Courses',
         compute='_compute_course_analytics',
         store=True
     )
 
     # Integration Status
-    integration_status_summary = fields.Text(
+    integration_status_summary = fields.Json(
         string='Integration Status Summary',
         compute='_compute_integration_analytics',
         store=True
@@ -167,25 +197,106 @@ class TrainingDashboard(models.Model):
         help='Dashboard refresh interval in minutes'
     )
 
+    # Incremental refresh
+    change_watermark = fields.Datetime(
+        string='Change Watermark',
+        readonly=True,
+        copy=False,
+        default=lambda self: self.env['gr.training.dashboard.change']._get_watermark(),
+        help='Time up to which the logged changes are reflected in the analytics; empty forces a full refresh'
+    )
+
+    section_timings = fields.Json(
+        string='Section Timings',
+        readonly=True,
+        copy=False,
+        help='Seconds spent on each section recomputed by the last refresh'
+    )
+
+    section_timings_display = fields.Text(
+        string='Section Timings (s)',
+        compute='_compute_section_timings_display'
+    )
+
+    # Pre-serialised get_dashboard_data payload
+    payload_etag = fields.Char(
+        string='Payload ETag',
+        readonly=True,
+        copy=False,
+        help='Cache key (payload version, dashboard and last update) of the stored payload'
+    )
+
+    payload_json = fields.Text(
+        string='Payload',
+        readonly=True,
+        copy=False,
+        help='get_dashboard_data response serialised at the last update'
+    )
+
+    # Text rendering of the JSON analytics for the form view
+    progress_distribution_display = fields.Text(compute='_compute_analytics_display')
+    monthly_enrollments_display = fields.Text(compute='_compute_analytics_display')
+    completion_trends_display = fields.Text(compute='_compute_analytics_display')
+    top_performers_display = fields.Text(compute='_compute_analytics_display')
+    struggling_students_display = fields.Text(compute='_compute_analytics_display')
+    engagement_metrics_display = fields.Text(compute='_compute_analytics_display')
+    course_performance_display = fields.Text(compute='_compute_analytics_display')
+    popular_courses_display = fields.Text(compute='_compute_analytics_display')
+    integration_status_summary_display = fields.Text(compute='_compute_analytics_display')
+
+    @api.depends(*ANALYTICS_JSON_FIELDS)
+    def _compute_analytics_display(self):
+        """Render the JSON analytics as indented text."""
+        for dashboard in self:
+            for field_name in ANALYTICS_JSON_FIELDS:
+                dashboard[f'{field_name}_display'] = json.dumps(dashboard[field_name], indent=2)
+
+    @api.depends('section_timings')
+    def _compute_section_timings_display(self):
+        """Render the section timings as indented text."""
+        for dashboard in self:
+            dashboard.section_timings_display = json.dumps(dashboard.section_timings or {}, indent=2)
+
+    def write(self, vals):
+        """Changing the date window invalidates the cached payload through last_update.
+
+        Turning auto refresh on resets the change watermark, so that the next
+        cron run refreshes the whole dashboard.
+        """
+        if ('date_from' in vals or 'date_to' in vals) and 'last_update' not in vals:
+            vals = dict(vals, last_update=fields.Datetime.now())
+        if vals.get('auto_refresh') and 'change_watermark' not in vals:
+            vals = dict(vals, change_watermark=False)
+        return super(TrainingDashboard, self).write(vals)
+
+    def _get_fact_domain(self, fact_type):
+        """Domain selecting the daily facts of one type within the dashboard window."""
+        self.ensure_one()
+        return [
+            ('fact_type', '=', fact_type),
+            ('date', '>=', self.date_from),
+            ('date', '<=', self.date_to)
+        ]
+
     @api.depends('date_from', 'date_to')
     def _compute_kpi_metrics(self):
         """Compute key performance indicators."""
+        facts = self.env['gr.training.analytics.fact']
+        active_courses = self.env['gr.course.integration'].search_count([('status', '=', 'active')])
         for dashboard in self:
-            domain = [
-                ('create_date', '>=', dashboard.date_from),
-                ('create_date', '<=', dashboard.date_to)
-            ]
-
-            # Total students in date range
-            dashboard.total_students = self.env['gr.student'].search_count(domain)
-
-            # Enrolled students
-            enrolled_domain = domain + [('integration_status', 'in', ['enrolled', 'in_progress', 'completed', 'certified'])]
-            dashboard.enrolled_students = self.env['gr.student'].search_count(enrolled_domain)
-
-            # Completed students
-            completed_domain = domain + [('integration_status', 'in', ['completed', 'certified'])]
-            dashboard.completed_students = self.env['gr.student'].search_count(completed_domain)
+            # Students in date range, counted per integration status
+            status_counts = {}
+            completion_days = completion_count = 0
+            for status, count, days_sum, days_count in facts._read_group(
+                    dashboard._get_fact_domain('student'), ['status'],
+                    ['record_count:sum', 'completion_days_sum:sum', 'completion_days_count:sum']):
+                status_counts[status] = count
+                completion_days += days_sum or 0
+                completion_count += days_count or 0
+
+            dashboard.total_students = sum(status_counts.values())
+            dashboard.enrolled_students = sum(status_counts.get(status, 0) for status in ENROLLED_STATUSES)
+            dashboard.completed_students = sum(status_counts.get(status, 0) for status in COMPLETED_STATUSES)
 
             # Completion rate
             if dashboard.total_students > 0:
@@ -194,75 +305,42 @@ class TrainingDashboard(models.Model):
                 dashboard.completion_rate = 0.0
 
             # Average completion time
-            completed_students = self.env['gr.student'].search(completed_domain)
-            if completed_students:
-                total_days = 0
-                count = 0
-                for student in completed_students:
-                    if student.intake_date and student.create_date:
-                        days = (student.create_date.date() - student.intake_date).days
-                        total_days += days
-                        count += 1
-                
-                if count > 0:
-                    dashboard.avg_completion_time = total_days / count
-                else:
-                    dashboard.avg_completion_time = 0.0
-            else:
-                dashboard.avg_completion_time = 0.0
+            dashboard.avg_completion_time = completion_days / completion_count if completion_count else 0.0
 
             # Active courses
-            dashboard.active_courses = self.env['gr.course.integration'].search_count([('status', '=', 'active')])
+            dashboard.active_courses = active_courses
 
             # Total enrollments
-            dashboard.total_enrollments = self.env['gr.progress.tracker'].search_count([
-                ('create_date', '>=', dashboard.date_from),
-                ('create_date', '<=', dashboard.date_to)
-            ])
+            [(total_enrollments,)] = facts._read_group(dashboard._get_fact_domain('tracker'), [], ['record_count:sum'])
+            dashboard.total_enrollments = total_enrollments or 0
 
     @api.depends('date_from', 'date_to')
     def _compute_progress_analytics(self):
         """Compute progress analytics and trends."""
+        facts = self.env['gr.training.analytics.fact']
         for dashboard in self:
-            # Progress distribution
-            progress_data = {}
-            trackers = self.env['gr.progress.tracker'].search([
-                ('create_date', '>=', dashboard.date_from),
-                ('create_date', '<=', dashboard.date_to)
-            ])
-
-            for tracker in trackers:
-                progress_range = self._get_progress_range(tracker.overall_progress)
-                progress_data[progress_range] = progress_data.get(progress_range, 0) + 1
+            tracker_domain = dashboard._get_fact_domain('tracker')
 
-            dashboard.progress_distribution = str(progress_data)
+            # Progress distribution
+            [bucket_counts] = facts._read_group(tracker_domain, [], [
+                'progress_0_25:sum', 'progress_25_50:sum', 'progress_50_75:sum', 'progress_75_100:sum'])
+            dashboard.progress_distribution = {
+                progress_range: count for progress_range, count in zip(PROGRESS_RANGES, bucket_counts) if count
+            }
 
             # Monthly enrollments
-            monthly_data = {}
-            enrollments = self.env['gr.progress.tracker'].search([
-                ('create_date', '>=', dashboard.date_from),
-                ('create_date', '<=', dashboard.date_to)
-            ])
-
-            for enrollment in enrollments:
-                month_key = enrollment.create_date.strftime('%Y-%m')
-                monthly_data[month_key] = monthly_data.get(month_key, 0) + 1
-
-            dashboard.monthly_enrollments = str(monthly_data)
+            monthly_data = facts._read_group(tracker_domain, ['date:month'], ['record_count:sum'])
+            dashboard.monthly_enrollments = {
+                month.strftime('%Y-%m'): count for month, count in monthly_data
+            }
 
             # Completion trends
-            completion_data = {}
-            completions = self.env['gr.student'].search([
-                ('integration_status', 'in', ['completed', 'certified']),
-                ('create_date', '>=', dashboard.date_from),
-                ('create_date', '<=', dashboard.date_to)
-            ])
-
-            for completion in completions:
-                month_key = completion.create_date.strftime('%Y-%m')
-                completion_data[month_key] = completion_data.get(month_key, 0) + 1
-
-            dashboard.completion_trends = str(completion_data)
+            completion_data = facts._read_group(
+                dashboard._get_fact_domain('student') + [('status', 'in', COMPLETED_STATUSES)],
+                ['date:month'], ['record_count:sum'])
+            dashboard.completion_trends = {
+                month.strftime('%Y-%m'): count for month, count in completion_data
+            }
 
     @api.depends('date_from', 'date_to')
     def _compute_student_analytics(self):
@@ -282,7 +360,7 @@ class TrainingDashboard(models.Model):
                     'courses_completed': student.completed_courses
                 })
 
-            dashboard.top_performers = str(top_data)
+            dashboard.top_performers = top_data
 
             # Struggling students
             struggling_students = self.env['gr.student'].search([
@@ -298,7 +376,7 @@ class TrainingDashboard(models.Model):
                     'last_activity': student.create_date.strftime('%Y-%m-%d')
                 })
 
-            dashboard.struggling_students = str(struggling_data)
+            dashboard.struggling_students = struggling_data
 
             # Engagement metrics
             total_active = self.env['gr.student'].search_count([
@@ -312,81 +390,64 @@ class TrainingDashboard(models.Model):
 
             engagement_rate = (highly_engaged / total_active * 100) if total_active > 0 else 0
 
-            dashboard.engagement_metrics = str({
+            dashboard.engagement_metrics = {
                 'total_active': total_active,
                 'highly_engaged': highly_engaged,
                 'engagement_rate': engagement_rate
-            })
+            }
 
     @api.depends('date_from', 'date_to')
     def _compute_course_analytics(self):
         """Compute course performance analytics."""
+        courses = self.env['gr.course.integration'].search([('status', '=', 'active')])
         for dashboard in self:
+            # Enrollments, progress and completions per course and tracker status
+            stats = {course: {'enrollments': 0, 'progress': 0.0, 'completed': 0} for course in courses}
+            for course, status, count, progress_sum in self.env['gr.training.analytics.fact']._read_group(
+                    dashboard._get_fact_domain('tracker') + [('course_integration_id', 'in', courses.ids)],
+                    ['course_integration_id', 'status'], ['record_count:sum', 'progress_sum:sum']):
+                stats[course]['enrollments'] += count
+                stats[course]['progress'] += progress_sum or 0.0
+                if status == 'completed':
+                    stats[course]['completed'] += count
+
             # Course performance
-            courses = self.env['gr.course.integration'].search([('status', '=', 'active')])
             course_data = []
-
             for course in courses:
-                trackers = self.env['gr.progress.tracker'].search([
-                    ('course_integration_id', '=', course.id),
-                    ('create_date', '>=', dashboard.date_from),
-                    ('create_date', '<=', dashboard.date_to)
-                ])
-
-                if trackers:
-                    avg_progress = sum(tracker.overall_progress for tracker in trackers) / len(trackers)
-                    completion_count = len(trackers.filtered(lambda t: t.status == 'completed'))
-                    completion_rate = (completion_count / len(trackers)) * 100
-
+                course_stats = stats[course]
+                if course_stats['enrollments']:
                     course_data.append({
                         'name': course.name,
-                        'enrollments': len(trackers),
-                        'avg_progress': avg_progress,
-                        'completion_rate': completion_rate
+                        'enrollments': course_stats['enrollments'],
+                        'avg_progress': course_stats['progress'] / course_stats['enrollments'],
+                        'completion_rate': (course_stats['completed'] / course_stats['enrollments']) * 100
                     })
 
-            dashboard.course_performance = str(course_data)
+            dashboard.course_performance = course_data
 
             # Popular courses
-            popular_courses = self.env['gr.course.integration'].search([('status', '=', 'active')])
-            popular_data = []
-
-            for course in popular_courses:
-                enrollment_count = self.env['gr.progress.tracker'].search_count([
-                    ('course_integration_id', '=', course.id),
-                    ('create_date', '>=', dashboard.date_from),
-                    ('create_date', '<=', dashboard.date_to)
-                ])
-
-                popular_data.append({
-                    'name': course.name,
-                    'enrollments': enrollment_count
-                })
+            popular_data = [{
+                'name': course.name,
+                'enrollments': stats[course]['enrollments']
+            } for course in courses]
 
             # Sort by enrollments and take top 5
             popular_data.sort(key=lambda x: x['enrollments'], reverse=True)
-            dashboard.popular_courses = str(popular_data[:5])
+            dashboard.popular_courses = popular_data[:5]
 
     @api.depends('date_from', 'date_to')
     def _compute_integration_analytics(self):
         """Compute eLearning integration analytics."""
         for dashboard in self:
             # Integration status summary
-            status_counts = {}
-            students = self.env['gr.student'].search([
-                ('create_date', '>=', dashboard.date_from),
-                ('create_date', '<=', dashboard.date_to)
-            ])
+            status_counts = dict(self.env['gr.training.analytics.fact']._read_group(
+                dashboard._get_fact_domain('student'), ['status'], ['record_count:sum']))
 
-            for student in students:
-                status = student.integration_status
-                status_counts[status] = status_counts.get(status, 0) + 1
-
-            dashboard.integration_status_summary = str(status_counts)
+            dashboard.integration_status_summary = status_counts
 
             # eLearning adoption rate
-            total_students = len(students)
-            elearning_students = len(students.filtered(lambda s: s.integration_status != 'not_integrated'))
+            total_students = sum(status_counts.values())
+            elearning_students = total_students - status_counts.get('not_integrated', 0)
             
             if total_students > 0:
                 dashboard.elearning_adoption_rate = (elearning_students / total_students) * 100
@@ -406,13 +467,9 @@ class TrainingDashboard(models.Model):
 
     def action_refresh_dashboard(self):
         """Manually refresh dashboard data."""
-        self._compute_kpi_metrics()
-        self._compute_progress_analytics()
-        self._compute_student_analytics()
-        self._compute_course_analytics()
-        self._compute_integration_analytics()
-        
-        self.last_update = fields.Datetime.now()
+        self.env['gr.training.analytics.fact'].sudo()._refresh_pending_days()
+        watermark = self.env['gr.training.dashboard.change']._get_watermark()
+        self._refresh_sections(DASHBOARD_SECTIONS, watermark)
         
         return {
             'type': 'ir.actions.client',
@@ -432,59 +489,152 @@ class TrainingDashboard(models.Model):
         raise UserError(_('Report scheduling will be implemented in Phase 4'))
 
     @api.model
-    def get_dashboard_data(self, dashboard_id=None):
-        """Get dashboard data for API/JavaScript consumption."""
-        if dashboard_id:
+    def get_dashboard_data(self, dashboard_id=None, date_from=None, date_to=None):
+        """Get dashboard data for API/JavaScript consumption.
+        
+        With ``date_from``/``date_to``, the analytics of that window are
+        computed on the fly from the daily facts, without a stored dashboard.
+        """
+        if date_from or date_to:
+            dashboard = self.new({
+                'date_from': date_from or fields.Date.today() - timedelta(days=30),
+                'date_to': date_to or fields.Date.today(),
+            })
+        elif dashboard_id:
             dashboard = self.browse(dashboard_id)
         else:
             dashboard = self.search([], limit=1)
             if not dashboard:
                 dashboard = self.create({})
 
+        return dashboard._build_payload()
+
+    def _build_payload(self):
+        """Assemble the get_dashboard_data response from the stored analytics."""
+        self.ensure_one()
         return {
             'kpi_metrics': {
-                'total_students': dashboard.total_students,
-                'enrolled_students': dashboard.enrolled_students,
-                'completed_students': dashboard.completed_students,
-                'completion_rate': dashboard.completion_rate,
-                'avg_completion_time': dashboard.avg_completion_time,
-                'active_courses': dashboard.active_courses,
-                'total_enrollments': dashboard.total_enrollments,
+                'total_students': self.total_students,
+                'enrolled_students': self.enrolled_students,
+                'completed_students': self.completed_students,
+                'completion_rate': self.completion_rate,
+                'avg_completion_time': self.avg_completion_time,
+                'active_courses': self.active_courses,
+                'total_enrollments': self.total_enrollments,
             },
             'progress_analytics': {
-                'progress_distribution': eval(dashboard.progress_distribution or '{}'),
-                'monthly_enrollments': eval(dashboard.monthly_enrollments or '{}'),
-                'completion_trends': eval(dashboard.completion_trends or '{}'),
+                'progress_distribution': self.progress_distribution or {},
+                'monthly_enrollments': self.monthly_enrollments or {},
+                'completion_trends': self.completion_trends or {},
             },
             'student_analytics': {
-                'top_performers': eval(dashboard.top_performers or '[]'),
-                'struggling_students': eval(dashboard.struggling_students or '[]'),
-                'engagement_metrics': eval(dashboard.engagement_metrics or '{}'),
+                'top_performers': self.top_performers or [],
+                'struggling_students': self.struggling_students or [],
+                'engagement_metrics': self.engagement_metrics or {},
             },
             'course_analytics': {
-                'course_performance': eval(dashboard.course_performance or '[]'),
-                'popular_courses': eval(dashboard.popular_courses or '[]'),
+                'course_performance': self.course_performance or [],
+                'popular_courses': self.popular_courses or [],
             },
             'integration_analytics': {
-                'integration_status_summary': eval(dashboard.integration_status_summary or '{}'),
-                'elearning_adoption_rate': dashboard.elearning_adoption_rate,
+                'integration_status_summary': self.integration_status_summary or {},
+                'elearning_adoption_rate': self.elearning_adoption_rate,
             },
-            'last_update': dashboard.last_update,
+            'last_update': fields.Datetime.to_string(self.last_update),
         }
 
+    def _get_payload_etag(self):
+        """Cache key of the payload: layout version, dashboard and last update."""
+        self.ensure_one()
+        last_update = fields.Datetime.to_string(self.last_update) or ''
+        return f"v{PAYLOAD_VERSION}-{self.id}-{last_update.replace(' ', 'T')}"
+
+    def _store_payload(self):
+        """Serialise the payload and store it with its ETag."""
+        self.ensure_one()
+        etag = self._get_payload_etag()
+        payload = json.dumps(self._build_payload(), separators=(',', ':'))
+        self.sudo().write({'payload_etag': etag, 'payload_json': payload})
+        return etag, payload
+
+    def _get_serialized_payload(self):
+        """Return ``(etag, json_text)`` of the dashboard payload, serialising it only when stale."""
+        self.ensure_one()
+        if self.payload_json and self.payload_etag == self._get_payload_etag():
+            return self.payload_etag, self.payload_json
+        return self._store_payload()
+
+    # ===== INCREMENTAL REFRESH =====
+
+    def _refresh_sections(self, sections, watermark):
+        """Recompute the given sections, timing each one, and store the new payload."""
+        timings = {}
+        for section, (method, _sources) in DASHBOARD_SECTIONS.items():
+            if section in sections:
+                start = time.time()
+                getattr(self, method)()
+                timings[section] = round(time.time() - start, 4)
+        
+        self.write({
+            'last_update': fields.Datetime.now(),
+            'change_watermark': watermark,
+            'section_timings': timings,
+        })
+        
+        # Serialise the API payload once, for all the clients polling the dashboard
+        for dashboard in self:
+            dashboard._store_payload()
+        return timings
+
+    def _get_changed_sections(self, changes):
+        """Return the sections affected by ``changes`` (``{source: days}``) within the date window."""
+        self.ensure_one()
+        sections = set()
+        for section, (_method, sources) in DASHBOARD_SECTIONS.items():
+            for source in sources:
+                days = changes.get(source)
+                if not days:
+                    continue
+                if (section in UNWINDOWED_SECTIONS or False in days
+                        or any(self.date_from <= day <= self.date_to for day in days)):
+                    sections.add(section)
+                    break
+        return sections
+
     @api.model
     def refresh_all_dashboards(self):
-        """Refresh all active dashboards."""
+        """Refresh the sections of the active dashboards affected by the changes logged since their last refresh."""
         _logger.info('Refreshing all active dashboards...')
+        self.env['gr.training.analytics.fact'].sudo()._refresh_pending_days()
         
+        change_log = self.env['gr.training.dashboard.change']
+        watermark = change_log._get_watermark()
         active_dashboards = self.search([('auto_refresh', '=', True)])
         
+        refreshed = 0
         for dashboard in active_dashboards:
             try:
-                dashboard.action_refresh_dashboard()
+                if not dashboard.change_watermark:
+                    sections = set(DASHBOARD_SECTIONS)
+                else:
+                    changes = change_log._read_changes(dashboard.change_watermark)
+                    sections = dashboard._get_changed_sections(changes)
+                
+                if sections:
+                    timings = dashboard._refresh_sections(sections, watermark)
+                    refreshed += 1
+                    _logger.info('Dashboard %s refreshed, section timings: %s', dashboard.name, timings)
+                elif dashboard.change_watermark != watermark:
+                    dashboard.change_watermark = watermark
             except Exception as e:
                 _logger.error('Failed to refresh dashboard %s: %s', dashboard.name, str(e))
                 continue
         
-        _logger.info('Dashboard refresh completed for %d dashboards', len(active_dashboards))
-        return len(active_dashboards)
+        # Drop the changes every active dashboard has processed; those without
+        # watermark are refreshed in full and need none
+        watermarks = [seen for seen in active_dashboards.mapped('change_watermark') if seen]
+        change_log._purge_changes(min(watermarks, default=watermark))
+        
+        _logger.info('Dashboard refresh completed: %d of %d dashboards had changes',
+                     refreshed, len(active_dashboards))
+        return refreshed
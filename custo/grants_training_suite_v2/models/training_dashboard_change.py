@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Precommit data key holding the (source, day) changes of the transaction
+PENDING_CHANGES_KEY = 'gr.training.dashboard.change.pending'
+
+# Changes logged this long before a watermark are read again after it, in case
+# their transaction committed only after the refresh took its snapshot
+CHANGE_OVERLAP = timedelta(minutes=5)
+
+
+class TrainingDashboardChange(models.Model):
+    _name = 'gr.training.dashboard.change'
+    _description = 'Training Dashboard Change Log'
+    _order = 'id'
+    _log_access = False
+
+    source = fields.Selection([
+        ('student', 'Student'),
+        ('tracker', 'Progress Tracker'),
+        ('course', 'Course Integration'),
+    ], string='Source', required=True)
+
+    date = fields.Date(
+        string='Date',
+        help='Creation day of the changed records; empty when the change affects every date window'
+    )
+
+    logged_at = fields.Datetime(
+        string='Logged At',
+        required=True,
+        index=True,
+        default=lambda self: fields.Datetime.now(),
+        help='Time the change was logged, right before its transaction committed'
+    )
+
+    # ===== LOGGING =====
+
+    @api.model
+    def _log_changes(self, source, records=None):
+        """Queue a change of ``records``, logged once per source and creation day before commit.
+
+        Without ``records`` the change is not tied to a day and reaches every dashboard.
+        """
+        if records is None:
+            days = {False}
+        else:
+            days = {record.create_date.date() for record in records if record.create_date}
+            if not days:
+                return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(PENDING_CHANGES_KEY)
+        if pending is None:
+            pending = precommit.data[PENDING_CHANGES_KEY] = set()
+            precommit.add(self.sudo()._flush_pending_changes)
+        pending.update((source, day) for day in days)
+
+    @api.model
+    def _flush_pending_changes(self):
+        """Write the changes queued by ``_log_changes``."""
+        pending = self.env.cr.precommit.data.pop(PENDING_CHANGES_KEY, None)
+        if pending:
+            self.create([{'source': source, 'date': day} for source, day in sorted(pending, key=str)])
+
+    # ===== WATERMARKS =====
+
+    @api.model
+    def _get_watermark(self):
+        """Return the start of the current transaction, before any change it can read.
+
+        Ids and log times follow the start of the writing transactions, not
+        their commits, so a change may become visible after a later one has
+        been read; ``_read_changes`` reads ``CHANGE_OVERLAP`` back to catch it.
+        """
+        return self.env.cr.now()
+
+    @api.model
+    def _read_changes(self, after):
+        """Return ``{source: days}`` of the changes logged since watermark ``after``, less the overlap.
+
+        Changes not tied to a day are reported as ``False``.
+        """
+        changes = {}
+        for source, day in self._read_group(
+                [('logged_at', '>', after - CHANGE_OVERLAP)], ['source', 'date:day'], []):
+            changes.setdefault(source, set()).add(day)
+        return changes
+
+    @api.model
+    def _purge_changes(self, watermark):
+        """Delete the changes processed by every auto-refreshed dashboard, up to ``watermark``.
+
+        The changes within ``CHANGE_OVERLAP`` of the watermark are kept for the next reads.
+        """
+        self.flush_model()
+        self.env.cr.execute(
+            'DELETE FROM gr_training_dashboard_change WHERE logged_at < %s', (watermark - CHANGE_OVERLAP,))
+        self.invalidate_model()
+        return self.env.cr.rowcount
@@ -3,3 +3,19 @@
 from . import test_student_name_fields
 from . import test_enrollment_fixes
 from . import test_column_mapping
+from . import test_intake_streaming_import
+from . import test_intake_validation
+from . import test_intake_parsed_cache
+from . import test_intake_session_planner
+from . import test_certificate_eligibility
+from . import test_certificate_pdf_batch
+from . import test_certificate_template_cache
+from . import test_training_dashboard_analytics
+from . import test_training_analytics_fact
+from . import test_training_dashboard_payload
+from . import test_training_dashboard_refresh
+from . import test_milestone_notifications
+from . import test_notification_outbox
+from . import test_notification_digest
+from . import test_elearning_bulk_sync
+from . import test_elearning_progress_push
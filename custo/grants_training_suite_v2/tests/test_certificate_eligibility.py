@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestCertificateEligibility(TransactionCase):
+
+    def setUp(self):
+        super(TestCertificateEligibility, self).setUp()
+
+        elearning_course = self.env['slide.channel'].create({
+            'name': 'Eligibility Course',
+            'channel_type': 'training',
+        })
+        self.training_program = self.env['gr.training.program'].create({
+            'name': 'Eligibility Program',
+        })
+        self.course = self.env['gr.course.integration'].create({
+            'name': 'Eligibility Course Integration',
+            'elearning_course_id': elearning_course.id,
+            'training_program_id': self.training_program.id,
+            'completion_threshold': 80.0,
+            'min_elearning_progress': 80.0,
+        })
+        self.good_student, self.weak_student = self.env['gr.student'].create([{
+            'name': name,
+            'name_arabic': f'{name} Arabic',
+            'name_english': name,
+            'email': f'{name.lower().replace(" ", ".")}@example.com',
+        } for name in ('Good Student', 'Weak Student')])
+        self.good_tracker, self.weak_tracker = self.env['gr.progress.tracker'].create([{
+            'student_id': student.id,
+            'course_integration_id': self.course.id,
+            'elearning_progress': progress,
+            'custom_sessions_completed': sessions,
+            'status': 'completed',
+            'completion_date': fields.Datetime.now(),
+        } for student, progress, sessions in ((self.good_student, 100.0, 10), (self.weak_student, 50.0, 0))])
+
+    def test_eligibility_report_counts_failures(self):
+        """The report counts eligible trackers and failures per criterion."""
+        report = self.env['gr.certificate'].get_certificate_eligibility_report()
+
+        self.assertEqual(report['total_completed_students'], 2)
+        self.assertEqual(report['eligible_for_certificates'], 1)
+        self.assertEqual(report['not_eligible_for_certificates'], 1)
+        self.assertEqual(report['success_criteria_summary']['overall_progress_failures'], 1)
+        self.assertEqual(report['success_criteria_summary']['elearning_progress_failures'], 1)
+        self.assertEqual(report['success_criteria_summary']['sessions_failures'], 0)
+
+    def test_issued_certificates_are_excluded(self):
+        """Trackers whose student already has an issued certificate are skipped."""
+        completed = self.env['gr.certificate']._find_completed_students_without_certificates()
+        self.assertEqual([data['tracker'] for data in completed], [self.good_tracker])
+
+        self.env['gr.certificate'].create({
+            'student_id': self.good_student.id,
+            'certificate_type': 'completion',
+            'certificate_title': 'Eligibility Certificate',
+            'course_name': self.course.name,
+            'state': 'issued',
+        })
+
+        eligibility = self.env['gr.certificate']._evaluate_certificate_eligibility()
+        self.assertEqual(eligibility['already_certified'], 1)
+        self.assertFalse(self.env['gr.certificate']._find_completed_students_without_certificates())
+
+    def test_program_automation_eligibility(self):
+        """Automation rules are evaluated for all program students at once."""
+        self.weak_tracker.status = 'in_progress'
+        automation = self.env['gr.certificate.automation'].create({
+            'name': 'Eligibility Automation',
+            'training_program_id': self.training_program.id,
+            'completion_threshold': 0.0,
+            'min_attendance_percentage': 0.0,
+            'require_elearning_completion': False,
+            'require_all_courses': True,
+            'require_homework_submission': True,
+        })
+
+        eligibility = automation._evaluate_program_eligibility()
+
+        self.assertEqual(eligibility['total'], 2)
+        self.assertEqual(eligibility['eligible'], 0)
+        self.assertEqual(eligibility['failure_counts']['all_courses'], 1)
+        self.assertEqual(eligibility['failure_counts']['homework'], 2)
+
+        automation.require_homework_submission = False
+        self.assertTrue(automation._validate_certificate_eligibility(self.good_student))
+        self.assertFalse(automation._validate_certificate_eligibility(self.weak_student))
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import io
+from unittest.mock import patch
+
+from reportlab.pdfgen import canvas
+
+from odoo.tests.common import TransactionCase
+from odoo.tools.pdf import PdfFileReader
+
+
+def _make_pdf(pages):
+    """Build a PDF with the given number of pages."""
+    stream = io.BytesIO()
+    pdf = canvas.Canvas(stream)
+    for page in range(pages):
+        pdf.drawString(100, 750, f'Certificate page {page + 1}')
+        pdf.showPage()
+    pdf.save()
+    return stream.getvalue()
+
+
+class TestCertificatePdfBatch(TransactionCase):
+
+    def setUp(self):
+        super(TestCertificatePdfBatch, self).setUp()
+
+        self.template = self.env['gr.certificate.template'].create({
+            'name': 'Batch Template',
+            'template_type': 'course_completion',
+        })
+        self.training_program = self.env['gr.training.program'].create({
+            'name': 'Batch Program',
+        })
+        self.automation = self.env['gr.certificate.automation'].create({
+            'name': 'Batch Automation',
+            'training_program_id': self.training_program.id,
+        })
+        students = self.env['gr.student'].create([{
+            'name': f'Batch Student {index}',
+            'name_arabic': f'Batch Student {index} Arabic',
+            'name_english': f'Batch Student {index}',
+            'email': f'batch.student{index}@example.com',
+        } for index in range(3)])
+        self.certificates = self.env['gr.certificate'].create([{
+            'student_id': student.id,
+            'certificate_type': 'completion',
+            'certificate_title': 'Batch Certificate',
+            'template_id': self.template.id,
+            'automation_id': self.automation.id,
+        } for student in students])
+        self.certificate_model = type(self.env['gr.certificate'])
+
+    def _page_count(self, certificate):
+        return PdfFileReader(io.BytesIO(base64.b64decode(certificate.certificate_file))).getNumPages()
+
+    def test_batches_are_split_per_certificate(self):
+        """Each wkhtmltopdf run renders a whole batch, split back per certificate."""
+        with patch.object(self.certificate_model, '_run_certificate_wkhtmltopdf',
+                          side_effect=lambda bodies: _make_pdf(len(bodies))) as run:
+            stats = self.certificates._generate_certificate_pdfs_bulk(batch_size=2, max_workers=1)
+
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(stats['rendered'], 3)
+        self.assertEqual(stats['batches'], 2)
+        self.assertEqual(stats['fallback_batches'], 0)
+        for certificate in self.certificates:
+            self.assertEqual(self._page_count(certificate), 1)
+            self.assertTrue(certificate.certificate_filename.endswith('.pdf'))
+        self.assertEqual(self.template.usage_count, 3)
+
+    def test_unsplittable_batch_falls_back(self):
+        """A batch whose page count does not match is rendered one certificate at a time."""
+        with patch.object(self.certificate_model, '_run_certificate_wkhtmltopdf',
+                          side_effect=lambda bodies: _make_pdf(1)) as run:
+            stats = self.certificates._generate_certificate_pdfs_bulk(batch_size=3, max_workers=1)
+
+        self.assertEqual(run.call_count, 4)
+        self.assertEqual(stats['rendered'], 3)
+        self.assertEqual(stats['fallback_batches'], 1)
+
+    def test_automation_records_metrics(self):
+        """The automation renders its missing PDFs and stores the run metrics."""
+        self.certificates[0].template_id = False
+
+        with patch.object(self.certificate_model, '_run_certificate_wkhtmltopdf',
+                          side_effect=lambda bodies: _make_pdf(len(bodies))):
+            self.automation.action_generate_certificate_pdfs()
+
+        self.assertEqual(self.automation.pdf_last_run_rendered, 2)
+        self.assertEqual(self.automation.pdf_last_run_failed, 0)
+        self.assertEqual(self.automation.pdf_total_rendered, 2)
+        self.assertTrue(self.automation.pdf_last_run_date)
+
+        with patch.object(self.certificate_model, '_run_certificate_wkhtmltopdf',
+                          side_effect=Exception('wkhtmltopdf crashed')):
+            stats = self.automation._generate_certificate_pdfs(self.certificates[1:])
+
+        self.assertEqual(stats['failed'], 2)
+        self.assertEqual(self.automation.pdf_total_failed, 2)
+        self.assertIn('wkhtmltopdf crashed', self.automation.pdf_last_errors)
+
+    def test_unchanged_certificates_are_not_rendered_again(self):
+        """A re-run skips certificates whose PDF was generated from the same content."""
+        with patch.object(self.certificate_model, '_run_certificate_wkhtmltopdf',
+                          side_effect=lambda bodies: _make_pdf(len(bodies))) as run:
+            self.certificates._generate_certificate_pdfs_bulk(batch_size=3, max_workers=1)
+            hashes = self.certificates.mapped('pdf_content_hash')
+
+            stats = self.certificates._generate_certificate_pdfs_bulk(batch_size=3, max_workers=1)
+
+            self.assertEqual(run.call_count, 1)
+            self.assertEqual(stats['reused'], 3)
+            self.assertEqual(stats['rendered'], 0)
+            self.assertEqual(self.certificates.mapped('pdf_content_hash'), hashes)
+
+            self.template.body_content = '<p>Updated certificate for {student_name}</p>'
+            stats = self.certificates._generate_certificate_pdfs_bulk(batch_size=3, max_workers=1)
+
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(stats['rendered'], 3)
+        self.assertNotEqual(self.certificates.mapped('pdf_content_hash'), hashes)
+
+    def test_replaced_file_is_rendered_again(self):
+        """Uploading another file by hand drops the content hash."""
+        with patch.object(self.certificate_model, '_run_certificate_wkhtmltopdf',
+                          side_effect=lambda bodies: _make_pdf(len(bodies))):
+            self.certificates[0].action_generate_certificate_pdf()
+            self.assertTrue(self.certificates[0].pdf_content_hash)
+
+            self.certificates[0].certificate_file = base64.b64encode(_make_pdf(2))
+
+            self.assertFalse(self.certificates[0].pdf_content_hash)
+            stats = self.certificates[0]._generate_certificate_pdfs_bulk()
+
+        self.assertEqual(stats['rendered'], 1)
+        self.assertEqual(self._page_count(self.certificates[0]), 1)
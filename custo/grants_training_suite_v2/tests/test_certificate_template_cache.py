@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+from ..utils import certificate_rendering
+
+
+class TestCertificateTemplateCache(TransactionCase):
+
+    def setUp(self):
+        super(TestCertificateTemplateCache, self).setUp()
+
+        self.template = self.env['gr.certificate.template'].create({
+            'name': 'Cached Template',
+            'template_type': 'course_completion',
+            'body_content': '<p>Awarded to <strong>{student_name}</strong> for {course_name}</p>',
+            'accent_color': '#123456',
+        })
+        self.context_data = {
+            'student_name': 'Jane <Smith>',
+            'course_name': 'Python Basics',
+        }
+
+    def test_render_plan_is_compiled_once(self):
+        """Rendering many certificates reuses the compiled plan of the template."""
+        self.env.registry.clear_cache()
+        with patch.object(certificate_rendering, 'compile_template',
+                          wraps=certificate_rendering.compile_template) as compile_template:
+            for _index in range(3):
+                rendered = self.template.render_template(self.context_data)
+
+        self.assertEqual(compile_template.call_count, 3)
+        self.assertIn('<strong>Jane &lt;Smith&gt;</strong> for Python Basics', rendered['body'])
+
+    def test_edit_invalidates_plan(self):
+        """Editing the template content or styling recompiles the plan, without clearing the caches."""
+        self.template.render_template(self.context_data)
+
+        with patch.object(type(self.env.registry), 'clear_cache') as clear_cache:
+            self.template.write({
+                'body_content': '<p>Completed {course_name}</p>',
+                'accent_color': '#654321',
+            })
+        clear_cache.assert_not_called()
+
+        rendered = self.template.render_template(self.context_data)
+        self.assertIn('Completed Python Basics', rendered['body'])
+        self.assertIn('color: #654321;', self.template._get_render_plan()['shell'].render({
+            'name': 'CERT', 'header': '', 'body': '', 'footer': '',
+        }))
+
+    def test_certificate_html_uses_shell(self):
+        """The certificate document is the template shell filled with the rendered parts."""
+        student = self.env['gr.student'].create({
+            'name': 'Shell Student',
+            'name_arabic': 'Shell Student Arabic',
+            'name_english': 'Shell Student',
+            'email': 'shell.student@example.com',
+        })
+        certificate = self.env['gr.certificate'].create({
+            'student_id': student.id,
+            'certificate_type': 'completion',
+            'certificate_title': 'Shell Certificate',
+            'course_name': 'Python Basics',
+            'template_id': self.template.id,
+        })
+
+        html_content = certificate._prepare_certificate_html(certificate.render_certificate_content())
+
+        self.assertIn(f'<title>Certificate - {certificate.name}</title>', html_content)
+        self.assertIn('color: #123456;', html_content)
+        self.assertIn('<strong>Shell Student</strong> for Python Basics', html_content)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+
+class TestElearningBulkSync(TransactionCase):
+
+    def setUp(self):
+        super(TestElearningBulkSync, self).setUp()
+
+        channel = self.env['slide.channel'].create({
+            'name': 'Sync eLearning',
+            'channel_type': 'training',
+        })
+        course = self.env['gr.course.integration'].create({
+            'name': 'Sync Course',
+            'elearning_course_id': channel.id,
+            'status': 'active',
+            'completion_threshold': 70.0,
+        })
+        students = self.env['gr.student'].create([{
+            'name': f'Sync Student {index}',
+            'name_arabic': f'Sync Student {index} Arabic',
+            'name_english': f'Sync Student {index}',
+            'email': f'sync.student{index}@example.com',
+        } for index in range(4)])
+        partners = self.env['res.partner'].create([{'name': student.name} for student in students])
+        enrollments = self.env['slide.channel.partner'].create([{
+            'channel_id': channel.id,
+            'partner_id': partner.id,
+        } for partner in partners])
+        for enrollment, completion in zip(enrollments, (40, 50, 100, 0)):
+            enrollment.completion = completion
+        self.trackers = self.env['gr.progress.tracker'].create([{
+            'student_id': student.id,
+            'course_integration_id': course.id,
+            'elearning_enrollment_id': enrollment.id,
+            'elearning_progress': progress,
+            'status': status,
+        } for student, enrollment, progress, status in zip(
+            students, enrollments, (0.0, 50.0, 60.0, 0.0),
+            ('not_started', 'in_progress', 'in_progress', 'not_started'))])
+
+    def test_only_changed_trackers_are_written(self):
+        """Progress and transitions are applied to the changed trackers only."""
+        tracker_class = type(self.env['gr.progress.tracker'])
+        written = []
+        original_write = tracker_class.write
+
+        def spy_write(records, vals):
+            written.extend(records.ids)
+            return original_write(records, vals)
+
+        with patch.object(tracker_class, 'write', spy_write):
+            result = self.env['gr.progress.tracker'].sync_all_elearning_progress()
+
+        started, unchanged, completed, not_started = self.trackers
+        self.assertEqual((started.status, started.elearning_progress), ('in_progress', 40.0))
+        self.assertTrue(started.start_date)
+        self.assertEqual((completed.status, completed.elearning_progress), ('completed', 100.0))
+        self.assertTrue(completed.completion_date)
+        self.assertEqual(unchanged.status, 'in_progress')
+        self.assertEqual(not_started.status, 'not_started')
+
+        self.assertNotIn(unchanged.id, written)
+        self.assertNotIn(not_started.id, written)
+        self.assertGreaterEqual(result['sync_count'], 2)
+        self.assertGreaterEqual(result['unchanged_count'], 2)
+        self.assertIn('duration', result)
+
+    def test_invalid_progress_is_reported(self):
+        """A completion outside 0-100 counts as an error and leaves the tracker untouched."""
+        self.trackers[0].elearning_enrollment_id.completion = 150
+
+        result = self.env['gr.progress.tracker'].sync_all_elearning_progress()
+
+        self.assertGreaterEqual(result['error_count'], 1)
+        self.assertEqual(self.trackers[0].status, 'not_started')
+        self.assertEqual(self.trackers[0].elearning_progress, 0.0)
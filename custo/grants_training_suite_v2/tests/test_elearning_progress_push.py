@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestElearningProgressPush(TransactionCase):
+
+    def setUp(self):
+        super(TestElearningProgressPush, self).setUp()
+
+        channel = self.env['slide.channel'].create({
+            'name': 'Push eLearning',
+            'channel_type': 'training',
+        })
+        course = self.env['gr.course.integration'].create({
+            'name': 'Push Course',
+            'elearning_course_id': channel.id,
+            'status': 'active',
+            'completion_threshold': 70.0,
+        })
+        students = self.env['gr.student'].create([{
+            'name': f'Push Student {index}',
+            'name_arabic': f'Push Student {index} Arabic',
+            'name_english': f'Push Student {index}',
+            'email': f'push.student{index}@example.com',
+        } for index in range(2)])
+        partners = self.env['res.partner'].create([{'name': student.name} for student in students])
+        self.enrollments = self.env['slide.channel.partner'].create([{
+            'channel_id': channel.id,
+            'partner_id': partner.id,
+        } for partner in partners])
+        self.trackers = self.env['gr.progress.tracker'].create([{
+            'student_id': student.id,
+            'course_integration_id': course.id,
+            'elearning_enrollment_id': enrollment.id,
+            'status': 'not_started',
+        } for student, enrollment in zip(students, self.enrollments)])
+        self.env['gr.progress.tracker']._sync_pending_enrollments()
+
+    def test_completion_write_is_pushed_once(self):
+        """Completion writes are coalesced and applied to the trackers before commit."""
+        first, second = self.enrollments
+        first.completion = 30
+        first.completion = 100
+        self.assertEqual(self.trackers[0].elearning_progress, 0.0)
+
+        result = self.env['gr.progress.tracker']._sync_pending_enrollments()
+        self.assertEqual(result['total_processed'], 1)
+        self.assertEqual((self.trackers[0].status, self.trackers[0].elearning_progress), ('completed', 100.0))
+        self.assertEqual(self.trackers[1].status, 'not_started')
+        self.assertIsNone(self.env['gr.progress.tracker']._sync_pending_enrollments())
+
+    def test_reconciliation_only_scans_recent_changes(self):
+        """After a first run, the reconciliation pass skips enrollments and trackers left unchanged."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'grants_training_suite_v2.elearning_sync_last_run', fields.Datetime.to_string(fields.Datetime.now()))
+        stale, recent = self.enrollments
+        # Completion changed behind the ORM, long before the last run
+        self.env.flush_all()
+        old = fields.Datetime.now() - timedelta(days=1)
+        self.env.cr.execute('UPDATE slide_channel_partner SET completion = 50, write_date = %s WHERE id = %s',
+                            (old, stale.id))
+        self.env.cr.execute('UPDATE gr_progress_tracker SET write_date = %s WHERE id = %s',
+                            (old, self.trackers[0].id))
+        self.env.cr.execute('UPDATE slide_channel_partner SET completion = 40 WHERE id = %s', (recent.id,))
+        self.env.invalidate_all()
+
+        result = self.env['gr.progress.tracker'].sync_all_elearning_progress()
+        self.assertEqual(result['total_processed'], 1)
+        self.assertEqual(self.trackers[0].elearning_progress, 0.0)
+        self.assertEqual((self.trackers[1].status, self.trackers[1].elearning_progress), ('in_progress', 40.0))
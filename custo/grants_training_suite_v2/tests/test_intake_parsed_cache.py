@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import json
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+from ..utils import intake_reader
+
+
+class TestIntakeParsedCache(TransactionCase):
+
+    def setUp(self):
+        super(TestIntakeParsedCache, self).setUp()
+
+        self.csv_data = (
+            b"Full Name,Arabic Name,English Name,Email Address\n"
+            b"John Doe,John Doe Arabic,John Doe,john@example.com\n"
+            b"Jane Smith,Jane Smith Arabic,Jane Smith,jane@example.com\n"
+        )
+        self.intake_batch = self.env['gr.intake.batch'].create({
+            'name': 'Test Cache Batch',
+            'filename': 'students.csv',
+            'file_data': base64.b64encode(self.csv_data),
+        })
+
+    def test_file_is_parsed_once(self):
+        """Upload, mapping and validation all read the same parsed cache."""
+        with patch.object(intake_reader, 'iter_file_rows', wraps=intake_reader.iter_file_rows) as iter_file_rows:
+            self.intake_batch.action_upload_file()
+            self.intake_batch.action_open_column_mapping()
+            self.intake_batch.column_mapping = json.dumps({
+                'name': 'Full Name',
+                'name_arabic': 'Arabic Name',
+                'name_english': 'English Name',
+                'email': 'Email Address',
+            })
+            self.intake_batch.action_process_with_mapping()
+
+        self.assertEqual(iter_file_rows.call_count, 1)
+        self.assertEqual(self.intake_batch.state, 'validated')
+        self.assertEqual(self.intake_batch.total_records, 2)
+        self.assertEqual(json.loads(self.intake_batch.available_columns)[0], 'Full Name')
+
+    def test_cache_rebuilt_for_new_file(self):
+        """Replacing the uploaded file invalidates the parsed cache."""
+        self.assertEqual(len(self.intake_batch._parse_file()), 2)
+        first_checksum = self.intake_batch.parsed_cache_checksum
+
+        self.intake_batch.file_data = base64.b64encode(
+            self.csv_data + b"Ali Hassan,Ali Hassan Arabic,Ali Hassan,ali@example.com\n")
+
+        self.assertEqual(len(self.intake_batch._parse_file()), 3)
+        self.assertNotEqual(self.intake_batch.parsed_cache_checksum, first_checksum)
+
+    def test_validate_preview_reads_csv(self):
+        """The preview works on CSV uploads through the parsed cache."""
+        self.intake_batch.column_mapping = False
+
+        result = self.intake_batch.action_validate_preview()
+
+        self.assertIn('Total records: 2', result['params']['message'])
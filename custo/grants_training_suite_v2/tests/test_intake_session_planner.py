@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import TransactionCase
+
+
+class TestIntakeSessionPlanner(TransactionCase):
+
+    def setUp(self):
+        super(TestIntakeSessionPlanner, self).setUp()
+
+        self.intake_batch = self.env['gr.intake.batch'].create({
+            'name': 'Test Session Batch',
+            'import_chunk_size': 2,
+        })
+        self.intake_batch.state = 'processed'
+        self.students = self.env['gr.student'].create([{
+            'name': f'Student {index}',
+            'name_arabic': f'Student {index} Arabic',
+            'name_english': f'Student {index}',
+            'email': f'student{index}@example.com',
+            'intake_batch_id': self.intake_batch.id,
+        } for index in range(3)])
+
+    def _batch_sessions(self):
+        return self.env['gr.course.session'].search([('student_id', 'in', self.students.ids)])
+
+    def test_dry_run_does_not_write(self):
+        """The dry run returns the planned schedule without creating sessions."""
+        sessions, plan = self.intake_batch._create_sessions_bulk(dry_run=True)
+
+        self.assertFalse(sessions)
+        self.assertFalse(self._batch_sessions())
+        self.assertEqual(plan['students'], 3)
+        self.assertEqual(len(plan['schedule']), 3)
+        self.assertEqual(self.intake_batch.sessions_created_count, 0)
+
+    def test_bulk_creation(self):
+        """Sessions are created for every student with the generated names."""
+        self.intake_batch.action_create_sessions_for_batch()
+
+        sessions = self._batch_sessions()
+        self.assertEqual(len(sessions), 3)
+        self.assertEqual(self.intake_batch.sessions_created_count, 3)
+        self.assertTrue(all(session.name.startswith('Session - Student') for session in sessions))
+
+    def test_overlapping_sessions_are_conflicts(self):
+        """Running the planner twice reports the existing sessions as conflicts."""
+        self.intake_batch.action_create_sessions_for_batch()
+
+        sessions, plan = self.intake_batch._create_sessions_bulk()
+
+        self.assertFalse(sessions)
+        self.assertEqual(len(plan['conflicts']), 3)
+        self.assertEqual(len(self._batch_sessions()), 3)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import base64
+
+from odoo.tests.common import TransactionCase
+
+
+class TestIntakeStreamingImport(TransactionCase):
+
+    def setUp(self):
+        super(TestIntakeStreamingImport, self).setUp()
+
+        self.csv_data = (
+            b"name,name_arabic,name_english,email,birth_date,has_certificate\n"
+            b"John Doe,John Doe Arabic,John Doe,john@example.com,1990-01-15,yes\n"
+            b"Jane Smith,Jane Smith Arabic,Jane Smith,jane@example.com,15/02/1992,no\n"
+            b"Ali Hassan,Ali Hassan Arabic,Ali Hassan,ali@example.com,,true\n"
+        )
+
+        self.existing_student = self.env['gr.student'].create({
+            'name': 'Jane Old',
+            'name_arabic': 'Jane Old Arabic',
+            'name_english': 'Jane Old',
+            'email': 'jane@example.com',
+        })
+
+        self.intake_batch = self.env['gr.intake.batch'].create({
+            'name': 'Test Streaming Batch',
+            'filename': 'students.csv',
+            'file_data': base64.b64encode(self.csv_data),
+            'import_chunk_size': 2,
+        })
+        self.intake_batch.write({'state': 'validated', 'total_records': 3})
+
+    def test_iter_file_records_streams_rows(self):
+        """Rows are read lazily and keyed by the header row."""
+        records = list(self.intake_batch._iter_file_records())
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]['email'], 'john@example.com')
+        self.assertEqual(records[1]['birth_date'], '15/02/1992')
+
+    def test_process_file_in_chunks(self):
+        """Students are created/updated chunk by chunk and the cursor reaches the end."""
+        self.intake_batch.action_process_file()
+
+        self.assertEqual(self.intake_batch.state, 'processed')
+        self.assertEqual(self.intake_batch.import_cursor, 3)
+        self.assertEqual(self.intake_batch.created_students_count, 2)
+        self.assertEqual(self.intake_batch.updated_students_count, 1)
+        self.assertEqual(self.intake_batch.processed_records, 3)
+        self.assertEqual(self.existing_student.name, 'Jane Smith')
+        self.assertEqual(str(self.existing_student.birth_date), '1992-02-15')
+
+    def test_resume_from_cursor(self):
+        """An interrupted import resumes from the stored cursor for the same file."""
+        self.intake_batch.write({
+            'import_cursor': 2,
+            'import_checksum': self.intake_batch._get_file_checksum(),
+        })
+
+        self.intake_batch.action_process_file()
+
+        self.assertEqual(self.intake_batch.import_cursor, 3)
+        self.assertEqual(self.intake_batch.created_students_count, 1)
+        self.assertFalse(self.env['gr.student'].search([('email', '=', 'john@example.com')]))
+        self.assertTrue(self.env['gr.student'].search([('email', '=', 'ali@example.com')]))
+
+    def test_cursor_reset_for_other_file(self):
+        """A cursor recorded for another file is discarded."""
+        self.intake_batch.write({'import_cursor': 2, 'import_checksum': 'other-file'})
+
+        self.intake_batch.action_process_file()
+
+        self.assertEqual(self.intake_batch.import_cursor, 3)
+        self.assertEqual(self.intake_batch.created_students_count, 2)
+
+    def test_background_job_processes_batch(self):
+        """A queued job is processed by the cron and finishes the import."""
+        self.intake_batch.action_process_in_background()
+        job = self.intake_batch.processing_job_ids
+        self.assertEqual(job.state, 'pending')
+        self.assertEqual(self.intake_batch.processing_progress, 'in_progress')
+
+        self.env['gr.intake.batch.job']._cron_process_jobs()
+
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(self.intake_batch.state, 'processed')
+        self.assertEqual(self.intake_batch.import_cursor, 3)
+
+    def test_cancel_and_retry_job(self):
+        """Cancelled jobs are skipped by the cron and can be re-queued."""
+        self.intake_batch.action_process_in_background()
+        job = self.intake_batch.processing_job_ids
+        job.action_cancel()
+
+        self.env['gr.intake.batch.job']._cron_process_jobs()
+        self.assertEqual(job.state, 'cancelled')
+        self.assertEqual(self.intake_batch.import_cursor, 0)
+
+        job.action_retry()
+        self.assertEqual(job.state, 'pending')
+        self.env['gr.intake.batch.job']._cron_process_jobs()
+        self.assertEqual(job.state, 'done')
+
+    def test_duplicate_email_matches_case_insensitively(self):
+        """Emails differing only in case or whitespace match the same student."""
+        self.existing_student.email = '  JANE@Example.com '
+        self.assertEqual(self.existing_student.email_normalized, 'jane@example.com')
+
+        self.intake_batch.action_process_file()
+
+        self.assertEqual(self.intake_batch.updated_students_count, 1)
+        self.assertEqual(self.existing_student.name, 'Jane Smith')
+
+    def test_duplicate_policy_skip(self):
+        """With the skip policy existing students are left untouched."""
+        self.intake_batch.duplicate_policy = 'skip'
+
+        self.intake_batch.action_process_file()
+
+        self.assertEqual(self.intake_batch.updated_students_count, 0)
+        self.assertEqual(self.intake_batch.skipped_students_count, 1)
+        self.assertEqual(self.existing_student.name, 'Jane Old')
+
+    def test_duplicate_policy_flag(self):
+        """With the flag policy duplicates are listed in the failed records."""
+        self.intake_batch.duplicate_policy = 'flag'
+
+        self.intake_batch.action_process_file()
+
+        self.assertEqual(self.intake_batch.skipped_students_count, 1)
+        self.assertTrue(self.intake_batch.has_failed_records)
+        self.assertIn('jane@example.com', self.intake_batch.failed_records_data)
+
+    def test_find_existing_students_by_phone(self):
+        """Phone keys ignore formatting differences."""
+        self.existing_student.phone = '+966 50-123-4567'
+
+        matches = self.env['gr.student']._find_existing_students(phones=['966501234567'])
+
+        self.assertEqual(matches['phone'], {'966501234567': self.existing_student.id})
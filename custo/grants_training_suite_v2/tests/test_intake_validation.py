@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import datetime
+
+from odoo.tests.common import TransactionCase
+
+from ..utils import intake_validation
+
+
+class TestIntakeValidation(TransactionCase):
+
+    def setUp(self):
+        super(TestIntakeValidation, self).setUp()
+
+        self.records = [
+            {'name': 'John Doe', 'name_arabic': 'John Doe Arabic', 'name_english': 'John Doe',
+             'email': 'john@example.com', 'birth_date': '1990-01-15', 'gender': 'M',
+             'english_level': 'Advanced', 'has_certificate': 'yes', 'certificate_type': 'IELTS'},
+            {'name': 'John Doe', 'name_arabic': '', 'name_english': 'John Doe',
+             'email': 'JOHN@example.com', 'birth_date': '15/02/1992', 'gender': 'x'},
+            {'name': 'Jane Smith', 'name_arabic': 'Jane Smith Arabic', 'name_english': 'Jane Smith',
+             'email': 'jane-at-example', 'birth_date': '1992-13-40', 'has_certificate': 'true',
+             'certificate_date': '2020/01/01'},
+        ]
+
+    def test_error_bitmap_and_messages(self):
+        """Each rule sets its bit and produces the row message."""
+        result = intake_validation.IntakeValidator().validate(self.records)
+
+        self.assertEqual(result.errors[0], 0)
+        self.assertTrue(result.errors[1] & intake_validation.ERROR_MISSING_NAME_ARABIC)
+        self.assertTrue(result.errors[1] & intake_validation.ERROR_DUPLICATE_EMAIL)
+        self.assertTrue(result.errors[1] & intake_validation.ERROR_INVALID_GENDER)
+        self.assertTrue(result.warnings[1] & intake_validation.WARNING_DUPLICATE_NAME)
+        self.assertIn('Invalid email format "jane-at-example"', result.error_messages(2))
+        self.assertIn(
+            'Invalid certificate_date format "2020/01/01". Use YYYY-MM-DD format.', result.error_messages(2))
+
+    def test_typed_values(self):
+        """Valid values are coerced once and returned with the result."""
+        row = intake_validation.IntakeValidator().validate(self.records).typed_row(0)
+
+        self.assertEqual(row['birth_date'], datetime.date(1990, 1, 15))
+        self.assertEqual(row['gender'], 'male')
+        self.assertEqual(row['english_level'], 'advanced')
+        self.assertIs(row['has_certificate'], True)
+        self.assertFalse(row['certificate_date'])
+
+    def test_pandas_and_python_paths_agree(self):
+        """The pandas and pure-Python validators give the same result."""
+        if intake_validation.pd is None:
+            self.skipTest('pandas is not installed')
+        with_pandas = intake_validation.IntakeValidator(use_pandas=True).validate(self.records)
+        without_pandas = intake_validation.IntakeValidator(use_pandas=False).validate(self.records)
+
+        self.assertEqual(with_pandas.errors, without_pandas.errors)
+        self.assertEqual(with_pandas.warnings, without_pandas.warnings)
+        self.assertEqual(with_pandas.typed, without_pandas.typed)
+
+    def test_out_of_range_dates(self):
+        """Dates outside the pandas datetime range are parsed and only flagged as unusual."""
+        records = [
+            dict(self.records[0], email='future@example.com', birth_date='2999-01-01'),
+            dict(self.records[0], email='ancient@example.com', birth_date='0199-05-01'),
+        ]
+        for use_pandas in (True, False):
+            result = intake_validation.IntakeValidator(use_pandas=use_pandas).validate(records)
+
+            self.assertEqual(result.errors, [0, 0])
+            self.assertTrue(all(warning & intake_validation.WARNING_UNUSUAL_BIRTH_DATE for warning in result.warnings))
+            self.assertEqual(result.typed['birth_date'], [datetime.date(2999, 1, 1), datetime.date(199, 5, 1)])
+
+    def test_duplicates_across_chunks(self):
+        """Emails seen in an earlier chunk are reported as duplicates."""
+        validator = intake_validation.IntakeValidator()
+        validator.validate(self.records[:1])
+        result = validator.validate(self.records[1:2])
+
+        self.assertTrue(result.errors[0] & intake_validation.ERROR_DUPLICATE_EMAIL)
+
+    def test_validate_records_with_details(self):
+        """Batch validation keeps the row-numbered messages and failed records."""
+        batch = self.env['gr.intake.batch'].create({'name': 'Validation Batch', 'import_chunk_size': 2})
+
+        errors = batch._validate_records_with_details(self.records)
+
+        self.assertIn('Row 2: Missing required field "name_arabic"', errors)
+        self.assertIn('Row 3: Invalid email format "jane-at-example"', errors)
+        self.assertIn('Row 2: Duplicate name "John Doe" (may be intentional)', batch.validation_warnings)
+        self.assertIn('"row_number": 3', batch.failed_records_data)
+
+    def test_import_skips_invalid_rows(self):
+        """The import writes the typed values and reports rows that fail validation."""
+        csv_data = (
+            b"name,name_arabic,name_english,email,gender,birth_date\n"
+            b"John Doe,John Doe Arabic,John Doe,john@example.com,m,15/02/1992\n"
+            b"Bad Row,Bad Row Arabic,Bad Row,bad@example.com,unknown,\n"
+        )
+        batch = self.env['gr.intake.batch'].create({
+            'name': 'Typed Import Batch',
+            'filename': 'students.csv',
+            'file_data': base64.b64encode(csv_data),
+        })
+        batch.write({'state': 'validated', 'total_records': 2})
+
+        batch.action_process_file()
+
+        student = self.env['gr.student'].search([('email', '=', 'john@example.com')])
+        self.assertEqual(student.gender, 'male')
+        self.assertEqual(student.birth_date, datetime.date(1992, 2, 15))
+        self.assertEqual(batch.created_students_count, 1)
+        self.assertIn('Row 2: Invalid gender "unknown"', batch.import_errors)
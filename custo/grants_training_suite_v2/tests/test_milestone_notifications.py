@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+from ..models.notification_system import MAX_SEND_ATTEMPTS
+
+
+class TestMilestoneNotifications(TransactionCase):
+
+    def setUp(self):
+        super(TestMilestoneNotifications, self).setUp()
+
+        course = self.env['gr.course.integration'].create({
+            'name': 'Milestone Course',
+            'elearning_course_id': self.env['slide.channel'].create({
+                'name': 'Milestone eLearning',
+                'channel_type': 'training',
+            }).id,
+            'status': 'active',
+        })
+        students = self.env['gr.student'].create([{
+            'name': f'Milestone Student {index}',
+            'name_arabic': f'Milestone Student {index} Arabic',
+            'name_english': f'Milestone Student {index}',
+            'email': f'milestone.student{index}@example.com',
+        } for index in range(4)])
+        # Overall progress is 70% of the eLearning progress: 56%, 28%, 7% and 28%
+        self.trackers = self.env['gr.progress.tracker'].create([{
+            'student_id': student.id,
+            'course_integration_id': course.id,
+            'elearning_progress': progress,
+            'status': 'in_progress',
+        } for student, progress in zip(students, (80.0, 40.0, 10.0, 40.0))])
+        self.notification_model = self.env['gr.progress.notification']
+        for tracker, status in ((self.trackers[0], 'sent'), (self.trackers[3], 'draft')):
+            self.notification_model.create(dict(
+                self.notification_model._prepare_milestone_notification_vals(
+                    tracker, {'threshold': 25, 'type': '25_percent', 'message': 'Earlier milestone'}),
+                status=status,
+            ))
+
+    def test_new_milestones_are_created_in_bulk(self):
+        """Each tracker gets its first milestone not notified yet, pending notifications included."""
+        notifications = self.notification_model._create_milestone_notifications_bulk(self.trackers)
+
+        self.assertEqual(
+            {(notification.progress_tracker_id, notification.milestone_type) for notification in notifications},
+            {(self.trackers[0], '50_percent'), (self.trackers[1], '25_percent')})
+        self.assertTrue(all(notifications.mapped('send_queued')))
+        self.assertEqual(set(notifications.mapped('status')), {'draft'})
+
+        again = self.notification_model._create_milestone_notifications_bulk(self.trackers)
+        self.assertFalse(again)
+
+    def test_queued_notifications_are_sent_later(self):
+        """The sending cron sends the queued notifications; a failing one stays queued."""
+        notifications = self.notification_model._create_milestone_notifications_bulk(self.trackers)
+        failing = notifications.filtered(lambda n: n.progress_tracker_id == self.trackers[1])
+
+        def send_email(notification):
+            if notification == failing:
+                raise Exception('SMTP unavailable')
+
+        notification_class = type(self.notification_model)
+        with patch.object(notification_class, '_send_in_app_notification'), \
+                patch.object(notification_class, '_send_email_notification', autospec=True, side_effect=send_email):
+            self.notification_model._cron_send_queued_notifications()
+
+        self.assertEqual((notifications - failing).status, 'sent')
+        self.assertFalse((notifications - failing).send_queued)
+        self.assertEqual(failing.status, 'draft')
+        self.assertTrue(failing.send_queued)
+        self.assertEqual(failing.send_attempts, 1)
+
+    def test_failing_notification_gives_up(self):
+        """A notification failing on every run goes after the others, then fails and is created again."""
+        notifications = self.notification_model._create_milestone_notifications_bulk(self.trackers)
+        failing = notifications.filtered(lambda n: n.progress_tracker_id == self.trackers[1])
+        failing.send_attempts = 1
+
+        notification_class = type(self.notification_model)
+        with patch.object(notification_class, '_send_in_app_notification'), \
+                patch.object(notification_class, '_send_email_notification', side_effect=Exception('Bounced')):
+            self.notification_model._cron_send_queued_notifications(batch_size=1)
+            self.assertEqual(failing.send_attempts, 1)
+            for _attempt in range(MAX_SEND_ATTEMPTS):
+                self.notification_model._cron_send_queued_notifications()
+
+        self.assertEqual(failing.status, 'failed')
+        self.assertFalse(failing.send_queued)
+        self.assertEqual(failing.send_attempts, MAX_SEND_ATTEMPTS)
+
+        again = self.notification_model._create_milestone_notifications_bulk(self.trackers[1])
+        self.assertEqual(again.milestone_type, '25_percent')
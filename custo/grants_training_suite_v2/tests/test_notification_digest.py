@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestNotificationDigest(TransactionCase):
+
+    def setUp(self):
+        super(TestNotificationDigest, self).setUp()
+
+        self.env['ir.config_parameter'].sudo().set_param('grants_training_suite_v2.notification_digest_window', 60)
+        self.agent_user = self.env['res.users'].create({
+            'name': 'Digest Agent',
+            'login': 'digest.agent@example.com',
+            'email': 'digest.agent@example.com',
+        })
+        students = self.env['gr.student'].create([{
+            'name': f'Digest Student {index}',
+            'name_arabic': f'Digest Student {index} Arabic',
+            'name_english': f'Digest Student {index}',
+            'email': f'digest.student{index}@example.com',
+        } for index in range(3)])
+        self.notifications = self.env['gr.progress.notification'].create([{
+            'name': f'Progress Milestone - {student.name}',
+            'student_id': student.id,
+            'message': f'{student.name} reached 25%.',
+            'recipient_user_id': self.agent_user.id,
+            'recipient_email': 'digest.agent@example.com',
+        } for student in students])
+        self.digest_model = self.env['gr.notification.digest.entry']
+        self.outbox = self.env['gr.notification.outbox']
+
+    def _close_window(self, entries):
+        """Move the entries before the digest window."""
+        self.env.cr.execute('UPDATE gr_notification_digest_entry SET create_date = %s WHERE id IN %s',
+                            (fields.Datetime.now() - timedelta(hours=2), tuple(entries.ids)))
+        entries.invalidate_recordset(['create_date'])
+
+    def test_notifications_are_grouped_per_recipient(self):
+        """Events of one recipient are sent as one email and one activity once the window closes."""
+        self.notifications.action_send_notification()
+
+        entries = self.digest_model.search([('notification_id', 'in', self.notifications.ids)])
+        self.assertEqual(len(entries), 6)
+        self.assertFalse(self.outbox.search([('notification_id', 'in', self.notifications.ids)]))
+
+        self.digest_model._cron_send_digests()
+        self.assertEqual(set(entries.mapped('state')), {'pending'})
+
+        self._close_window(entries)
+        outbox_before = self.outbox.search([])
+        self.digest_model._cron_send_digests()
+
+        self.assertEqual(set(entries.mapped('state')), {'sent'})
+        items = self.outbox.search([]) - outbox_before
+        self.assertEqual(sorted(items.mapped('channel')), ['activity', 'email'])
+        mail = items.filtered(lambda item: item.channel == 'email').mail_id
+        self.assertEqual(mail.email_to, 'digest.agent@example.com')
+        self.assertEqual(mail.subject, '3 new notifications')
+        for notification in self.notifications:
+            self.assertIn(notification.message, mail.body_html)
+        activity = items.filtered(lambda item: item.channel == 'activity')
+        self.assertEqual(activity.payload['user_id'], self.agent_user.id)
+
+    def test_urgent_notifications_skip_the_digest(self):
+        """Urgent notifications are queued for sending right away."""
+        self.notifications[0].priority = 'urgent'
+        self.notifications[0].action_send_notification()
+
+        self.assertFalse(self.digest_model.search([('notification_id', '=', self.notifications[0].id)]))
+        self.assertTrue(self.outbox.search([('notification_id', '=', self.notifications[0].id)]))
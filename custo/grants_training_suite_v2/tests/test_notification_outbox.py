@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class LocalSmtp(object):
+    """SMTP stand-in recording the messages sent through each connection."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.connections = 0
+        self.sent = []
+
+    def connect(self, *args, **kwargs):
+        self.connections += 1
+        return self
+
+    def quit(self):
+        pass
+
+    def send_email(self, message, *args, **kwargs):
+        if message['To'] in self.failing:
+            raise Exception(f'Mailbox unavailable: {message["To"]}')
+        self.sent.append(message['To'])
+        return message['Message-Id']
+
+
+class TestNotificationOutbox(TransactionCase):
+
+    def setUp(self):
+        super(TestNotificationOutbox, self).setUp()
+
+        self.students = self.env['gr.student'].create([{
+            'name': f'Outbox Student {index}',
+            'name_arabic': f'Outbox Student {index} Arabic',
+            'name_english': f'Outbox Student {index}',
+            'email': f'outbox.student{index}@example.com',
+        } for index in range(3)])
+        self.notifications = self.env['gr.progress.notification'].create([{
+            'name': f'Outbox Notification {index}',
+            'student_id': student.id,
+            'notification_type': 'reminder',
+            'message': 'Please continue your course.',
+            'recipient_email': student.email,
+            'in_app_notification': False,
+        } for index, student in enumerate(self.students)])
+        self.outbox = self.env['gr.notification.outbox']
+        self.mail_server_class = type(self.env['ir.mail_server'])
+        self.connect_method = '_connect__' if hasattr(self.mail_server_class, '_connect__') else 'connect'
+
+    def _dispatch(self, smtp, **kwargs):
+        with patch.object(self.mail_server_class, self.connect_method, lambda server, *args, **kw: smtp.connect()), \
+                patch.object(self.mail_server_class, 'send_email',
+                             lambda server, message, *args, **kw: smtp.send_email(message)):
+            return self.outbox._cron_dispatch(**kwargs)
+
+    def test_sending_is_deferred_to_the_dispatcher(self):
+        """Notifications only queue their emails; the dispatcher sends them over one connection."""
+        smtp = LocalSmtp()
+        with patch.object(self.mail_server_class, 'send_email', side_effect=AssertionError('SMTP in transaction')):
+            self.notifications.action_send_notification()
+
+        items = self.outbox.search([('notification_id', 'in', self.notifications.ids)])
+        self.assertEqual(len(items), 3)
+        self.assertEqual(set(items.mapped('state')), {'pending'})
+        self.assertEqual(set(self.notifications.mapped('status')), {'sent'})
+
+        self._dispatch(smtp)
+
+        self.assertEqual(smtp.connections, 1)
+        self.assertEqual(sorted(smtp.sent), sorted(self.students.mapped('email')))
+        self.assertEqual(set(items.mapped('state')), {'sent'})
+        self.assertTrue(all(self.notifications.mapped('email_sent')))
+        stats = self.env['gr.notification.channel.stats'].search([('channel', '=', 'email')])
+        self.assertGreaterEqual(stats.sent_count, 3)
+        self.assertGreaterEqual(stats.batch_count, 1)
+
+    def test_mail_scheduler_leaves_queued_emails_to_the_dispatcher(self):
+        """The standard mail scheduler does not send the emails waiting in the outbox."""
+        self.notifications.action_send_notification()
+        items = self.outbox.search([('notification_id', 'in', self.notifications.ids)])
+
+        smtp = LocalSmtp()
+        with patch.object(self.mail_server_class, self.connect_method, lambda server, *args, **kw: smtp.connect()), \
+                patch.object(self.mail_server_class, 'send_email',
+                             lambda server, message, *args, **kw: smtp.send_email(message)):
+            self.env['mail.mail'].process_email_queue()
+
+        self.assertFalse(smtp.sent)
+        self.assertEqual(len(items.mail_id.exists()), 3)
+
+        self._dispatch(smtp)
+
+        self.assertEqual(len(smtp.sent), 3)
+        self.assertEqual(set(items.mapped('state')), {'sent'})
+
+    def test_failed_emails_are_retried_with_backoff(self):
+        """A failing email stays pending with a later attempt date, and is given up after the last attempt."""
+        self.notifications[0].action_send_notification()
+        item = self.outbox.search([('notification_id', '=', self.notifications[0].id)])
+
+        self._dispatch(LocalSmtp(failing=[self.students[0].email]))
+
+        self.assertEqual(item.state, 'pending')
+        self.assertEqual(item.attempt_count, 1)
+        self.assertIn('Mailbox unavailable', item.last_error)
+        self.assertGreater(item.next_attempt_date, fields.Datetime.now())
+
+        item.write({'attempt_count': 4, 'next_attempt_date': fields.Datetime.now()})
+        self._dispatch(LocalSmtp(failing=[self.students[0].email]))
+        self.assertEqual(item.state, 'failed')
+
+        item.action_retry()
+        self._dispatch(LocalSmtp())
+        self.assertEqual(item.state, 'sent')
+
+    def test_channel_rate_is_enforced(self):
+        """No more items than the channel rate are dispatched per minute."""
+        self.env['ir.config_parameter'].sudo().set_param('grants_training_suite_v2.notification_rate_email', 2)
+        self.notifications.action_send_notification()
+        items = self.outbox.search([('notification_id', 'in', self.notifications.ids)])
+
+        smtp = LocalSmtp()
+        self._dispatch(smtp)
+        self._dispatch(smtp)
+
+        self.assertEqual(len(smtp.sent), 2)
+        self.assertEqual(len(items.filtered(lambda item: item.state == 'pending')), 1)
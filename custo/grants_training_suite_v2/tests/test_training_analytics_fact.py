@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestTrainingAnalyticsFact(TransactionCase):
+
+    def setUp(self):
+        super(TestTrainingAnalyticsFact, self).setUp()
+
+        self.facts = self.env['gr.training.analytics.fact']
+        self.course = self.env['gr.course.integration'].create({
+            'name': 'Fact Course',
+            'elearning_course_id': self.env['slide.channel'].create({
+                'name': 'Fact eLearning',
+                'channel_type': 'training',
+            }).id,
+            'status': 'active',
+        })
+        self.student = self.env['gr.student'].create({
+            'name': 'Fact Student',
+            'name_arabic': 'Fact Student Arabic',
+            'name_english': 'Fact Student',
+            'email': 'fact.student@example.com',
+        })
+        self.tracker = self.env['gr.progress.tracker'].create({
+            'student_id': self.student.id,
+            'course_integration_id': self.course.id,
+            'elearning_progress': 10.0,
+            'status': 'in_progress',
+        })
+        self.facts._refresh_pending_days()
+
+    def _course_facts(self):
+        return self.facts.search([('fact_type', '=', 'tracker'), ('course_integration_id', '=', self.course.id)])
+
+    def test_writes_refresh_the_day(self):
+        """Tracker writes only mark their creation day; the facts follow on the next refresh."""
+        facts = self._course_facts()
+        self.assertEqual(facts.mapped('status'), ['in_progress'])
+        self.assertEqual(facts.progress_0_25, 1)
+
+        self.tracker.write({'status': 'completed', 'elearning_progress': 100.0})
+        self.assertEqual(self._course_facts().mapped('status'), ['in_progress'])
+        self.facts._flush_dirty_days()
+        self.assertTrue(self.env['gr.training.analytics.fact.dirty'].search([('fact_type', '=', 'tracker')]))
+
+        self.facts._refresh_pending_days()
+        self.assertFalse(self.env['gr.training.analytics.fact.dirty'].search([]))
+
+        facts = self._course_facts()
+        self.assertEqual(facts.mapped('status'), ['completed'])
+        self.assertEqual(facts.record_count, 1)
+        self.assertEqual(facts.progress_75_100, 1)
+        self.assertAlmostEqual(facts.progress_sum, self.tracker.overall_progress)
+
+    def test_reconciliation_repairs_facts(self):
+        """The nightly job counts the facts that drifted and rebuilds them."""
+        self._course_facts().unlink()
+
+        mismatches = self.facts._cron_reconcile_facts()
+
+        self.assertEqual(mismatches['tracker'], 1)
+        self.assertEqual(len(self._course_facts()), 1)
+        self.assertEqual(self.facts._count_mismatches('tracker'), 0)
+
+    def test_dashboard_data_for_any_window(self):
+        """get_dashboard_data answers arbitrary windows from the facts."""
+        today = fields.Date.today()
+        data = self.env['gr.training.dashboard'].get_dashboard_data(date_from=today, date_to=today)
+        students = self.facts.search([('fact_type', '=', 'student'), ('date', '=', today)])
+
+        self.assertEqual(data['kpi_metrics']['total_students'], sum(students.mapped('record_count')))
+        self.assertIn('Fact Course', [course['name'] for course in data['course_analytics']['course_performance']])
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestTrainingDashboardAnalytics(TransactionCase):
+
+    def setUp(self):
+        super(TestTrainingDashboardAnalytics, self).setUp()
+
+        self.courses = self.env['gr.course.integration'].create([{
+            'name': f'Dashboard Course {index}',
+            'elearning_course_id': self.env['slide.channel'].create({
+                'name': f'Dashboard eLearning {index}',
+                'channel_type': 'training',
+            }).id,
+            'status': 'active',
+        } for index in range(2)])
+        students = self.env['gr.student'].create([{
+            'name': f'Dashboard Student {index}',
+            'name_arabic': f'Dashboard Student {index} Arabic',
+            'name_english': f'Dashboard Student {index}',
+            'email': f'dashboard.student{index}@example.com',
+            'integration_status': status,
+        } for index, status in enumerate(('not_integrated', 'enrolled', 'completed', 'certified'))])
+        self.env['gr.progress.tracker'].create([{
+            'student_id': student.id,
+            'course_integration_id': course.id,
+            'elearning_progress': progress,
+            'status': status,
+        } for student, course, progress, status in (
+            (students[1], self.courses[0], 10.0, 'in_progress'),
+            (students[2], self.courses[0], 100.0, 'completed'),
+            (students[3], self.courses[0], 60.0, 'in_progress'),
+            (students[3], self.courses[1], 30.0, 'in_progress'),
+        )])
+        self.env['gr.training.analytics.fact']._refresh_pending_days()
+        self.dashboard = self.env['gr.training.dashboard'].create({
+            'name': 'Analytics Dashboard',
+            'date_from': fields.Date.today() - timedelta(days=1),
+            'date_to': fields.Date.today() + timedelta(days=1),
+        })
+
+    def _window(self, model, domain=()):
+        return self.env[model].search([
+            ('create_date', '>=', self.dashboard.date_from),
+            ('create_date', '<', self.dashboard.date_to + timedelta(days=1)),
+        ] + list(domain))
+
+    def test_kpi_and_integration_metrics(self):
+        """Student counts come from the daily facts and match the records in the window."""
+        students = self._window('gr.student')
+        completed = students.filtered(lambda s: s.integration_status in ('completed', 'certified'))
+
+        self.assertEqual(self.dashboard.total_students, len(students))
+        self.assertEqual(self.dashboard.enrolled_students,
+                         len(students.filtered(lambda s: s.integration_status != 'not_integrated')))
+        self.assertEqual(self.dashboard.completed_students, len(completed))
+        self.assertAlmostEqual(self.dashboard.completion_rate, len(completed) / len(students) * 100)
+        self.assertEqual(self.dashboard.total_enrollments, len(self._window('gr.progress.tracker')))
+        self.assertEqual(self.dashboard.integration_status_summary['certified'],
+                         len(students.filtered(lambda s: s.integration_status == 'certified')))
+
+    def test_progress_and_course_analytics(self):
+        """Progress buckets and per-course statistics are read from the daily facts."""
+        trackers = self._window('gr.progress.tracker')
+        distribution = self.dashboard.progress_distribution
+        self.assertEqual(sum(distribution.values()), len(trackers))
+        self.assertEqual(distribution.get('0-25%'), len(trackers.filtered(lambda t: t.overall_progress < 25)))
+        self.assertEqual(sum(self.dashboard.monthly_enrollments.values()), len(trackers))
+
+        course_trackers = trackers.filtered(lambda t: t.course_integration_id == self.courses[0])
+        course_performance = {course['name']: course for course in self.dashboard.course_performance}
+        first_course = course_performance['Dashboard Course 0']
+        self.assertEqual(first_course['enrollments'], 3)
+        self.assertAlmostEqual(first_course['avg_progress'], sum(course_trackers.mapped('overall_progress')) / 3)
+        self.assertAlmostEqual(first_course['completion_rate'], 100 / 3)
+        self.assertEqual(course_performance['Dashboard Course 1']['enrollments'], 1)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import json
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestTrainingDashboardPayload(TransactionCase):
+
+    def setUp(self):
+        super(TestTrainingDashboardPayload, self).setUp()
+
+        self.env['gr.student'].create({
+            'name': 'Payload Student',
+            'name_arabic': 'Payload Student Arabic',
+            'name_english': 'Payload Student',
+            'email': 'payload.student@example.com',
+            'integration_status': 'completed',
+        })
+        self.env['gr.training.analytics.fact']._refresh_pending_days()
+        self.dashboard = self.env['gr.training.dashboard'].create({
+            'name': 'Payload Dashboard',
+            'date_from': fields.Date.today() - timedelta(days=1),
+            'date_to': fields.Date.today() + timedelta(days=1),
+            'last_update': fields.Datetime.now() - timedelta(hours=1),
+        })
+
+    def test_payload_contains_native_values(self):
+        """The analytics are stored and returned as JSON values, not as strings."""
+        self.assertIsInstance(self.dashboard.integration_status_summary, dict)
+        self.assertEqual(self.dashboard.integration_status_summary.get('completed'), 1)
+
+        data = self.env['gr.training.dashboard'].get_dashboard_data(self.dashboard.id)
+        self.assertIsInstance(data['progress_analytics']['progress_distribution'], dict)
+        self.assertEqual(data['integration_analytics']['integration_status_summary'],
+                         self.dashboard.integration_status_summary)
+
+    def test_serialized_payload_is_cached_until_update(self):
+        """The payload is serialised once per last update; a new window changes its ETag."""
+        etag, payload = self.dashboard._get_serialized_payload()
+        self.assertEqual(json.loads(payload)['kpi_metrics']['completed_students'], 1)
+
+        self.dashboard.payload_json = '{"cached": true}'
+        self.assertEqual(self.dashboard._get_serialized_payload(), (etag, '{"cached": true}'))
+
+        self.dashboard.date_from = fields.Date.today() - timedelta(days=7)
+        new_etag, payload = self.dashboard._get_serialized_payload()
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn('kpi_metrics', json.loads(payload))
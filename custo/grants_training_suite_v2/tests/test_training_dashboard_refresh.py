@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestTrainingDashboardRefresh(TransactionCase):
+
+    def setUp(self):
+        super(TestTrainingDashboardRefresh, self).setUp()
+
+        self.course = self.env['gr.course.integration'].create({
+            'name': 'Refresh Course',
+            'elearning_course_id': self.env['slide.channel'].create({
+                'name': 'Refresh eLearning',
+                'channel_type': 'training',
+            }).id,
+            'status': 'active',
+        })
+        self.student = self.env['gr.student'].create({
+            'name': 'Refresh Student',
+            'name_arabic': 'Refresh Student Arabic',
+            'name_english': 'Refresh Student',
+            'email': 'refresh.student@example.com',
+            'integration_status': 'enrolled',
+        })
+        self._end_transaction()
+        # The setup changes are older than the dashboards
+        self.env['gr.training.dashboard.change'].search([]).logged_at = fields.Datetime.now() - timedelta(hours=1)
+
+        today = fields.Date.today()
+        self.current = self.env['gr.training.dashboard'].create({
+            'name': 'Current Dashboard',
+            'date_from': today - timedelta(days=1),
+            'date_to': today + timedelta(days=1),
+        })
+        self.past = self.env['gr.training.dashboard'].create({
+            'name': 'Past Dashboard',
+            'date_from': today - timedelta(days=60),
+            'date_to': today - timedelta(days=30),
+        })
+
+    def _end_transaction(self):
+        """Run the precommit hooks that maintain the facts and the change log."""
+        self.env['gr.training.analytics.fact']._refresh_pending_days()
+        self.env['gr.training.dashboard.change']._flush_pending_changes()
+
+    def test_only_affected_sections_are_refreshed(self):
+        """A student change refreshes its sections of the dashboards whose window holds it."""
+        self.student.integration_status = 'completed'
+        self._end_transaction()
+
+        self.env['gr.training.dashboard'].refresh_all_dashboards()
+
+        self.assertEqual(set(self.current.section_timings), {'kpi', 'progress', 'student', 'integration'})
+        self.assertEqual(self.current.completed_students, 1)
+        self.assertEqual(set(self.past.section_timings), {'student'})
+        watermark = self.env['gr.training.dashboard.change']._get_watermark()
+        self.assertEqual(self.current.change_watermark, watermark)
+        self.assertEqual(self.past.change_watermark, watermark)
+
+    def test_unchanged_dashboards_are_skipped(self):
+        """Without logged changes the cron leaves the dashboards and their payload alone."""
+        last_update = fields.Datetime.now() - timedelta(hours=1)
+        self.current.last_update = last_update
+
+        self.env['gr.training.dashboard'].refresh_all_dashboards()
+
+        self.assertEqual(self.current.last_update, last_update)
+        self.assertFalse(self.current.section_timings)
+
+    def test_course_change_reaches_every_window(self):
+        """Course integration changes are not tied to a day and refresh the course sections everywhere."""
+        self.course.name = 'Renamed Refresh Course'
+        self._end_transaction()
+
+        self.env['gr.training.dashboard'].refresh_all_dashboards()
+
+        for dashboard in self.current | self.past:
+            self.assertEqual(set(dashboard.section_timings), {'kpi', 'course'})
+
+    def test_late_commit_is_read_again(self):
+        """A change logged before the last refresh but committed after it is still picked up."""
+        self.env['gr.training.dashboard'].refresh_all_dashboards()
+        self.current.section_timings = False
+
+        # Logged by a transaction that started before the refresh and committed after it
+        self.env['gr.training.dashboard.change'].create({
+            'source': 'course',
+            'logged_at': self.current.change_watermark - timedelta(minutes=1),
+        })
+        self.env['gr.training.dashboard'].refresh_all_dashboards()
+
+        self.assertEqual(set(self.current.section_timings), {'kpi', 'course'})
+
+    def test_purge_keeps_recent_changes(self):
+        """Purging keeps the changes a late commit may still be read with."""
+        change_log = self.env['gr.training.dashboard.change']
+        watermark = change_log._get_watermark()
+        recent = change_log.create({'source': 'course', 'logged_at': watermark - timedelta(minutes=1)})
+        old = change_log.create({'source': 'course', 'logged_at': watermark - timedelta(hours=1)})
+
+        change_log._purge_changes(watermark)
+
+        self.assertTrue(recent.exists())
+        self.assertFalse(old.exists())
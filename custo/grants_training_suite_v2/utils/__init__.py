@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+# Plain Python helpers shared by the models (no ORM dependencies)
+from . import intake_reader
+from . import intake_validation
+from . import certificate_rendering
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Compiled certificate templates.
+
+A template text is parsed once into a render plan: the literal segments and
+the ``{placeholder}`` slots between them, following ``str.format`` syntax. The
+HTML/CSS shell wrapped around a certificate is compiled the same way per
+template style, so rendering a certificate only substitutes slot values.
+"""
+
+import string
+
+from markupsafe import Markup, escape
+
+_formatter = string.Formatter()
+
+# Marker used to cut the formatted shell around its slots
+_SLOT_MARK = '\x00'
+
+# Slots of the document shell, filled per certificate
+SHELL_SLOTS = ('name', 'header', 'body', 'footer')
+
+# Document shell; style values are filled at compile time, slots per certificate
+CERTIFICATE_SHELL = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <title>Certificate - {name}</title>
+            <style>
+                @page {{
+                    size: {page_width}in {page_height}in;
+                    margin: {margin_top}in {margin_right}in {margin_bottom}in {margin_left}in;
+                }}
+                body {{
+                    font-family: {font_family}, sans-serif;
+                    background-color: {background_color};
+                    color: {text_color};
+                    margin: 0;
+                    padding: 0;
+                    line-height: 1.6;
+                }}
+                .certificate-container {{
+                    width: 100%;
+                    height: 100%;
+                    position: relative;
+                    display: flex;
+                    flex-direction: column;
+                    justify-content: space-between;
+                }}
+                .certificate-header {{
+                    flex: 0 0 auto;
+                }}
+                .certificate-body {{
+                    flex: 1;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                }}
+                .certificate-footer {{
+                    flex: 0 0 auto;
+                }}
+                .accent {{
+                    color: {accent_color};
+                }}
+                h1, h2, h3 {{
+                    margin: 0;
+                }}
+                p {{
+                    margin: 0;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="certificate-container">
+                <div class="certificate-header">
+                    {header}
+                </div>
+                <div class="certificate-body">
+                    {body}
+                </div>
+                <div class="certificate-footer">
+                    {footer}
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+
+class CompiledTemplate(object):
+    """Literal segments interleaved with placeholder slots.
+
+    ``segments`` has one more item than ``slots``. Each slot is a tuple
+    ``(field_name, conversion, format_spec)``. Templates compiled from
+    ``Markup`` escape the slot values, like ``Markup.format`` does.
+    """
+
+    __slots__ = ('segments', 'slots', 'markup')
+
+    def __init__(self, segments, slots, markup=False):
+        self.segments = tuple(segments)
+        self.slots = tuple(slots)
+        self.markup = markup
+
+    def render(self, context):
+        """Substitute the slot values taken from ``context``."""
+        parts = [self.segments[0]]
+        for (field_name, conversion, format_spec), segment in zip(self.slots, self.segments[1:]):
+            if field_name in context:
+                value = context[field_name]
+            else:
+                value = _formatter.get_field(field_name, (), context)[0]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            if '{' in format_spec:
+                format_spec = _formatter.vformat(format_spec, (), context)
+            value = format(value, format_spec)
+            parts.append(escape(value) if self.markup else value)
+            parts.append(segment)
+        result = ''.join(parts)
+        return Markup(result) if self.markup else result
+
+
+def compile_template(text):
+    """Parse a ``str.format`` template into a :class:`CompiledTemplate`."""
+    if not text:
+        return CompiledTemplate([''], [], isinstance(text, Markup))
+    segments = []
+    slots = []
+    literal = []
+    for literal_text, field_name, format_spec, conversion in _formatter.parse(text):
+        literal.append(literal_text)
+        if field_name is None:
+            continue
+        segments.append(''.join(literal))
+        slots.append((field_name, conversion, format_spec or ''))
+        literal = []
+    segments.append(''.join(literal))
+    return CompiledTemplate(segments, slots, isinstance(text, Markup))
+
+
+def compile_certificate_shell(style):
+    """Build the document shell of a template style, keeping the :data:`SHELL_SLOTS` open."""
+    markers = {slot: f'{_SLOT_MARK}{slot}{_SLOT_MARK}' for slot in SHELL_SLOTS}
+    parts = CERTIFICATE_SHELL.format(**style, **markers).split(_SLOT_MARK)
+    return CompiledTemplate(parts[0::2], [(slot, None, '') for slot in parts[1::2]])
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Streaming readers for intake batch files.
+
+The readers in this module never build the full list of rows: they yield one
+row at a time from a binary stream so that large CSV/XLSX files can be imported
+chunk by chunk with a bounded memory footprint.
+
+A parsed file can also be written once to a compact columnar cache (gzip
+compressed JSON lines, one line per chunk of rows holding one list per column)
+and read back with ``iter_columnar_records`` without parsing the original
+spreadsheet again.
+"""
+
+import csv
+import datetime
+import gzip
+import io
+import itertools
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Format version of the columnar cache and number of rows per cached chunk
+COLUMNAR_VERSION = 1
+COLUMNAR_CHUNK_SIZE = 5000
+
+
+def normalize_cell(value):
+    """Convert a spreadsheet cell value to the string form used by the importer."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, datetime.datetime):
+        if value.time() == datetime.time(0, 0):
+            return value.strftime('%Y-%m-%d')
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, datetime.date):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ''
+        if value.is_integer():
+            return str(int(value))
+    return str(value).strip()
+
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """Yield the header row and then every data row of a CSV byte stream."""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding=encoding, newline=''))
+    for row in reader:
+        yield [normalize_cell(cell) for cell in row]
+
+
+def iter_xlsx_rows(stream):
+    """Yield rows of the first worksheet of an .xlsx stream using openpyxl read-only mode."""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError('Excel .xlsx files require the openpyxl library. Please install: pip install openpyxl')
+
+    workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        for row in worksheet.iter_rows(values_only=True):
+            yield [normalize_cell(cell) for cell in row]
+    finally:
+        workbook.close()
+
+
+def iter_xls_rows(stream):
+    """Yield rows of the first sheet of a legacy .xls stream using xlrd."""
+    try:
+        import xlrd
+    except ImportError:
+        raise ImportError('Excel .xls files require the xlrd library. Please install: pip install xlrd')
+
+    workbook = xlrd.open_workbook(file_contents=stream.read(), on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        for row_idx in range(sheet.nrows):
+            yield [normalize_cell(value) for value in sheet.row_values(row_idx)]
+    finally:
+        workbook.release_resources()
+
+
+def iter_file_rows(stream, filename):
+    """Dispatch to the right row reader based on the file extension."""
+    filename_lower = (filename or '').lower()
+    if filename_lower.endswith('.csv'):
+        return iter_csv_rows(stream)
+    if filename_lower.endswith('.xlsx'):
+        return iter_xlsx_rows(stream)
+    if filename_lower.endswith('.xls'):
+        return iter_xls_rows(stream)
+    raise ValueError('Unsupported file type: %s' % filename)
+
+
+def iter_table(stream, filename):
+    """Return the (stripped) header row and an iterator over the data rows.
+
+    Fully empty rows are skipped, like ``csv.DictReader`` and pandas do, and
+    every data row is padded or cut to the width of the header row.
+    """
+    rows = iter_file_rows(stream, filename)
+    headers = [header.strip() for header in next(rows, None) or []]
+    if not headers:
+        return headers, iter(())
+    return headers, _iter_data_rows(rows, len(headers))
+
+
+def _iter_data_rows(rows, width):
+    for row in rows:
+        if not any(row):
+            continue
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        yield row[:width]
+
+
+def iter_records(stream, filename):
+    """Yield one dict per data row, keyed by the header row."""
+    headers, rows = iter_table(stream, filename)
+    for row in rows:
+        yield dict(zip(headers, row))
+
+
+def write_columnar_cache(stream, filename, fileobj, chunk_size=COLUMNAR_CHUNK_SIZE):
+    """Parse a file once and write its rows to ``fileobj`` as a columnar cache.
+
+    :return: tuple (header row, number of data rows written)
+    """
+    headers, rows = iter_table(stream, filename)
+    row_count = 0
+    with gzip.GzipFile(fileobj=fileobj, mode='wb') as archive:
+        archive.write(_json_line({'version': COLUMNAR_VERSION, 'headers': headers}))
+        for chunk in chunked(rows, chunk_size):
+            archive.write(_json_line([list(column) for column in zip(*chunk)]))
+            row_count += len(chunk)
+    return headers, row_count
+
+
+def iter_columnar_records(fileobj):
+    """Yield one dict per row from a cache written by ``write_columnar_cache``."""
+    with gzip.GzipFile(fileobj=fileobj, mode='rb') as archive:
+        header = json.loads(archive.readline() or b'{}')
+        if header.get('version') != COLUMNAR_VERSION:
+            raise ValueError('Unsupported parsed file cache version: %s' % header.get('version'))
+        headers = header['headers']
+        for line in archive:
+            for values in zip(*json.loads(line)):
+                yield dict(zip(headers, values))
+
+
+def _json_line(data):
+    return (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def chunked(iterable, size):
+    """Split an iterable into lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
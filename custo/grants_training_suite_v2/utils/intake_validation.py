@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""Columnar validation and type coercion of intake rows.
+
+Rows are turned into one list per field and every rule is applied to a whole
+column at once (with pandas/NumPy when installed, plain Python otherwise). The
+result is a per-row bitmap of errors and warnings together with the typed
+values (dates, booleans, selection keys) that the import writes directly, so a
+row never has to be parsed a second time.
+"""
+
+import datetime
+import logging
+import re
+
+from .intake_reader import normalize_cell
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+# Fields read from the file, in the order they are reported
+FIELDS = (
+    'name', 'name_arabic', 'name_english', 'email', 'phone', 'birth_date', 'gender',
+    'nationality', 'native_language', 'english_level', 'has_certificate',
+    'certificate_type', 'certificate_date', 'national_id',
+)
+TEXT_FIELDS = (
+    'name', 'name_arabic', 'name_english', 'phone', 'nationality', 'native_language',
+    'certificate_type', 'national_id',
+)
+
+BIRTH_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y')
+CERTIFICATE_DATE_FORMATS = ('%Y-%m-%d',)
+GENDERS = {'male': 'male', 'm': 'male', 'female': 'female', 'f': 'female'}
+ENGLISH_LEVELS = ('beginner', 'elementary', 'intermediate', 'upper_intermediate', 'advanced')
+BOOLEANS = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+# Error bits (the row cannot be imported)
+ERROR_MISSING_NAME = 1 << 0
+ERROR_MISSING_NAME_ARABIC = 1 << 1
+ERROR_MISSING_NAME_ENGLISH = 1 << 2
+ERROR_MISSING_EMAIL = 1 << 3
+ERROR_INVALID_EMAIL = 1 << 4
+ERROR_DUPLICATE_EMAIL = 1 << 5
+ERROR_INVALID_BIRTH_DATE = 1 << 6
+ERROR_INVALID_GENDER = 1 << 7
+ERROR_INVALID_ENGLISH_LEVEL = 1 << 8
+ERROR_INVALID_HAS_CERTIFICATE = 1 << 9
+ERROR_INVALID_CERTIFICATE_DATE = 1 << 10
+
+# Warning bits (reported only)
+WARNING_DUPLICATE_NAME = 1 << 0
+WARNING_NO_CERTIFICATE_DETAILS = 1 << 1
+WARNING_UNUSUAL_BIRTH_DATE = 1 << 2
+
+MISSING_FIELD_ERRORS = (
+    ('name', ERROR_MISSING_NAME),
+    ('name_arabic', ERROR_MISSING_NAME_ARABIC),
+    ('name_english', ERROR_MISSING_NAME_ENGLISH),
+    ('email', ERROR_MISSING_EMAIL),
+)
+
+
+def records_to_columns(records):
+    """Transpose row dicts into one list of normalised strings per field."""
+    return {
+        field: [normalize_cell(record.get(field)) for record in records]
+        for field in FIELDS
+    }
+
+
+class ValidationResult(object):
+    """Outcome of validating one chunk of rows."""
+
+    def __init__(self, columns, typed, errors, warnings):
+        self.columns = columns
+        self.typed = typed
+        self.errors = errors
+        self.warnings = warnings
+
+    def __len__(self):
+        return len(self.errors)
+
+    def is_valid(self, index):
+        return not self.errors[index]
+
+    def typed_row(self, index):
+        """Return the coerced values of one row, keyed by field name."""
+        return {field: values[index] for field, values in self.typed.items()}
+
+    def error_messages(self, index, ignore=0):
+        """Return the error messages of one row, in the order the rules are applied.
+
+        :param ignore: error bits to leave out of the messages
+        """
+        bits = self.errors[index] & ~ignore
+        if not bits:
+            return []
+        value = lambda field: self.columns[field][index]
+        messages = [
+            f'Missing required field "{field}"'
+            for field, bit in MISSING_FIELD_ERRORS if bits & bit
+        ]
+        if bits & ERROR_INVALID_EMAIL:
+            messages.append(f'Invalid email format "{value("email")}"')
+        if bits & ERROR_DUPLICATE_EMAIL:
+            messages.append(f'Duplicate email address "{value("email")}"')
+        if bits & ERROR_INVALID_BIRTH_DATE:
+            messages.append(f'Invalid date format for birth_date "{value("birth_date")}". Use YYYY-MM-DD format.')
+        if bits & ERROR_INVALID_GENDER:
+            messages.append(f'Invalid gender "{value("gender")}". Use "male", "female", "m", or "f".')
+        if bits & ERROR_INVALID_ENGLISH_LEVEL:
+            messages.append(f'Invalid english_level "{value("english_level")}". Valid options: {", ".join(ENGLISH_LEVELS)}')
+        if bits & ERROR_INVALID_HAS_CERTIFICATE:
+            messages.append(f'Invalid has_certificate value "{value("has_certificate")}". Use "true"/"false" or "yes"/"no".')
+        if bits & ERROR_INVALID_CERTIFICATE_DATE:
+            messages.append(f'Invalid certificate_date format "{value("certificate_date")}". Use YYYY-MM-DD format.')
+        return messages
+
+    def warning_messages(self, index):
+        """Return the warning messages of one row."""
+        bits = self.warnings[index]
+        messages = []
+        if bits & WARNING_DUPLICATE_NAME:
+            messages.append(f'Duplicate name "{self.columns["name"][index]}" (may be intentional)')
+        if bits & WARNING_NO_CERTIFICATE_DETAILS:
+            messages.append('Has certificate is true but no certificate details provided')
+        if bits & WARNING_UNUSUAL_BIRTH_DATE:
+            messages.append(f'Birth date "{self.columns["birth_date"][index]}" seems unusual')
+        return messages
+
+
+class IntakeValidator(object):
+    """Validate intake rows chunk by chunk.
+
+    The validator keeps the emails and names seen in earlier chunks, so
+    duplicates are detected across the whole file while only one chunk is
+    held in memory.
+    """
+
+    def __init__(self, use_pandas=None, today=None):
+        self.use_pandas = pd is not None if use_pandas is None else bool(use_pandas and pd is not None)
+        self.today = today or datetime.date.today()
+        self.seen_emails = set()
+        self.seen_names = set()
+
+    def validate(self, records):
+        """Validate a list of row dicts and return a :class:`ValidationResult`."""
+        columns = records_to_columns(records)
+        if not records:
+            return ValidationResult(columns, {field: [] for field in FIELDS}, [], [])
+        if self.use_pandas:
+            errors, warnings, typed = self._validate_frame(columns)
+        else:
+            errors, warnings, typed = self._validate_lists(columns)
+        for field in TEXT_FIELDS:
+            typed[field] = [value or False for value in columns[field]]
+        return ValidationResult(columns, typed, errors, warnings)
+
+    # ===== PANDAS / NUMPY =====
+
+    def _validate_frame(self, columns):
+        frame = pd.DataFrame(columns, dtype=object)
+        errors = np.zeros(len(frame), dtype=np.int64)
+        warnings = np.zeros(len(frame), dtype=np.int64)
+        flag = lambda array, mask, bit: np.bitwise_or(array, np.where(mask.to_numpy(dtype=bool), bit, 0), out=array)
+
+        for field, bit in MISSING_FIELD_ERRORS:
+            flag(errors, frame[field].eq(''), bit)
+
+        email = frame['email']
+        email_lower = email.str.lower()
+        valid_email = email.str.match(EMAIL_PATTERN).fillna(False).astype(bool)
+        flag(errors, email.ne('') & ~valid_email, ERROR_INVALID_EMAIL)
+        duplicate_email = valid_email & (
+            email_lower.where(valid_email).duplicated() | email_lower.isin(self.seen_emails))
+        flag(errors, duplicate_email, ERROR_DUPLICATE_EMAIL)
+        self.seen_emails.update(email_lower[valid_email])
+
+        name = frame['name']
+        has_name = name.ne('')
+        flag(warnings, has_name & (name.where(has_name).duplicated() | name.isin(self.seen_names)), WARNING_DUPLICATE_NAME)
+        self.seen_names.update(name[has_name])
+
+        birth_date, invalid_birth_date = self._parse_date_series(frame['birth_date'], BIRTH_DATE_FORMATS)
+        flag(errors, invalid_birth_date, ERROR_INVALID_BIRTH_DATE)
+        birth_year = birth_date.map(lambda value: value.year if value else 0)
+        flag(warnings, birth_year.ne(0) & ((birth_year < 1900) | (birth_year > self.today.year)),
+             WARNING_UNUSUAL_BIRTH_DATE)
+
+        gender = frame['gender'].str.lower().map(GENDERS)
+        flag(errors, frame['gender'].ne('') & gender.isna(), ERROR_INVALID_GENDER)
+
+        english_level = frame['english_level'].str.lower()
+        valid_level = english_level.isin(ENGLISH_LEVELS)
+        flag(errors, english_level.ne('') & ~valid_level, ERROR_INVALID_ENGLISH_LEVEL)
+
+        has_certificate = frame['has_certificate'].str.lower().map(BOOLEANS)
+        flag(errors, frame['has_certificate'].ne('') & has_certificate.isna(), ERROR_INVALID_HAS_CERTIFICATE)
+        certified = has_certificate.eq(True)
+
+        certificate_date, invalid_certificate_date = self._parse_date_series(
+            frame['certificate_date'], CERTIFICATE_DATE_FORMATS)
+        flag(warnings, certified & frame['certificate_type'].eq('') & frame['certificate_date'].eq(''),
+             WARNING_NO_CERTIFICATE_DETAILS)
+        flag(errors, certified & invalid_certificate_date, ERROR_INVALID_CERTIFICATE_DATE)
+
+        typed = {
+            'email': email.where(email.ne(''), False).tolist(),
+            'birth_date': birth_date.tolist(),
+            'gender': gender.where(gender.notna(), False).tolist(),
+            'english_level': english_level.where(valid_level, False).tolist(),
+            'has_certificate': certified.tolist(),
+            'certificate_date': certificate_date.tolist(),
+        }
+        return errors.tolist(), warnings.tolist(), typed
+
+    @classmethod
+    def _parse_date_series(cls, values, formats):
+        """Parse a column trying each format on the values still unparsed.
+
+        Values left unparsed, such as dates outside the range of ``datetime64``
+        (e.g. ``2999-01-01``), go through the pure-Python parser, so both
+        paths accept the same dates.
+
+        :return: tuple (series of dates with False for empty/invalid values, mask of invalid values)
+        """
+        parsed = pd.Series(False, index=values.index, dtype=object)
+        pending = values.ne('')
+        for date_format in formats:
+            if not pending.any():
+                break
+            converted = pd.to_datetime(values[pending], format=date_format, errors='coerce')
+            found = converted.index[converted.notna()]
+            parsed[found] = converted[found].dt.date
+            pending[found] = False
+        if pending.any():
+            unparsed = pending.index[pending]
+            fallback = cls._parse_date_list(values[unparsed].tolist(), formats)
+            parsed[unparsed] = fallback
+            pending[unparsed] = [not value for value in fallback]
+        return parsed, pending
+
+    # ===== PURE PYTHON FALLBACK =====
+
+    def _validate_lists(self, columns):
+        count = len(columns['email'])
+        errors = [0] * count
+        warnings = [0] * count
+
+        def flag(array, mask, bit):
+            for index, hit in enumerate(mask):
+                if hit:
+                    array[index] |= bit
+
+        for field, bit in MISSING_FIELD_ERRORS:
+            flag(errors, [not value for value in columns[field]], bit)
+
+        email = columns['email']
+        valid_email = [bool(EMAIL_RE.match(value)) for value in email]
+        flag(errors, [value and not valid for value, valid in zip(email, valid_email)], ERROR_INVALID_EMAIL)
+        flag(errors, self._mark_duplicates(
+            [value.lower() if valid else None for value, valid in zip(email, valid_email)],
+            self.seen_emails), ERROR_DUPLICATE_EMAIL)
+
+        flag(warnings, self._mark_duplicates(
+            [value or None for value in columns['name']], self.seen_names), WARNING_DUPLICATE_NAME)
+
+        birth_date = self._parse_date_list(columns['birth_date'], BIRTH_DATE_FORMATS)
+        flag(errors, [value and not parsed for value, parsed in zip(columns['birth_date'], birth_date)],
+             ERROR_INVALID_BIRTH_DATE)
+        flag(warnings, [parsed and (parsed.year < 1900 or parsed.year > self.today.year) for parsed in birth_date],
+             WARNING_UNUSUAL_BIRTH_DATE)
+
+        gender = [GENDERS.get(value.lower(), False) for value in columns['gender']]
+        flag(errors, [value and not coerced for value, coerced in zip(columns['gender'], gender)],
+             ERROR_INVALID_GENDER)
+
+        english_level = [value.lower() if value.lower() in ENGLISH_LEVELS else False
+                         for value in columns['english_level']]
+        flag(errors, [value and not coerced for value, coerced in zip(columns['english_level'], english_level)],
+             ERROR_INVALID_ENGLISH_LEVEL)
+
+        has_certificate = [BOOLEANS.get(value.lower()) for value in columns['has_certificate']]
+        flag(errors, [value and coerced is None for value, coerced in zip(columns['has_certificate'], has_certificate)],
+             ERROR_INVALID_HAS_CERTIFICATE)
+        certified = [coerced is True for coerced in has_certificate]
+
+        certificate_date = self._parse_date_list(columns['certificate_date'], CERTIFICATE_DATE_FORMATS)
+        flag(warnings, [is_certified and not cert_type and not cert_date for is_certified, cert_type, cert_date
+                        in zip(certified, columns['certificate_type'], columns['certificate_date'])],
+             WARNING_NO_CERTIFICATE_DETAILS)
+        flag(errors, [is_certified and value and not parsed for is_certified, value, parsed
+                      in zip(certified, columns['certificate_date'], certificate_date)],
+             ERROR_INVALID_CERTIFICATE_DATE)
+
+        typed = {
+            'email': [value or False for value in email],
+            'birth_date': birth_date,
+            'gender': gender,
+            'english_level': english_level,
+            'has_certificate': certified,
+            'certificate_date': certificate_date,
+        }
+        return errors, warnings, typed
+
+    @staticmethod
+    def _mark_duplicates(keys, seen):
+        """Flag keys already seen in this column or in earlier chunks (``None`` keys are ignored)."""
+        mask = []
+        for key in keys:
+            mask.append(key is not None and key in seen)
+            if key is not None:
+                seen.add(key)
+        return mask
+
+    @staticmethod
+    def _parse_date_list(values, formats):
+        """Parse a column of date strings, parsing each distinct value only once."""
+        cache = {'': False}
+        parsed = []
+        for value in values:
+            if value not in cache:
+                cache[value] = False
+                for date_format in formats:
+                    try:
+                        cache[value] = datetime.datetime.strptime(value, date_format).date()
+                        break
+                    except ValueError:
+                        continue
+            parsed.append(cache[value])
+        return parsed
@@ -29,9 +29,10 @@ class AlumniBulkEmailWizard(models.TransientModel):
             'email_from': self.env.user.email or self.env.company.email,
         })
         
+        # Queue the emails; the mail scheduler sends them over a shared SMTP connection
         for alumni in self.alumni_ids:
             if alumni.email:
-                mail_template.send_mail(alumni.id, force_send=True)
+                mail_template.send_mail(alumni.id)
         
         return {
             'type': 'ir.actions.client',
@@ -20,7 +20,7 @@
 
 {
     'name': 'NELC xAPI Admission Integration',
-    'version': '19.0.2.0.0',
+    'version': '19.0.2.2.0',
     'license': 'LGPL-3',
     'category': 'Education',
     'sequence': 10,
@@ -36,7 +36,9 @@ Features:
 - NELC tracking fields on op.admission (sent flag, UUID, last error)
 - Backend-only HTTP client using Python requests / urllib
 - Credentials managed via environment variables → ir.config_parameter
-- Non-blocking: failures are logged but do not interrupt the student flow
+- Non-blocking: statements are queued in the event log and delivered by a
+  background sender with retries, exponential backoff and a circuit breaker
+- Rate-limited backfill of the xAPI journeys of historical admissions
 
 Configuration:
 Set the following environment variables on Odoo.sh (or copy .env.example):
@@ -58,6 +60,8 @@ Set the following environment variables on Odoo.sh (or copy .env.example):
     'data': [
         'security/ir.model.access.csv',
         'data/nelc_config_init.xml',
+        'data/ir_cron_data.xml',
+        'data/ir_sequence_data.xml',
     ],
     'post_init_hook': 'post_init_hook',
     'installable': True,
@@ -1,2 +1,7 @@
 from . import op_admission_nelc
+from . import nelc_xapi_config
 from . import nelc_xapi_event_log
+from . import nelc_xapi_sequence_state
+from . import nelc_xapi_pool_stats
+from . import nelc_xapi_circuit
+from . import nelc_xapi_backfill
@@ -0,0 +1,297 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - historical backfill
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools.safe_eval import safe_eval
+
+from ..services.nelc_xapi_client import queue_event_journeys
+
+_logger = logging.getLogger(__name__)
+
+# Admissions handled per chunk
+CHUNK_SIZE = 50
+
+# Default number of statements queued per minute
+RATE_LIMIT = 600
+
+# Chunks handled per run at most, whatever their outcome
+MAX_CHUNKS_PER_RUN = 20
+
+# Admissions simulated by a dry run
+DRY_RUN_LIMIT = 100
+
+# Rejections kept on the backfill for review
+REJECTION_LOG_LIMIT = 50
+
+# Progress milestones of the admission journey, in order, with the values the portal reports
+_PROGRESS_STEPS = [
+    ('submit', 0.20),
+    ('pending', 0.35),
+    ('confirm', 0.50),
+    ('paid', 0.60),
+    ('admission', 0.80),
+    ('done', 1.0),
+]
+
+_OUTCOMES = ('queued', 'requeued', 'duplicate', 'rejected')
+
+
+class NelcXapiBackfill(models.Model):
+    """Replay of the xAPI journeys of existing admissions.
+
+    Selects admissions by domain and application date, derives the events
+    each one went through (registered, initialized, progressed up to its
+    current state, earned) and queues the missing statements in chunks for
+    the background sender, at most ``rate_limit`` statements per minute.
+    The checkpoint is the last admission handled; a cancelled backfill
+    resumes after it.
+    """
+
+    _name = 'nelc.xapi.backfill'
+    _description = 'NELC xAPI Backfill'
+    _order = 'id desc'
+
+    name = fields.Char(default='New', required=True, copy=False)
+    admission_domain = fields.Char(default="[('state', 'not in', ('draft', 'cancel'))]", required=True)
+    date_from = fields.Date(help='First application date included')
+    date_to = fields.Date(help='Last application date included')
+
+    state = fields.Selection(
+        [
+            ('draft', 'Draft'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('cancelled', 'Cancelled'),
+        ],
+        default='draft',
+        required=True,
+        readonly=True,
+    )
+    rate_limit = fields.Integer(string='Statements per Minute', default=RATE_LIMIT, required=True)
+    chunk_size = fields.Integer(string='Admissions per Chunk', default=CHUNK_SIZE, required=True)
+
+    last_admission_id = fields.Integer(string='Checkpoint', readonly=True, copy=False,
+                                       help='Last admission handled; the backfill resumes after it')
+    admission_count = fields.Integer(string='Admissions', readonly=True, copy=False)
+    processed_count = fields.Integer(string='Processed', readonly=True, copy=False)
+    queued_count = fields.Integer(string='Queued', readonly=True, copy=False)
+    requeued_count = fields.Integer(string='Requeued', readonly=True, copy=False)
+    duplicate_count = fields.Integer(string='Duplicates', readonly=True, copy=False)
+    rejected_count = fields.Integer(string='Rejected', readonly=True, copy=False)
+    rejection_log = fields.Text(readonly=True, copy=False)
+
+    started_at = fields.Datetime(readonly=True, copy=False)
+    finished_at = fields.Datetime(readonly=True, copy=False)
+
+    dry_run_report = fields.Text(readonly=True, copy=False)
+    dry_run_at = fields.Datetime(readonly=True, copy=False)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        seq = self.env['ir.sequence']
+        for vals in vals_list:
+            if vals.get('name', 'New') == 'New':
+                vals['name'] = seq.next_by_code('nelc.xapi.backfill') or 'New'
+        return super().create(vals_list)
+
+    # ------------------------------------------------------------------ #
+    #  Journeys                                                            #
+    # ------------------------------------------------------------------ #
+
+    def _get_admission_domain(self):
+        """Domain of the admissions selected by the backfill."""
+        self.ensure_one()
+        domain = list(safe_eval(self.admission_domain or '[]'))
+        if self.date_from:
+            domain.append(('application_date', '>=', fields.Datetime.to_datetime(self.date_from)))
+        if self.date_to:
+            domain.append(('application_date', '<', fields.Datetime.to_datetime(self.date_to + timedelta(days=1))))
+        return domain
+
+    @api.model
+    def _get_progress_steps(self, admission):
+        """Progress values *admission* went through, in journey order."""
+        paid = getattr(admission, 'payment_status', '') == 'paid'
+        steps = dict(_PROGRESS_STEPS)
+        reached = max(steps.get(admission.state, 0.0), steps['paid'] if paid else 0.0)
+        return [value for step, value in _PROGRESS_STEPS if value <= reached and (step != 'paid' or paid)]
+
+    @api.model
+    def _get_earned_event_data(self, admission):
+        """Event data of the ``earned`` statement of *admission*, ``None`` without certificate.
+
+        Admissions carry no certificate; modules issuing them override this.
+        """
+        return None
+
+    @api.model
+    def _get_journey(self, admission):
+        """Ordered ``(event_type, event_data)`` events of *admission*."""
+        events = [('registered', None), ('initialized', None)]
+        events += [('progressed', {'progress_scaled': value}) for value in self._get_progress_steps(admission)]
+        earned_data = self._get_earned_event_data(admission)
+        if earned_data:
+            events.append(('earned', earned_data))
+        return events
+
+    @api.model
+    def _queue_journeys(self, admissions):
+        """Queue the journeys of *admissions*; returns ``(result, event_data)`` per event."""
+        journeys = [(admission, self._get_journey(admission)) for admission in admissions]
+        results = queue_event_journeys(self.env, journeys)
+        registered = [
+            result for result in results
+            if result['event_type'] == 'registered' and result['outcome'] in ('queued', 'requeued')
+        ]
+        for result in registered:
+            result['admission'].sudo().write({
+                'x_nelc_registered_sent': True,
+                'x_nelc_registered_uuid': result['uuid'],
+                'x_nelc_registered_last_error': False,
+            })
+        event_data = [data for _admission, events in journeys for _event_type, data in events]
+        return list(zip(results, event_data))
+
+    @api.model
+    def _describe_event(self, result, event_data):
+        """One report line for the outcome of an event."""
+        label = result['event_type']
+        if result['event_type'] == 'progressed':
+            label = f"{label} {event_data['progress_scaled']:.2f}"
+        outcome = result['outcome']
+        if result['error']:
+            outcome = f"{outcome} ({result['error']})"
+        return f'{label}: {outcome}'
+
+    # ------------------------------------------------------------------ #
+    #  Actions                                                             #
+    # ------------------------------------------------------------------ #
+
+    def action_dry_run(self):
+        """Report what the backfill would queue, without queuing anything."""
+        Admission = self.env['op.admission']
+        for backfill in self:
+            domain = backfill._get_admission_domain() + [('id', '>', backfill.last_admission_id)]
+            admission_count = Admission.search_count(domain)
+            admissions = Admission.search(domain, order='id', limit=DRY_RUN_LIMIT)
+            with self.env.cr.savepoint() as savepoint:
+                events = self._queue_journeys(admissions)
+                # Nothing of the simulation is kept
+                savepoint.rollback()
+            self.env.invalidate_all()
+
+            counts = Counter(result['outcome'] for result, _data in events)
+            lines = [
+                _('Admissions selected: %(count)s, simulated: %(simulated)s',
+                  count=admission_count, simulated=len(admissions)),
+                _('Statements: %(queued)s to queue, %(requeued)s to queue again, '
+                  '%(duplicate)s already queued or sent, %(rejected)s rejected',
+                  **{outcome: counts[outcome] for outcome in _OUTCOMES}),
+            ]
+            for admission in admissions:
+                lines += ['', admission.display_name]
+                lines += [
+                    f'  {self._describe_event(result, data)}'
+                    for result, data in events if result['admission'] == admission
+                ]
+            backfill.write({
+                'dry_run_report': '\n'.join(lines),
+                'dry_run_at': fields.Datetime.now(),
+                'admission_count': admission_count,
+            })
+        return True
+
+    def action_start(self):
+        """Start the backfill, or resume it after its checkpoint."""
+        for backfill in self:
+            if backfill.state not in ('draft', 'cancelled'):
+                raise UserError(_('Only draft or cancelled backfills can be started.'))
+            backfill.write({
+                'state': 'running',
+                'started_at': backfill.started_at or fields.Datetime.now(),
+                'admission_count': self.env['op.admission'].search_count(backfill._get_admission_domain()),
+            })
+        self._trigger_run()
+        return True
+
+    def action_cancel(self):
+        """Stop the backfill at its checkpoint."""
+        for backfill in self:
+            if backfill.state != 'running':
+                raise UserError(_('Only running backfills can be cancelled.'))
+        self.write({'state': 'cancelled'})
+        return True
+
+    # ------------------------------------------------------------------ #
+    #  Background run                                                      #
+    # ------------------------------------------------------------------ #
+
+    @api.model
+    def _trigger_run(self, at=None):
+        """Wake up the backfill runner instead of waiting for its next run."""
+        cron = self.env.ref('nelc_xapi_admission.ir_cron_run_xapi_backfills', raise_if_not_found=False)
+        if cron:
+            cron._trigger(at)
+
+    @api.model
+    def _cron_run(self):
+        """Process the running backfills, one minute of statements each.
+
+        Re-triggers itself a minute later while admissions remain.
+        """
+        remaining = False
+        for backfill in self.search([('state', '=', 'running')], order='id'):
+            remaining = backfill._run_minute() or remaining
+        if remaining:
+            self._trigger_run(fields.Datetime.now() + timedelta(minutes=1))
+
+    def _run_minute(self):
+        """Queue the journeys of the next admissions until ``rate_limit`` statements are queued.
+
+        The chunk that reaches the limit is completed. A run also stops after
+        ``MAX_CHUNKS_PER_RUN`` chunks, so chunks of duplicates or rejected
+        statements cannot keep one transaction busy with the whole selection.
+        The checkpoint moves with each chunk and is committed with its
+        statements. Returns whether admissions remain.
+        """
+        self.ensure_one()
+        Admission = self.env['op.admission']
+        domain = self._get_admission_domain()
+        budget = self.rate_limit or RATE_LIMIT
+        for _chunk in range(MAX_CHUNKS_PER_RUN):
+            if budget <= 0:
+                break
+            admissions = Admission.search(
+                domain + [('id', '>', self.last_admission_id)], order='id', limit=self.chunk_size or CHUNK_SIZE)
+            if not admissions:
+                self.write({'state': 'done', 'finished_at': fields.Datetime.now()})
+                _logger.info('nelc_xapi: backfill %s done, %d statements queued', self.name, self.queued_count)
+                return False
+
+            events = self._queue_journeys(admissions)
+            counts = Counter(result['outcome'] for result, _data in events)
+            rejections = [
+                f'{result["admission"].display_name} - {self._describe_event(result, data)}'
+                for result, data in events if result['outcome'] == 'rejected'
+            ]
+            rejection_log = (self.rejection_log or '').splitlines() + rejections
+            self.write({
+                'last_admission_id': admissions[-1].id,
+                'processed_count': self.processed_count + len(admissions),
+                'queued_count': self.queued_count + counts['queued'],
+                'requeued_count': self.requeued_count + counts['requeued'],
+                'duplicate_count': self.duplicate_count + counts['duplicate'],
+                'rejected_count': self.rejected_count + counts['rejected'],
+                'rejection_log': '\n'.join(rejection_log[-REJECTION_LOG_LIMIT:]),
+            })
+            budget -= counts['queued'] + counts['requeued']
+        return True
@@ -0,0 +1,41 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - LRS circuit breaker
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+from odoo import api, fields, models
+
+
+class NelcXapiCircuit(models.Model):
+    """State of the circuit breaker of the background sender, kept in a single row.
+
+    Kept out of ``ir.config_parameter``, whose writes clear the caches of
+    every worker.
+    """
+
+    _name = 'nelc.xapi.circuit'
+    _description = 'NELC xAPI LRS Circuit Breaker'
+
+    name = fields.Char(default='LRS Circuit Breaker', required=True)
+    failures = fields.Integer(string='Consecutive Failures', readonly=True)
+    open_until = fields.Datetime(readonly=True, help='Sending is postponed until then; empty when closed')
+
+    @api.model
+    def _get_circuit(self):
+        """Return the circuit breaker row, created on first use."""
+        return self.sudo().search([], limit=1) or self.sudo().create({})
+
+    @api.model
+    def _get_state(self):
+        """Return ``(consecutive_failures, open_until)``."""
+        circuit = self._get_circuit()
+        return circuit.failures, circuit.open_until or None
+
+    @api.model
+    def _set_state(self, failures, open_until=None):
+        """Store the state; no ``open_until`` closes the circuit."""
+        circuit = self._get_circuit()
+        if (circuit.failures, circuit.open_until or None) != (failures, open_until):
+            circuit.write({'failures': failures, 'open_until': open_until or False})
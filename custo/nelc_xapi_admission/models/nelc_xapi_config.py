@@ -0,0 +1,67 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - cached configuration
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+import re
+from collections import namedtuple
+
+from odoo import api, models, tools
+
+from ..services.nelc_xapi_client import _strip_html
+
+LrsConfig = namedtuple('LrsConfig', [
+    'endpoint', 'auth_header', 'platform_key', 'base_url', 'pool_size', 'batch_size',
+])
+
+CourseMetadata = namedtuple('CourseMetadata', ['slug', 'name', 'description'])
+
+_SLUG_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
+
+class NelcXapiConfig(models.AbstractModel):
+    """Cached snapshot of the NELC xAPI parameters and course metadata.
+
+    The snapshot lives in the registry cache: it is dropped in every worker
+    when a system parameter changes, and explicitly when the console applies
+    its settings.
+    """
+
+    _name = 'nelc.xapi.config'
+    _description = 'NELC xAPI Configuration Cache'
+
+    @api.model
+    @tools.ormcache()
+    def _get_snapshot(self):
+        """Return the NELC parameters as an ``LrsConfig``."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        return LrsConfig(
+            endpoint=(ICP.get_param('nelc.lrs.endpoint', '') or '').strip(),
+            auth_header=(ICP.get_param('nelc.lrs.auth_header', '') or '').strip(),
+            platform_key=ICP.get_param('nelc.platform_key', 'odoo-platform'),
+            base_url=(ICP.get_param('web.base.url', 'https://example.com') or '').rstrip('/'),
+            pool_size=int(ICP.get_param('nelc.lrs.pool_size', 0) or 0) or None,
+            batch_size=int(ICP.get_param('nelc.lrs.batch_size', 0) or 0) or None,
+        )
+
+    @api.model
+    @tools.ormcache('course_id', 'write_date', 'self.env.lang')
+    def _get_course_metadata(self, course_id, write_date):
+        """Return the slug, name and plain-text description of a course as ``CourseMetadata``.
+
+        Keyed on the course ``write_date``: any change to the course yields a
+        new entry.
+        """
+        course = self.env['op.course'].sudo().browse(course_id)
+        return CourseMetadata(
+            slug=_SLUG_RE.sub('-', course.name or str(course.id)).strip('-').lower(),
+            name=course.name or '',
+            description=_strip_html(getattr(course, 'description', '') or ''),
+        )
+
+    @api.model
+    def _invalidate_snapshot(self):
+        """Drop the cached snapshot and course metadata in all workers."""
+        self.env.registry.clear_cache()
@@ -5,11 +5,44 @@
 #
 ###############################################################################
 
-from odoo import fields, models
+import json
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+from ..services.nelc_lrs_pool import pop_pool_metrics
+from ..services.nelc_xapi_client import _get_lrs_config, _get_lrs_pool_size, _post_statement, _post_statements
+
+_logger = logging.getLogger(__name__)
+
+# Statements handled per sender run
+SEND_BATCH_SIZE = 500
+
+# Default number of statements per LRS request
+POST_BATCH_SIZE = 50
+
+# Delivery attempts before a statement is given up
+MAX_ATTEMPTS = 8
+
+# Delay before the first retry (seconds), doubled on each further attempt, and its ceiling
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 6 * 3600
+
+# Consecutive LRS failures opening the circuit, and how long it stays open (seconds)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_DELAY = 300
+
+# Admissions whose sequence state is rebuilt after the commit
+_REBUILD_ADMISSIONS_KEY = 'nelc_xapi.rebuild_admission_ids'
 
 
 class NelcXapiEventLog(models.Model):
-    """Persistent ledger for xAPI event deduplication and audit."""
+    """Persistent ledger and outbox of xAPI events.
+
+    Statements are created ``pending`` by the client service and delivered to
+    the LRS by ``_cron_send_pending``, in creation order per admission.
+    """
 
     _name = 'nelc.xapi.event.log'
     _description = 'NELC xAPI Event Log'
@@ -48,7 +81,250 @@ class NelcXapiEventLog(models.Model):
     sent_at = fields.Datetime()
     error_message = fields.Text()
 
+    attempt_count = fields.Integer(default=0, readonly=True)
+    next_attempt_at = fields.Datetime(default=fields.Datetime.now, index=True)
+
     _sql_constraints = [
         ('nelc_xapi_event_log_statement_uuid_uniq', 'unique(statement_uuid)', 'Statement UUID must be unique.'),
         ('nelc_xapi_event_log_dedup_key_uniq', 'unique(dedup_key)', 'Duplicate xAPI event is not allowed.'),
     ]
+
+
+    # ------------------------------------------------------------------ #
+    #  Outbox                                                              #
+    # ------------------------------------------------------------------ #
+
+    @api.model
+    def _trigger_sending(self, at=None):
+        """Wake up the sender instead of waiting for its next run."""
+        cron = self.env.ref('nelc_xapi_admission.ir_cron_send_xapi_statements', raise_if_not_found=False)
+        if cron:
+            cron._trigger(at)
+
+    def action_retry(self):
+        """Queue failed statements again."""
+        failed = self.filtered(lambda log: log.status == 'failed')
+        failed.write({
+            'status': 'pending',
+            'attempt_count': 0,
+            'next_attempt_at': fields.Datetime.now(),
+        })
+        if failed.admission_id:
+            self.env['nelc.xapi.sequence.state']._rebuild(failed.admission_id.ids)
+        self._trigger_sending()
+        return True
+
+    def _rebuild_states_after_commit(self):
+        """Rebuild the sequence states of the admissions of these logs once the transaction commits.
+
+        The sender keeps its transaction open for the whole run; rebuilding in
+        a separate short transaction after it spares the portal events of
+        these admissions from waiting for the state locks until then.
+        """
+        admission_ids = self.env.cr.postcommit.data.setdefault(_REBUILD_ADMISSIONS_KEY, set())
+        if not admission_ids:
+            self.env.cr.postcommit.add(self._rebuild_pending_states)
+        admission_ids.update(self.admission_id.ids)
+
+    @api.model
+    def _rebuild_pending_states(self):
+        """Post-commit hook rebuilding the states queued by ``_rebuild_states_after_commit``."""
+        admission_ids = self.env.cr.postcommit.data.pop(_REBUILD_ADMISSIONS_KEY, None)
+        if not admission_ids:
+            return
+        with self.env.registry.cursor() as cr:
+            self.env(cr=cr)['nelc.xapi.sequence.state'].sudo()._rebuild(sorted(admission_ids))
+
+    @api.model
+    def _get_circuit_state(self):
+        """Return ``(consecutive_failures, open_until)`` of the LRS circuit breaker."""
+        return self.env['nelc.xapi.circuit']._get_state()
+
+    @api.model
+    def _set_circuit_state(self, failures, open_until=None):
+        """Store the LRS circuit breaker state; no ``open_until`` closes the circuit."""
+        self.env['nelc.xapi.circuit']._set_state(failures, open_until)
+
+    @api.model
+    def _get_post_batch_size(self):
+        """Statements per LRS request, configurable through a system parameter."""
+        return max(1, self.env['nelc.xapi.config']._get_snapshot().batch_size or POST_BATCH_SIZE)
+
+    @api.model
+    def _cron_send_pending(self, batch_size=None):
+        """Deliver due pending statements to the LRS.
+
+        Statements are posted in multi-statement requests of
+        ``_get_post_batch_size()`` items, in creation order, so the statements
+        of an admission keep their order; one waiting for a retry holds back
+        the later ones. Transport errors and LRS outages are retried with
+        exponential backoff; after ``CIRCUIT_FAILURE_THRESHOLD`` consecutive
+        ones the circuit opens and nothing is posted for
+        ``CIRCUIT_OPEN_DELAY`` seconds, then a single request probes the LRS.
+        Statements rejected by the LRS fail at once.
+        """
+        now = fields.Datetime.now()
+        failures, open_until = self._get_circuit_state()
+        if open_until and open_until > now:
+            _logger.info('nelc_xapi: LRS circuit open until %s, sending postponed', open_until)
+            self._trigger_sending(open_until)
+            return 0
+
+        endpoint, auth_header = _get_lrs_config(self.env)
+        if not endpoint or not auth_header:
+            _logger.warning('nelc_xapi: LRS not configured, %d statements left pending',
+                            self.search_count([('status', '=', 'pending')]))
+            return 0
+
+        batch_size = batch_size or SEND_BATCH_SIZE
+        post_size = self._get_post_batch_size()
+        pool_size = _get_lrs_pool_size(self.env)
+        due = self.search([('status', '=', 'pending'), ('next_attempt_at', '<=', now)], order='id', limit=batch_size)
+        # Oldest statement waiting for a retry, per admission
+        held_from = {
+            admission.id: first_id
+            for admission, first_id in self._read_group(
+                [('status', '=', 'pending'), ('next_attempt_at', '>', now), ('admission_id', 'in', due.admission_id.ids)],
+                ['admission_id'], ['id:min'])
+        }
+
+        initial_failures = failures
+        sent = 0
+        requests_count = 0
+        circuit_opened = False
+        batch = self.browse()
+        for index, log in enumerate(due):
+            admission_id = log.admission_id.id
+            if not (admission_id and held_from.get(admission_id, log.id + 1) < log.id):
+                batch |= log
+            if len(batch) < post_size and index < len(due) - 1:
+                continue
+            if not batch:
+                break
+            batch_sent, batch_requests, reachable = batch._send_batch(endpoint, auth_header, held_from, pool_size)
+            sent += batch_sent
+            requests_count += batch_requests
+            batch = self.browse()
+            if reachable:
+                failures = 0
+                continue
+            failures += 1
+            if failures >= CIRCUIT_FAILURE_THRESHOLD:
+                circuit_opened = True
+                break
+
+        self.env['nelc.xapi.pool.stats'].sudo()._record_metrics(pop_pool_metrics())
+        if circuit_opened:
+            open_until = now + timedelta(seconds=CIRCUIT_OPEN_DELAY)
+            _logger.warning('nelc_xapi: %d consecutive LRS failures, circuit open until %s', failures, open_until)
+            self._set_circuit_state(failures, open_until)
+            self._trigger_sending(open_until)
+            return sent
+        if failures != initial_failures or open_until:
+            self._set_circuit_state(failures)
+
+        if len(due) == batch_size:
+            self._trigger_sending()
+        else:
+            # Wake up for the earliest retry
+            retry = self.search([('status', '=', 'pending'), ('next_attempt_at', '>', now)],
+                                order='next_attempt_at', limit=1)
+            if retry:
+                self._trigger_sending(retry.next_attempt_at)
+        _logger.info('nelc_xapi: %d of %d due statements delivered to the LRS in %d requests',
+                     sent, len(due), requests_count)
+        return sent
+
+    def _send_batch(self, endpoint, auth_header, held_from, pool_size=None):
+        """Post the statements in one request, then one by one if the LRS rejects the batch.
+
+        ``held_from`` receives the admissions whose statements must wait for a
+        retry. Returns ``(sent, requests, reachable)``: the delivered
+        statements, the LRS requests made and whether the LRS answered the
+        last one.
+        """
+        success, response_uuids, error_msg, retryable = _post_statements(
+            endpoint, auth_header, [json.loads(log.payload_json) for log in self], pool_size=pool_size)
+        if success:
+            for log, response_uuid in zip(self, response_uuids):
+                log._mark_sent(response_uuid)
+            return len(self), 1, True
+        if retryable or len(self) == 1:
+            for log in self:
+                log._mark_failed(error_msg, retryable)
+                if log.status == 'pending':
+                    log._hold(held_from)
+            return 0, 1, not retryable
+
+        # One or more statements are invalid: isolate them
+        _logger.warning('nelc_xapi: LRS rejected a batch of %d statements, sending them one by one - %s',
+                        len(self), error_msg)
+        sent = 0
+        requests_count = 1
+        for log in self:
+            admission_id = log.admission_id.id
+            if admission_id and held_from.get(admission_id, log.id + 1) < log.id:
+                continue
+            success, response_uuid, error_msg, retryable = _post_statement(
+                endpoint, auth_header, json.loads(log.payload_json), pool_size=pool_size)
+            requests_count += 1
+            if success:
+                log._mark_sent(response_uuid)
+                sent += 1
+                continue
+            log._mark_failed(error_msg, retryable)
+            if log.status == 'pending':
+                log._hold(held_from)
+            if retryable:
+                # The LRS went away: the rest waits for the next run
+                for rest in self.filtered(lambda rest: rest.id > log.id):
+                    rest._hold(held_from)
+                return sent, requests_count, False
+        return sent, requests_count, True
+
+    def _hold(self, held_from):
+        """Hold back the later statements of the admission in this run."""
+        if self.admission_id:
+            held_from[self.admission_id.id] = min(held_from.get(self.admission_id.id, self.id), self.id)
+
+    def _mark_sent(self, response_uuid):
+        """Record the delivery of the statement."""
+        self.ensure_one()
+        self.write({
+            'status': 'sent',
+            'response_uuid': response_uuid or self.statement_uuid,
+            'sent_at': fields.Datetime.now(),
+            'attempt_count': self.attempt_count + 1,
+            'error_message': False,
+        })
+        if self.event_type == 'registered' and self.admission_id:
+            self.admission_id.write({
+                'x_nelc_registered_uuid': self.response_uuid,
+                'x_nelc_registered_last_error': False,
+            })
+        _logger.info('nelc_xapi: statement %s accepted by LRS (response uuid: %s)',
+                     self.statement_uuid, self.response_uuid)
+
+    def _mark_failed(self, error_msg, retryable):
+        """Schedule the retry of the statement, or give it up."""
+        self.ensure_one()
+        attempts = self.attempt_count + 1
+        vals = {'attempt_count': attempts, 'error_message': error_msg}
+        if retryable and attempts < MAX_ATTEMPTS:
+            delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+            vals['next_attempt_at'] = fields.Datetime.now() + timedelta(seconds=delay)
+            _logger.warning('nelc_xapi: statement %s failed (attempt %d), retry in %ss - %s',
+                            self.statement_uuid, attempts, delay, error_msg)
+        else:
+            vals['status'] = 'failed'
+            _logger.error('nelc_xapi: statement %s given up after %d attempts - %s',
+                          self.statement_uuid, attempts, error_msg)
+        self.write(vals)
+        if self.status == 'failed' and self.admission_id:
+            # The statement no longer counts for the sequence rules
+            self._rebuild_states_after_commit()
+        if self.status == 'failed' and self.event_type == 'registered' and self.admission_id:
+            self.admission_id.write({
+                'x_nelc_registered_sent': False,
+                'x_nelc_registered_last_error': (error_msg or '')[:500],
+            })
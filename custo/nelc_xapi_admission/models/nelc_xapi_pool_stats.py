@@ -0,0 +1,74 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - LRS connection pool statistics
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+from odoo import api, fields, models
+
+from ..services.nelc_lrs_pool import latency_bucket_labels
+
+
+class NelcXapiPoolStats(models.Model):
+    """Cumulated metrics of the keep-alive LRS sessions of all workers."""
+
+    _name = 'nelc.xapi.pool.stats'
+    _description = 'NELC xAPI LRS Connection Pool Statistics'
+
+    name = fields.Char(default='LRS Connection Pool', required=True)
+
+    requests_count = fields.Integer(string='Requests', readonly=True)
+    connections_opened = fields.Integer(string='Connections Opened', readonly=True)
+    connections_reused = fields.Integer(string='Connections Reused', readonly=True)
+    reuse_rate = fields.Float(string='Reuse Rate (%)', compute='_compute_rates')
+    total_latency = fields.Float(string='Total Latency (s)', readonly=True)
+    avg_latency = fields.Float(string='Average Latency (s)', compute='_compute_rates')
+    latency_histogram = fields.Json(string='Latency Histogram', readonly=True)
+    latency_histogram_display = fields.Text(string='Latency Histogram', compute='_compute_latency_histogram_display')
+    last_update = fields.Datetime(readonly=True)
+
+    @api.depends('requests_count', 'connections_reused', 'total_latency')
+    def _compute_rates(self):
+        for stats in self:
+            stats.reuse_rate = stats.connections_reused * 100.0 / stats.requests_count if stats.requests_count else 0.0
+            stats.avg_latency = stats.total_latency / stats.requests_count if stats.requests_count else 0.0
+
+    @api.depends('latency_histogram')
+    def _compute_latency_histogram_display(self):
+        for stats in self:
+            histogram = stats.latency_histogram or {}
+            stats.latency_histogram_display = '\n'.join(
+                f'{label}: {histogram.get(label, 0)}' for label in latency_bucket_labels()
+            )
+
+    @api.model
+    def _record_metrics(self, metrics):
+        """Add the metrics popped from the pool of this process to the totals."""
+        if not metrics.get('requests'):
+            return self.browse()
+        stats = self.search([], limit=1) or self.create({})
+        histogram = dict(stats.latency_histogram or {})
+        for label, count in metrics['latency_histogram'].items():
+            histogram[label] = histogram.get(label, 0) + count
+        stats.write({
+            'requests_count': stats.requests_count + metrics['requests'],
+            'connections_opened': stats.connections_opened + metrics['connections_opened'],
+            'connections_reused': stats.connections_reused + metrics['connections_reused'],
+            'total_latency': stats.total_latency + metrics['total_latency'],
+            'latency_histogram': histogram,
+            'last_update': fields.Datetime.now(),
+        })
+        return stats
+
+    def action_reset(self):
+        """Start counting from zero."""
+        self.write({
+            'requests_count': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'total_latency': 0.0,
+            'latency_histogram': {},
+            'last_update': fields.Datetime.now(),
+        })
+        return True
@@ -0,0 +1,137 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - per-admission sequence state
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+import json
+
+from odoo import api, fields, models
+
+from ..services.nelc_xapi_client import _ACCEPTED_STATUSES, _parse_xapi_timestamp
+
+_ATTEMPT_ID_EXTENSION = 'http://id.tincanapi.com/extension/attempt-id'
+
+
+class NelcXapiSequenceState(models.Model):
+    """Sequence state of the xAPI events of an admission.
+
+    Holds what the sequence rules need from the previous events, so that the
+    checks read one row instead of searching the event log and parsing the
+    stored payloads. Timestamps are kept to the second.
+    """
+
+    _name = 'nelc.xapi.sequence.state'
+    _description = 'NELC xAPI Sequence State'
+
+    admission_id = fields.Many2one('op.admission', string='Admission', required=True, ondelete='cascade')
+    next_sequence_index = fields.Integer(default=1, required=True)
+    registered_at = fields.Datetime(help='Timestamp of the registered statement, once queued or sent')
+    last_progress_scaled = fields.Float(digits=(16, 6))
+    last_progress_at = fields.Datetime(help='Timestamp of the latest progressed statement')
+    attempt_ids = fields.One2many('nelc.xapi.sequence.attempt', 'state_id', string='Attempts')
+
+    _sql_constraints = [
+        ('nelc_xapi_sequence_state_admission_uniq', 'unique(admission_id)', 'One sequence state per admission.'),
+    ]
+
+    def init(self):
+        """Build the states of the admissions logged before the states existed."""
+        self.env.cr.execute('SELECT 1 FROM nelc_xapi_sequence_state LIMIT 1')
+        if not self.env.cr.fetchone():
+            self.env.cr.execute('SELECT DISTINCT admission_id FROM nelc_xapi_event_log WHERE admission_id IS NOT NULL')
+            admission_ids = [row[0] for row in self.env.cr.fetchall()]
+            if admission_ids:
+                self._rebuild(admission_ids)
+
+    @api.model
+    def _lock(self, admission_id):
+        """Return the state of the admission, created if missing and locked until commit.
+
+        Concurrent events of the same admission wait for each other, so the
+        sequence index and attempt ids are never allocated twice.
+        """
+        self.flush_model()
+        self.env.cr.execute("""
+            INSERT INTO nelc_xapi_sequence_state
+                   (admission_id, next_sequence_index, create_uid, create_date, write_uid, write_date)
+            VALUES (%(admission_id)s, 1, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (admission_id) DO NOTHING
+        """, {'admission_id': admission_id, 'uid': self.env.uid})
+        self.env.cr.execute(
+            'SELECT id FROM nelc_xapi_sequence_state WHERE admission_id = %s FOR UPDATE', (admission_id,))
+        state = self.browse(self.env.cr.fetchone()[0])
+        state.invalidate_recordset()
+        return state
+
+    def _get_last_attempt_id(self, object_id):
+        """Last attempt id queued or sent for the quiz *object_id*, 0 if none."""
+        self.ensure_one()
+        attempt = self.attempt_ids.filtered(lambda attempt: attempt.object_id == object_id)
+        return attempt.last_attempt_id if attempt else 0
+
+    def _record_event(self, event_type, statement_dict):
+        """Advance the state with an event created in the log."""
+        self.ensure_one()
+        timestamp = _parse_xapi_timestamp(statement_dict.get('timestamp'))
+        timestamp = timestamp.replace(tzinfo=None, microsecond=0) if timestamp else fields.Datetime.now()
+        vals = {'next_sequence_index': self.next_sequence_index + 1}
+        if event_type == 'registered':
+            vals['registered_at'] = timestamp
+        elif event_type == 'progressed':
+            scaled = (((statement_dict.get('result') or {}).get('score') or {}).get('scaled'))
+            vals.update(last_progress_scaled=float(scaled or 0.0), last_progress_at=timestamp)
+        elif event_type == 'attempted':
+            object_id = ((statement_dict.get('object') or {}).get('id') or '').strip()
+            attempt_id = (((statement_dict.get('context') or {}).get('extensions') or {}).get(_ATTEMPT_ID_EXTENSION))
+            attempt = self.attempt_ids.filtered(lambda attempt: attempt.object_id == object_id)
+            if attempt:
+                attempt.last_attempt_id = int(attempt_id)
+            else:
+                self.env['nelc.xapi.sequence.attempt'].create({
+                    'state_id': self.id,
+                    'object_id': object_id,
+                    'last_attempt_id': int(attempt_id),
+                })
+        self.write(vals)
+
+    @api.model
+    def _rebuild(self, admission_ids):
+        """Recompute the states of the admissions from their queued and sent events.
+
+        Used when events leave or re-enter the queue (given up, retried).
+        """
+        logs = self.env['nelc.xapi.event.log'].sudo().search(
+            [('admission_id', 'in', list(admission_ids))], order='id')
+        for admission_id in admission_ids:
+            state = self._lock(admission_id)
+            state.attempt_ids.unlink()
+            state.write({
+                'next_sequence_index': 1,
+                'registered_at': False,
+                'last_progress_scaled': 0.0,
+                'last_progress_at': False,
+            })
+            admission_logs = logs.filtered(lambda log: log.admission_id.id == admission_id)
+            for log in admission_logs.filtered(lambda log: log.status in _ACCEPTED_STATUSES):
+                try:
+                    state._record_event(log.event_type, json.loads(log.payload_json or '{}'))
+                except (ValueError, TypeError):
+                    continue
+            state.next_sequence_index = max(admission_logs.mapped('sequence_index') or [0]) + 1
+
+
+class NelcXapiSequenceAttempt(models.Model):
+    """Last attempt id of a quiz object within an admission journey."""
+
+    _name = 'nelc.xapi.sequence.attempt'
+    _description = 'NELC xAPI Sequence Attempt'
+
+    state_id = fields.Many2one('nelc.xapi.sequence.state', required=True, ondelete='cascade', index=True)
+    object_id = fields.Char(required=True)
+    last_attempt_id = fields.Integer(required=True)
+
+    _sql_constraints = [
+        ('nelc_xapi_sequence_attempt_object_uniq', 'unique(state_id, object_id)', 'One attempt counter per quiz object.'),
+    ]
@@ -24,8 +24,10 @@ class OpAdmissionNelc(models.Model):
     Fields added:
       x_nelc_national_id           – Student national ID sent as actor.name
       x_nelc_registered_sent       – True once the "registered" statement has
-                                      been successfully delivered to the LRS
-      x_nelc_registered_uuid       – UUID returned by the LRS on success
+                                      been queued for the LRS; reset if its
+                                      delivery is given up
+      x_nelc_registered_uuid       – Statement UUID, replaced by the UUID
+                                      returned by the LRS on delivery
       x_nelc_registered_last_error – Last error message from a failed attempt
     """
     _inherit = 'op.admission'
@@ -42,15 +44,17 @@ class OpAdmissionNelc(models.Model):
         string='NELC Registered Sent',
         default=False,
         copy=False,
-        help="True once the xAPI 'registered' statement was successfully sent "
-             "to the NELC LRS for this admission record.",
+        help="True once the xAPI 'registered' statement was queued for the "
+             "NELC LRS for this admission record; reset if its delivery is "
+             "given up.",
     )
 
     x_nelc_registered_uuid = fields.Char(
         string='NELC Registered UUID',
         readonly=True,
         copy=False,
-        help="Statement UUID returned by the NELC LRS after a successful send.",
+        help="Statement UUID, replaced by the UUID returned by the NELC LRS "
+             "on delivery.",
     )
 
     x_nelc_registered_last_error = fields.Text(
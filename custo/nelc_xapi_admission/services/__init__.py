@@ -1 +1,2 @@
+from . import nelc_lrs_pool
 from . import nelc_xapi_client
@@ -0,0 +1,125 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration – LRS connection pool
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+"""
+nelc_lrs_pool.py
+================
+Keep-alive HTTP sessions to the NELC LRS.
+
+Each thread of each process gets its own ``requests.Session`` with an
+``HTTPAdapter`` of ``nelc.lrs.pool_size`` connections, so consecutive POSTs
+reuse the TLS connection instead of opening a new one.  Sessions are never
+shared across prefork workers (a forked process builds its own) and are
+rebuilt when the endpoint, the auth header or the pool size change.
+
+Pool metrics (requests, connections opened and reused, latency histogram) are
+collected in memory per process; ``pop_pool_metrics()`` hands them over to be
+stored in ``nelc.xapi.pool.stats``.
+"""
+
+import logging
+import os
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Default number of keep-alive connections per session
+_POOL_SIZE = 4
+
+# Upper bounds (seconds) of the latency histogram buckets, the last bucket is open
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_local = threading.local()
+_metrics_lock = threading.Lock()
+_metrics = {}
+
+
+def latency_bucket_labels():
+    """Labels of the latency histogram buckets, in order."""
+    labels = []
+    lower = 0
+    for upper in LATENCY_BUCKETS:
+        labels.append(f'{int(lower * 1000)}-{int(upper * 1000)}ms')
+        lower = upper
+    labels.append(f'>{int(lower * 1000)}ms')
+    return labels
+
+
+def _latency_label(duration):
+    labels = latency_bucket_labels()
+    for upper, label in zip(LATENCY_BUCKETS, labels):
+        if duration < upper:
+            return label
+    return labels[-1]
+
+
+def get_session(endpoint, auth_header, pool_size=None):
+    """
+    Return the keep-alive session of the current thread for *endpoint*.
+
+    Returns ``None`` when ``requests`` is not installed.
+    """
+    try:
+        import requests as _requests
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return None
+
+    pool_size = int(pool_size or _POOL_SIZE)
+    key = (os.getpid(), endpoint, auth_header, pool_size)
+    session = getattr(_local, 'session', None)
+    if session is not None and _local.key == key:
+        return session
+    if session is not None:
+        # Configuration changed (or inherited from the parent process)
+        session.close()
+
+    session = _requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'X-Experience-API-Version': '1.0.3',
+        'Authorization': auth_header,
+        'Connection': 'keep-alive',
+    })
+    _local.session = session
+    _local.key = key
+    _logger.info('nelc_xapi: new LRS session (pool size %d) for %s', pool_size, endpoint)
+    return session
+
+
+def count_opened_connections(session):
+    """Connections opened so far by the pools of *session*."""
+    opened = 0
+    # The same adapter is mounted for http and https
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is not None:
+                opened += pool.num_connections
+    return opened
+
+
+def record_request(duration, opened):
+    """Add a request of *duration* seconds that opened *opened* connections to the metrics."""
+    with _metrics_lock:
+        _metrics['requests'] = _metrics.get('requests', 0) + 1
+        _metrics['connections_opened'] = _metrics.get('connections_opened', 0) + opened
+        _metrics['connections_reused'] = _metrics.get('connections_reused', 0) + (0 if opened else 1)
+        _metrics['total_latency'] = _metrics.get('total_latency', 0.0) + duration
+        histogram = _metrics.setdefault('latency_histogram', {})
+        label = _latency_label(duration)
+        histogram[label] = histogram.get(label, 0) + 1
+
+
+def pop_pool_metrics():
+    """Return the metrics collected since the last call, and reset them."""
+    global _metrics
+    with _metrics_lock:
+        metrics, _metrics = _metrics, {}
+    return metrics
@@ -12,7 +12,10 @@
 """
 nelc_xapi_client.py
 ===================
-Backend-only service that builds and POSTs an xAPI statement to the NELC LRS.
+Backend-only service that builds xAPI statements and queues them for the
+NELC LRS.  Statements are stored as ``pending`` rows of ``nelc.xapi.event.log``
+and POSTed by a background sender with retries, exponential backoff and a
+circuit breaker (see ``models/nelc_xapi_event_log.py``).
 
 Usage (from a controller or model method)::
 
@@ -27,6 +30,7 @@ The function returns a dict::
         "success": True,
         "uuid": "<statement-uuid>",   # present on success
         "error": None,
+        "queued": True,               # the LRS POST happens in the background
     }
     # or on failure:
     {
@@ -44,15 +48,19 @@ import json
 import logging
 import re
 import hashlib
+import time
 import uuid as _uuid_mod
 
-from odoo import fields
+from . import nelc_lrs_pool
 
 _logger = logging.getLogger(__name__)
 
 _CONNECT_TIMEOUT = 10   # seconds
 _READ_TIMEOUT = 30      # seconds
 
+# Statuses of the events the LRS has or will receive, in queue order
+_ACCEPTED_STATUSES = ('pending', 'sent')
+
 # --------------------------------------------------------------------------- #
 #  HTML stripping utility                                                      #
 # --------------------------------------------------------------------------- #
@@ -106,19 +114,19 @@ def _format_xapi_timestamp(dt_utc):
 
 def _build_course_activity_metadata(env, admission):
     """Build common actor/object/context fragments for course-level statements."""
-    ICP = env['ir.config_parameter'].sudo()
-    platform_key = ICP.get_param('nelc.platform_key', 'odoo-platform')
-    base_url = ICP.get_param('web.base.url', 'https://example.com').rstrip('/')
+    config = _get_config_snapshot(env)
+    platform_key = config.platform_key
+    base_url = config.base_url
 
     national_id = (admission.x_nelc_national_id or '').strip()
     email = (admission.email or '').strip()
 
     course = admission.course_id
     if course:
-        course_slug = re.sub(r'[^a-zA-Z0-9_-]', '-', (course.name or str(course.id))).strip('-').lower()
-        object_id = f"{base_url}/course/{course.id}-{course_slug}"
-        course_name = course.name or ''
-        course_desc = _strip_html(getattr(course, 'description', '') or '')
+        course_meta = env['nelc.xapi.config']._get_course_metadata(course.id, course.write_date)
+        object_id = f"{base_url}/course/{course.id}-{course_meta.slug}"
+        course_name = course_meta.name
+        course_desc = course_meta.description
     else:
         object_id = f"{base_url}/admission/{admission.id}"
         course_name = ''
@@ -268,7 +276,7 @@ def _build_progressed_statement(env, admission, event_data=None):
     return statement, statement_uuid
 
 
-def _build_attempted_statement(env, admission, event_data=None):
+def _build_attempted_statement(env, admission, event_data=None, state=None):
     """Build a unit-test attempted statement with incremental attempt-id."""
     event_data = event_data or {}
     meta = _build_course_activity_metadata(env, admission)
@@ -285,7 +293,7 @@ def _build_attempted_statement(env, admission, event_data=None):
     score_max = event_data.get('score_max')
     attempt_id = event_data.get('attempt_id')
     if attempt_id is None:
-        attempt_id = _next_attempt_id(env, admission, object_id)
+        attempt_id = _next_attempt_id(env, admission, object_id, state=state)
 
     success = event_data.get('success')
     try:
@@ -448,8 +456,11 @@ def _build_earned_statement(env, admission, event_data=None):
     return statement, statement_uuid
 
 
-def _build_statement(event_type, env, source_record, event_data=None):
-    """Build xAPI statement for the requested event type."""
+def _build_statement(event_type, env, source_record, event_data=None, state=None):
+    """Build xAPI statement for the requested event type.
+
+    *state* is the already locked sequence state of *source_record*, if any.
+    """
     if event_type == 'registered':
         return _build_registered_statement(env, source_record)
     if event_type == 'initialized':
@@ -457,7 +468,7 @@ def _build_statement(event_type, env, source_record, event_data=None):
     if event_type == 'progressed':
         return _build_progressed_statement(env, source_record, event_data=event_data)
     if event_type == 'attempted':
-        return _build_attempted_statement(env, source_record, event_data=event_data)
+        return _build_attempted_statement(env, source_record, event_data=event_data, state=state)
     if event_type == 'rated':
         return _build_rated_statement(env, source_record, event_data=event_data)
     if event_type == 'earned':
@@ -569,152 +580,96 @@ def _build_dedup_key(event_type, statement_dict, source_record):
     return hashlib.sha256(key_material.encode('utf-8')).hexdigest()
 
 
-def _get_sent_event_log(env, source_record, event_type):
-    """Get latest sent event log for source + event type."""
-    return env['nelc.xapi.event.log'].sudo().search([
-        ('admission_id', '=', source_record.id),
-        ('event_type', '=', event_type),
-        ('status', '=', 'sent'),
-    ], limit=1, order='id desc')
-
-
-def _extract_progress_scaled_from_payload(payload_json):
-    """Extract result.score.scaled from stored payload, returns float or None."""
-    try:
-        payload = json.loads(payload_json or '{}')
-    except Exception:
-        return None
-
-    scaled = (((payload.get('result') or {}).get('score') or {}).get('scaled'))
-    try:
-        return float(scaled)
-    except Exception:
-        return None
-
-
-def _get_latest_sent_progress_log(env, source_record):
-    """Get latest sent progressed event for this admission."""
-    return env['nelc.xapi.event.log'].sudo().search([
-        ('admission_id', '=', source_record.id),
-        ('event_type', '=', 'progressed'),
-        ('status', '=', 'sent'),
-    ], limit=1, order='id desc')
-
-
-def _extract_attempt_id_from_payload(payload_json):
-    """Extract attempt-id extension from stored payload, returns int or None."""
-    try:
-        payload = json.loads(payload_json or '{}')
-    except Exception:
-        return None
-
-    attempt_id = (((payload.get('context') or {}).get('extensions') or {}).get(
-        'http://id.tincanapi.com/extension/attempt-id'
-    ))
-    try:
-        return int(attempt_id)
-    except Exception:
-        return None
+def _get_sequence_state(env, source_record):
+    """Return the locked sequence state of this admission (see ``nelc.xapi.sequence.state``)."""
+    return env['nelc.xapi.sequence.state'].sudo()._lock(source_record.id)
 
 
-def _get_latest_sent_attempted_log(env, source_record, object_id):
-    """Get latest sent attempted event for this admission and quiz object id."""
-    return env['nelc.xapi.event.log'].sudo().search([
-        ('admission_id', '=', source_record.id),
-        ('event_type', '=', 'attempted'),
-        ('object_id', '=', object_id),
-        ('status', '=', 'sent'),
-    ], limit=1, order='id desc')
-
-
-def _next_attempt_id(env, source_record, object_id):
+def _next_attempt_id(env, source_record, object_id, state=None):
     """Return next sequential attempt id for a quiz object in an admission journey."""
-    latest_attempt = _get_latest_sent_attempted_log(env, source_record, object_id)
-    if not latest_attempt:
-        return 1
-    previous_attempt_id = _extract_attempt_id_from_payload(latest_attempt.payload_json)
-    return int((previous_attempt_id or 0) + 1)
+    state = state or _get_sequence_state(env, source_record)
+    return state._get_last_attempt_id(object_id) + 1
 
 
-def _enforce_sequence_rules(env, event_type, source_record, statement_dict):
+def _enforce_sequence_rules(env, event_type, source_record, statement_dict, state=None):
     """Ensure sequence requirements are enforced before send."""
     if event_type not in ('initialized', 'progressed', 'attempted', 'rated', 'earned'):
         return True, None
 
-    registered_log = _get_sent_event_log(env, source_record, 'registered')
-    if not registered_log:
+    state = state or _get_sequence_state(env, source_record)
+    if not state.registered_at:
         return False, 'registered statement must be sent before initialized/progressed events'
 
     if event_type == 'initialized':
-        try:
-            reg_payload = json.loads(registered_log.payload_json or '{}')
-        except Exception:
-            reg_payload = {}
-        reg_ts = _parse_xapi_timestamp(reg_payload.get('timestamp'))
+        reg_ts = state.registered_at.replace(tzinfo=datetime.timezone.utc)
         init_ts = _parse_xapi_timestamp(statement_dict.get('timestamp'))
-        if reg_ts and init_ts and reg_ts.replace(microsecond=0) == init_ts.replace(microsecond=0):
+        if init_ts and reg_ts == init_ts.replace(microsecond=0):
             statement_dict['timestamp'] = _format_xapi_timestamp(reg_ts + datetime.timedelta(seconds=1))
 
-    if event_type == 'progressed':
-        latest_progress_log = _get_latest_sent_progress_log(env, source_record)
-        if latest_progress_log:
-            previous_scaled = _extract_progress_scaled_from_payload(latest_progress_log.payload_json)
-            current_scaled = (((statement_dict.get('result') or {}).get('score') or {}).get('scaled'))
-            try:
-                current_scaled = float(current_scaled)
-            except Exception:
-                current_scaled = None
-
-            if previous_scaled is not None and current_scaled is not None and current_scaled <= previous_scaled:
-                return (
-                    False,
-                    (
-                        'progressed score must increase monotonically '
-                        f'(previous={previous_scaled}, current={current_scaled})'
-                    ),
-                )
+    if event_type == 'progressed' and state.last_progress_at:
+        previous_scaled = state.last_progress_scaled
+        current_scaled = (((statement_dict.get('result') or {}).get('score') or {}).get('scaled'))
+        try:
+            current_scaled = float(current_scaled)
+        except Exception:
+            current_scaled = None
+
+        if current_scaled is not None and current_scaled <= previous_scaled:
+            return (
+                False,
+                (
+                    'progressed score must increase monotonically '
+                    f'(previous={previous_scaled}, current={current_scaled})'
+                ),
+            )
 
-            try:
-                previous_payload = json.loads(latest_progress_log.payload_json or '{}')
-            except Exception:
-                previous_payload = {}
-            previous_ts = _parse_xapi_timestamp(previous_payload.get('timestamp'))
-            current_ts = _parse_xapi_timestamp(statement_dict.get('timestamp'))
-            if previous_ts and current_ts and current_ts <= previous_ts:
-                statement_dict['timestamp'] = _format_xapi_timestamp(previous_ts + datetime.timedelta(seconds=1))
+        # Timestamps are compared to the second, the precision of the stored state
+        previous_ts = state.last_progress_at.replace(tzinfo=datetime.timezone.utc)
+        current_ts = _parse_xapi_timestamp(statement_dict.get('timestamp'))
+        if current_ts and current_ts.replace(microsecond=0) <= previous_ts:
+            statement_dict['timestamp'] = _format_xapi_timestamp(previous_ts + datetime.timedelta(seconds=1))
 
     if event_type == 'attempted':
         object_id = ((statement_dict.get('object') or {}).get('id') or '').strip()
-        previous_attempt = _get_latest_sent_attempted_log(env, source_record, object_id)
-        current_attempt_id = _extract_attempt_id_from_payload(json.dumps(statement_dict, ensure_ascii=False))
-        if current_attempt_id is None:
+        attempt_id = (((statement_dict.get('context') or {}).get('extensions') or {}).get(
+            'http://id.tincanapi.com/extension/attempt-id'
+        ))
+        try:
+            current_attempt_id = int(attempt_id)
+        except Exception:
             return False, 'attempted event must include valid attempt-id extension'
 
-        if previous_attempt:
-            previous_attempt_id = _extract_attempt_id_from_payload(previous_attempt.payload_json)
-            expected_next = int((previous_attempt_id or 0) + 1)
-            if current_attempt_id != expected_next:
-                return (
-                    False,
-                    (
-                        'attempt-id must increment sequentially by 1 '
-                        f'(previous={previous_attempt_id}, current={current_attempt_id})'
-                    ),
-                )
+        previous_attempt_id = state._get_last_attempt_id(object_id)
+        if previous_attempt_id and current_attempt_id != previous_attempt_id + 1:
+            return (
+                False,
+                (
+                    'attempt-id must increment sequentially by 1 '
+                    f'(previous={previous_attempt_id}, current={current_attempt_id})'
+                ),
+            )
 
     return True, None
 
 
+def _get_config_snapshot(env):
+    """Return the cached NELC config params (see ``nelc.xapi.config``)."""
+    return env['nelc.xapi.config']._get_snapshot()
+
+
 def _get_lrs_config(env):
     """Read LRS endpoint and auth header from config params."""
-    ICP = env['ir.config_parameter'].sudo()
-    endpoint = ICP.get_param('nelc.lrs.endpoint', '').strip()
-    auth_header = ICP.get_param('nelc.lrs.auth_header', '').strip()
-    return endpoint, auth_header
+    config = _get_config_snapshot(env)
+    return config.endpoint, config.auth_header
 
 
-def _create_event_log(env, event_type, source_record, statement_dict, dedup_key, sequence_index=0):
-    """Create a pending ledger record for this xAPI event."""
+def _get_lrs_pool_size(env):
+    """Read the number of keep-alive LRS connections per session from config params."""
+    return _get_config_snapshot(env).pool_size
+
+
+def _prepare_event_log_vals(event_type, source_record, statement_dict, dedup_key, sequence_index=0):
+    """Values of the pending ledger record of this xAPI event."""
     admission = source_record
     course = getattr(source_record, 'course_id', None)
     actor = statement_dict.get('actor') or {}
@@ -733,79 +688,132 @@ def _create_event_log(env, event_type, source_record, statement_dict, dedup_key,
         'payload_json': json.dumps(statement_dict, ensure_ascii=False),
         'status': 'pending',
     }
-    return env['nelc.xapi.event.log'].sudo().create(event_log_vals)
+    return event_log_vals
+
+
+def _create_event_log(env, event_type, source_record, statement_dict, dedup_key, sequence_index=0):
+    """Create a pending ledger record for this xAPI event."""
+    return env['nelc.xapi.event.log'].sudo().create(
+        _prepare_event_log_vals(event_type, source_record, statement_dict, dedup_key, sequence_index))
 
 
-def _next_sequence_index(env, source_record):
+def _next_sequence_index(env, source_record, state=None):
     """Return next sequence index for events linked to this admission."""
-    last_event = env['nelc.xapi.event.log'].sudo().search([
-        ('admission_id', '=', source_record.id),
-    ], limit=1, order='sequence_index desc, id desc')
-    return int((last_event.sequence_index or 0) + 1) if last_event else 1
+    state = state or _get_sequence_state(env, source_record)
+    return state.next_sequence_index
 
 
 # --------------------------------------------------------------------------- #
 #  HTTP sender                                                                 #
 # --------------------------------------------------------------------------- #
 
-def _post_statement(endpoint, auth_header, statement_dict):
-    """
-    POST a single xAPI statement to *endpoint*.
+def _is_retryable_status(status_code):
+    """Server errors, timeouts and throttling are worth retrying; other 4xx are not."""
+    return status_code >= 500 or status_code in (408, 429)
 
-    Tries ``requests`` first; falls back to ``urllib`` if unavailable.
-    Returns ``(success: bool, response_uuid: str|None, error_msg: str|None)``.
+
+def _post_statements(endpoint, auth_header, statements, pool_size=None):
     """
-    payload = json.dumps([statement_dict], ensure_ascii=False).encode('utf-8')
-    headers = {
-        'Content-Type': 'application/json',
-        'X-Experience-API-Version': '1.0.3',
-        'Authorization': auth_header,
-    }
+    POST a list of xAPI statements to *endpoint* in one request.
+
+    Uses the keep-alive ``requests`` session of the current thread (see
+    ``nelc_lrs_pool``) with *pool_size* connections; falls back to ``urllib``,
+    one connection per request, if ``requests`` is unavailable.
+    Returns ``(success: bool, response_uuids: list|None, error_msg: str|None,
+    retryable: bool)``; ``response_uuids`` follows the order of *statements*.
+    ``retryable`` is False when the LRS rejected the request itself (the
+    whole batch is refused if one statement is invalid), True for transport
+    errors and LRS outages.
+
+    A 409 Conflict means the LRS already stores a statement with one of these
+    ids (e.g. a retry of a request whose response was lost); for a single
+    statement it counts as delivered.
+    """
+    payload = json.dumps(statements, ensure_ascii=False).encode('utf-8')
+    statement_ids = [statement.get('id') for statement in statements]
 
-    try:
-        import requests as _requests
-        resp = _requests.post(
-            endpoint,
-            data=payload,
-            headers=headers,
-            timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT),
-            verify=True,
-        )
-        resp.raise_for_status()
+    def _response_uuids(body):
         # LRS returns a JSON array of statement UUIDs on success
         try:
-            uuids = resp.json()
-            response_uuid = uuids[0] if isinstance(uuids, list) and uuids else statement_dict.get('id')
+            uuids = json.loads(body)
         except Exception:
-            response_uuid = statement_dict.get('id')
-        return True, response_uuid, None
-
-    except ImportError:
-        # Fall back to urllib
-        import urllib.request
-        import urllib.error
-        req = urllib.request.Request(endpoint, data=payload, headers=headers, method='POST')
+            uuids = None
+        if isinstance(uuids, list) and len(uuids) == len(statements):
+            return uuids
+        return statement_ids
+
+    session = nelc_lrs_pool.get_session(endpoint, auth_header, pool_size)
+    if session is not None:
+        opened_before = nelc_lrs_pool.count_opened_connections(session)
+        start = time.monotonic()
         try:
-            with urllib.request.urlopen(req, timeout=_READ_TIMEOUT) as resp:
-                body = resp.read().decode('utf-8', errors='replace')
-                try:
-                    uuids = json.loads(body)
-                    response_uuid = uuids[0] if isinstance(uuids, list) and uuids else statement_dict.get('id')
-                except Exception:
-                    response_uuid = statement_dict.get('id')
-                return True, response_uuid, None
-        except urllib.error.HTTPError as exc:
-            body = exc.read().decode('utf-8', errors='replace')[:300]
-            return False, None, f'HTTP {exc.code}: {body}'
+            resp = session.post(
+                endpoint,
+                data=payload,
+                headers={'Content-Type': 'application/json'},
+                timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT),
+                verify=True,
+            )
         except Exception as exc:
-            return False, None, str(exc)[:300]
-
+            return False, None, str(exc)[:300], True
+        finally:
+            nelc_lrs_pool.record_request(
+                time.monotonic() - start,
+                nelc_lrs_pool.count_opened_connections(session) - opened_before,
+            )
+        if resp.status_code == 409 and len(statements) == 1:
+            return True, statement_ids, None, False
+        if resp.status_code >= 400:
+            return False, None, f'HTTP {resp.status_code}: {resp.text[:300]}', _is_retryable_status(resp.status_code)
+        return True, _response_uuids(resp.text), None, False
+
+    # Fall back to urllib
+    import urllib.request
+    import urllib.error
+    headers = {
+        'Content-Type': 'application/json',
+        'X-Experience-API-Version': '1.0.3',
+        'Authorization': auth_header,
+    }
+    req = urllib.request.Request(endpoint, data=payload, headers=headers, method='POST')
+    start = time.monotonic()
+    try:
+        with urllib.request.urlopen(req, timeout=_READ_TIMEOUT) as resp:
+            body = resp.read().decode('utf-8', errors='replace')
+            return True, _response_uuids(body), None, False
+    except urllib.error.HTTPError as exc:
+        if exc.code == 409 and len(statements) == 1:
+            return True, statement_ids, None, False
+        body = exc.read().decode('utf-8', errors='replace')[:300]
+        return False, None, f'HTTP {exc.code}: {body}', _is_retryable_status(exc.code)
     except Exception as exc:
-        return False, None, str(exc)[:300]
+        return False, None, str(exc)[:300], True
+    finally:
+        nelc_lrs_pool.record_request(time.monotonic() - start, 1)
+
+
+def _post_statement(endpoint, auth_header, statement_dict, pool_size=None):
+    """
+    POST a single xAPI statement to *endpoint*.
+
+    Returns ``(success: bool, response_uuid: str|None, error_msg: str|None,
+    retryable: bool)``, see ``_post_statements``.
+    """
+    success, response_uuids, error_msg, retryable = _post_statements(
+        endpoint, auth_header, [statement_dict], pool_size=pool_size)
+    return success, response_uuids[0] if success else None, error_msg, retryable
 
 
 def send_event_statement(env, event_type, source_record, event_data=None):
-    """Generic event sender with dedup + audit log persistence."""
+    """
+    Generic event sender with dedup + audit log persistence.
+
+    The statement is only built, validated and stored as a ``pending``
+    ``nelc.xapi.event.log`` row; the LRS POST happens in the background
+    sender (``nelc.xapi.event.log._cron_send_pending``), so a slow LRS never
+    blocks the caller. ``success`` means the statement was queued.
+    The sequence state of the admission is locked once, for the whole check.
+    """
     endpoint, auth_header = _get_lrs_config(env)
     if not endpoint or not auth_header:
         msg = 'NELC LRS endpoint or auth header not configured (nelc.lrs.endpoint / nelc.lrs.auth_header)'
@@ -813,9 +821,10 @@ def send_event_statement(env, event_type, source_record, event_data=None):
         return {'success': False, 'uuid': None, 'error': msg}
 
     try:
-        statement, stmt_uuid = _build_statement(event_type, env, source_record, event_data=event_data)
+        state = _get_sequence_state(env, source_record)
+        statement, stmt_uuid = _build_statement(event_type, env, source_record, event_data=event_data, state=state)
 
-        sequence_ok, sequence_error = _enforce_sequence_rules(env, event_type, source_record, statement)
+        sequence_ok, sequence_error = _enforce_sequence_rules(env, event_type, source_record, statement, state=state)
         if not sequence_ok:
             _logger.warning('nelc_xapi: sequence violation for %s on source %s - %s', event_type, source_record.id, sequence_error)
             return {'success': False, 'uuid': None, 'error': sequence_error}
@@ -828,19 +837,22 @@ def send_event_statement(env, event_type, source_record, event_data=None):
         dedup_key = _build_dedup_key(event_type, statement, source_record)
         existing = env['nelc.xapi.event.log'].sudo().search([('dedup_key', '=', dedup_key)], limit=1)
         if existing:
-            if existing.status in ('pending', 'sent', 'skipped_duplicate'):
-                _logger.info(
-                    'nelc_xapi: duplicate %s statement skipped for source %s (dedup=%s)',
-                    event_type, source_record.id, dedup_key,
-                )
-                if existing.status != 'skipped_duplicate':
-                    existing.write({'status': 'skipped_duplicate'})
-                return {
-                    'success': True,
-                    'uuid': existing.response_uuid or existing.statement_uuid,
-                    'error': None,
-                    'skipped_duplicate': True,
-                }
+            if existing.status == 'failed':
+                # Given up earlier: queue the same statement again
+                existing.action_retry()
+                return {'success': True, 'uuid': existing.statement_uuid, 'error': None, 'queued': True}
+            _logger.info(
+                'nelc_xapi: duplicate %s statement skipped for source %s (dedup=%s)',
+                event_type, source_record.id, dedup_key,
+            )
+            if existing.status == 'sent':
+                existing.write({'status': 'skipped_duplicate'})
+            return {
+                'success': True,
+                'uuid': existing.response_uuid or existing.statement_uuid,
+                'error': None,
+                'skipped_duplicate': True,
+            }
 
         event_log = _create_event_log(
             env,
@@ -848,37 +860,15 @@ def send_event_statement(env, event_type, source_record, event_data=None):
             source_record,
             statement,
             dedup_key,
-            sequence_index=_next_sequence_index(env, source_record),
+            sequence_index=_next_sequence_index(env, source_record, state=state),
         )
+        state._record_event(event_type, statement)
+        event_log._trigger_sending()
         _logger.info(
-            'nelc_xapi: sending "%s" statement %s for source %s',
+            'nelc_xapi: queued "%s" statement %s for source %s',
             event_type, stmt_uuid, source_record.id,
         )
-
-        success, response_uuid, error_msg = _post_statement(endpoint, auth_header, statement)
-        if success:
-            event_log.write({
-                'status': 'sent',
-                'response_uuid': (response_uuid or stmt_uuid),
-                'sent_at': fields.Datetime.now(),
-                'error_message': False,
-            })
-            _logger.info(
-                'nelc_xapi: statement %s accepted by LRS (response uuid: %s)',
-                stmt_uuid, response_uuid,
-            )
-            return {'success': True, 'uuid': response_uuid or stmt_uuid, 'error': None}
-
-        event_log.write({
-            'status': 'failed',
-            'response_uuid': False,
-            'error_message': error_msg,
-        })
-        _logger.error(
-            'nelc_xapi: LRS rejected statement %s for source %s - %s',
-            stmt_uuid, source_record.id, error_msg,
-        )
-        return {'success': False, 'uuid': None, 'error': error_msg}
+        return {'success': True, 'uuid': stmt_uuid, 'error': None, 'queued': True}
 
     except NotImplementedError as exc:
         _logger.warning('nelc_xapi: %s', str(exc))
@@ -891,6 +881,105 @@ def send_event_statement(env, event_type, source_record, event_data=None):
         return {'success': False, 'uuid': None, 'error': str(exc)[:300]}
 
 
+def queue_event_journeys(env, journeys):
+    """
+    Queue the statements of several admission journeys at once.
+
+    *journeys* is a list of ``(admission, [(event_type, event_data), ...])``
+    with the events of each admission in journey order.  Statements are
+    checked like in ``send_event_statement``, but the duplicates are looked
+    up with a single ``dedup_key`` query and the ledger rows are created
+    together.  Statements given up earlier are queued again.  Attempt ids are
+    allocated when the statements are built, so a journey holds at most one
+    ``attempted`` event per quiz.
+
+    Returns one dict per event, in journey order, with keys ``admission``,
+    ``event_type``, ``outcome`` (``queued``, ``requeued``, ``duplicate`` or
+    ``rejected``), ``uuid`` and ``error``.
+    """
+    results = []
+    endpoint, auth_header = _get_lrs_config(env)
+    if not endpoint or not auth_header:
+        msg = 'NELC LRS endpoint or auth header not configured (nelc.lrs.endpoint / nelc.lrs.auth_header)'
+        _logger.warning('nelc_xapi: %s', msg)
+        for admission, events in journeys:
+            for event_type, _event_data in events:
+                results.append({
+                    'admission': admission, 'event_type': event_type,
+                    'outcome': 'rejected', 'uuid': None, 'error': msg,
+                })
+        return results
+
+    # Each sequence state is locked once, for all the events of its admission
+    states = {}
+    built = []
+    for admission, events in journeys:
+        if admission.id not in states:
+            states[admission.id] = _get_sequence_state(env, admission)
+        for event_type, event_data in events:
+            try:
+                statement, stmt_uuid = _build_statement(
+                    event_type, env, admission, event_data=event_data, state=states[admission.id])
+                dedup_key = _build_dedup_key(event_type, statement, admission)
+                built.append((admission, event_type, statement, stmt_uuid, dedup_key, None))
+            except Exception as exc:
+                built.append((admission, event_type, None, None, None, str(exc)[:300]))
+
+    event_logs = env['nelc.xapi.event.log'].sudo()
+    keys = [dedup_key for *_rest, dedup_key, _error in built if dedup_key]
+    existing = {
+        log.dedup_key: log
+        for log in event_logs.search_fetch(
+            [('dedup_key', 'in', keys)], ['dedup_key', 'status', 'statement_uuid', 'response_uuid'])
+    }
+    failed = event_logs.browse([log.id for log in existing.values() if log.status == 'failed'])
+    if failed:
+        # Given up earlier: queue the same statements again
+        failed.action_retry()
+
+    vals_list = []
+    queued_keys = set()
+    for admission, event_type, statement, stmt_uuid, dedup_key, error in built:
+        result = {'admission': admission, 'event_type': event_type, 'uuid': stmt_uuid, 'error': error}
+        results.append(result)
+        if error:
+            result['outcome'] = 'rejected'
+            continue
+        if dedup_key in existing:
+            log = existing[dedup_key]
+            result.update(
+                outcome='requeued' if log in failed else 'duplicate',
+                uuid=log.response_uuid or log.statement_uuid,
+            )
+            continue
+        if dedup_key in queued_keys:
+            result['outcome'] = 'duplicate'
+            continue
+
+        state = states[admission.id]
+        ok, error = _enforce_sequence_rules(env, event_type, admission, statement, state=state)
+        if ok:
+            ok, error = _validate_statement(statement, event_type)
+        if not ok:
+            result.update(outcome='rejected', error=error)
+            continue
+
+        vals_list.append(_prepare_event_log_vals(
+            event_type, admission, statement, dedup_key, sequence_index=state.next_sequence_index))
+        state._record_event(event_type, statement)
+        queued_keys.add(dedup_key)
+        result['outcome'] = 'queued'
+
+    if vals_list:
+        event_logs.create(vals_list)
+        event_logs._trigger_sending()
+    _logger.info(
+        'nelc_xapi: queued %d statements for %d journeys (%d requeued)',
+        len(vals_list), len(journeys), len(failed),
+    )
+    return results
+
+
 # --------------------------------------------------------------------------- #
 #  Public API                                                                  #
 # --------------------------------------------------------------------------- #
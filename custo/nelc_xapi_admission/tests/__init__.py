@@ -0,0 +1,4 @@
+from . import test_xapi_outbox
+from . import test_xapi_sequence_state
+from . import test_xapi_config
+from . import test_xapi_backfill
@@ -0,0 +1,120 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - backfill tests
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+
+class TestXapiBackfill(TransactionCase):
+
+    def setUp(self):
+        super(TestXapiBackfill, self).setUp()
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('nelc.lrs.endpoint', 'https://lrs.example.com/xAPI/statements')
+        ICP.set_param('nelc.lrs.auth_header', 'Basic dGVzdDp0ZXN0')
+        department = self.env['op.department'].create({'name': 'Backfill Department', 'code': 'XBF'})
+        course = self.env['op.course'].create({
+            'name': 'Backfill Course',
+            'code': 'XBF-1',
+            'department_id': department.id,
+        })
+        register = self.env['op.admission.register'].create({
+            'name': 'Backfill Register',
+            'course_id': course.id,
+        })
+        self.admissions = self.env['op.admission']
+        for index, state in enumerate(('confirm', 'submit')):
+            admission = self.env['op.admission'].create({
+                'name': f'Backfill Learner {index}',
+                'first_name': 'Backfill',
+                'last_name': f'Learner {index}',
+                'email': f'backfill.learner{index}@example.com',
+                'birth_date': '2000-01-01',
+                'gender': 'm',
+                'register_id': register.id,
+                'course_id': course.id,
+                'department_id': department.id,
+                'x_nelc_national_id': f'100000000{index}',
+            })
+            admission.state = state
+            self.admissions |= admission
+        self.logs = self.env['nelc.xapi.event.log']
+
+    def _backfill(self, **vals):
+        return self.env['nelc.xapi.backfill'].create(dict(
+            admission_domain=str([('id', 'in', self.admissions.ids)]), **vals))
+
+    def _admission_logs(self):
+        return self.logs.search([('admission_id', 'in', self.admissions.ids)], order='id')
+
+    def test_dry_run_queues_nothing(self):
+        """The dry run reports the journeys without queuing statements."""
+        backfill = self._backfill()
+
+        backfill.action_dry_run()
+
+        self.assertFalse(self._admission_logs())
+        self.assertFalse(self.admissions[0].x_nelc_registered_sent)
+        self.assertEqual(backfill.admission_count, 2)
+        self.assertIn('8 to queue', backfill.dry_run_report)
+        self.assertIn('progressed 0.50: queued', backfill.dry_run_report)
+
+    def test_backfill_queues_journeys_once(self):
+        """Journeys are queued in order; a second backfill finds them all queued."""
+        backfill = self._backfill()
+        backfill.action_start()
+        self.env['nelc.xapi.backfill']._cron_run()
+
+        self.assertEqual(backfill.state, 'done')
+        self.assertEqual(backfill.last_admission_id, self.admissions[-1].id)
+        self.assertEqual((backfill.queued_count, backfill.rejected_count), (8, 0))
+        logs = self._admission_logs().filtered(lambda log: log.admission_id == self.admissions[0])
+        self.assertEqual(
+            logs.mapped('event_type'), ['registered', 'initialized', 'progressed', 'progressed', 'progressed'])
+        self.assertEqual(logs.mapped('sequence_index'), [1, 2, 3, 4, 5])
+        self.assertTrue(self.admissions[0].x_nelc_registered_sent)
+
+        replay = self._backfill()
+        replay.action_start()
+        self.env['nelc.xapi.backfill']._cron_run()
+
+        self.assertEqual((replay.queued_count, replay.duplicate_count), (0, 8))
+        self.assertEqual(len(self._admission_logs()), 8)
+
+    def test_rate_limit_stops_at_checkpoint(self):
+        """A run stops once the statements of the minute are queued and resumes after the checkpoint."""
+        backfill = self._backfill(rate_limit=1, chunk_size=1)
+        backfill.action_start()
+
+        self.env['nelc.xapi.backfill']._cron_run()
+        self.assertEqual(backfill.state, 'running')
+        self.assertEqual((backfill.processed_count, backfill.last_admission_id), (1, self.admissions[0].id))
+
+        backfill.action_cancel()
+        backfill.action_start()
+        self.env['nelc.xapi.backfill']._cron_run()
+        self.assertEqual(backfill.processed_count, 2)
+        self.assertEqual(backfill.queued_count, 8)
+
+    def test_run_is_bounded_by_chunks(self):
+        """A run over admissions already queued stops after its chunks and moves the checkpoint."""
+        backfill = self._backfill()
+        backfill.action_start()
+        self.env['nelc.xapi.backfill']._cron_run()
+
+        replay = self._backfill(chunk_size=1)
+        replay.action_start()
+        with patch('odoo.addons.nelc_xapi_admission.models.nelc_xapi_backfill.MAX_CHUNKS_PER_RUN', 1):
+            self.env['nelc.xapi.backfill']._cron_run()
+        self.assertEqual(replay.state, 'running')
+        self.assertEqual((replay.processed_count, replay.last_admission_id), (1, self.admissions[0].id))
+        self.assertEqual(replay.duplicate_count, 5)
+
+        self.env['nelc.xapi.backfill']._cron_run()
+        self.assertEqual(replay.state, 'done')
+        self.assertEqual((replay.processed_count, replay.duplicate_count, replay.queued_count), (2, 8, 0))
@@ -0,0 +1,45 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - configuration cache tests
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+from datetime import timedelta
+
+from odoo.tests.common import TransactionCase
+
+
+class TestXapiConfig(TransactionCase):
+
+    def test_snapshot_follows_parameters(self):
+        """The snapshot is reused until a parameter changes."""
+        config = self.env['nelc.xapi.config']
+        self.env['ir.config_parameter'].sudo().set_param('nelc.platform_key', 'PLATFORM-A')
+        snapshot = config._get_snapshot()
+        self.assertEqual(snapshot.platform_key, 'PLATFORM-A')
+        self.assertIs(config._get_snapshot(), snapshot)
+
+        self.env['ir.config_parameter'].sudo().set_param('nelc.platform_key', 'PLATFORM-B')
+        self.assertEqual(config._get_snapshot().platform_key, 'PLATFORM-B')
+
+        config._invalidate_snapshot()
+        self.assertIsNot(config._get_snapshot(), snapshot)
+
+    def test_course_metadata_keyed_on_write_date(self):
+        """Course metadata is computed once per course version."""
+        department = self.env['op.department'].create({'name': 'Config Department', 'code': 'CFG'})
+        course = self.env['op.course'].create({
+            'name': 'Data Science 101',
+            'code': 'CFG-1',
+            'department_id': department.id,
+        })
+        config = self.env['nelc.xapi.config']
+        metadata = config._get_course_metadata(course.id, course.write_date)
+        self.assertEqual((metadata.slug, metadata.name), ('data-science-101', 'Data Science 101'))
+        self.assertIs(config._get_course_metadata(course.id, course.write_date), metadata)
+
+        course.name = 'Data Science 102'
+        # write_date only moves between transactions
+        metadata = config._get_course_metadata(course.id, course.write_date + timedelta(seconds=1))
+        self.assertEqual((metadata.slug, metadata.name), ('data-science-102', 'Data Science 102'))
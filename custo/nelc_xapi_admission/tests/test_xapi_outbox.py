@@ -0,0 +1,177 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - statement outbox tests
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+from ..models.nelc_xapi_event_log import CIRCUIT_FAILURE_THRESHOLD
+from ..services import nelc_lrs_pool
+
+
+class LocalLrs:
+    """Stand-in LRS on localhost answering every POST with ``status``.
+
+    Requests containing a statement id listed in ``rejected`` get a 400.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.rejected = set()
+        self.requests = []
+        self.statements = []
+        lrs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                statements = json.loads(body)
+                ids = [statement['id'] for statement in statements]
+                lrs.requests.append(ids)
+                status = 400 if lrs.rejected.intersection(ids) else lrs.status
+                if status < 300:
+                    lrs.statements.extend(statements)
+                answer = json.dumps(ids).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(answer)))
+                self.end_headers()
+                self.wfile.write(answer)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.endpoint = f'http://127.0.0.1:{self.server.server_port}/xAPI/statements'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestXapiOutbox(TransactionCase):
+
+    def setUp(self):
+        super(TestXapiOutbox, self).setUp()
+        self.lrs = LocalLrs()
+        self.addCleanup(self.lrs.close)
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('nelc.lrs.endpoint', self.lrs.endpoint)
+        ICP.set_param('nelc.lrs.auth_header', 'Basic dGVzdDp0ZXN0')
+        self.env['nelc.xapi.event.log']._set_circuit_state(0)
+        nelc_lrs_pool.pop_pool_metrics()
+
+    def _queue(self, count):
+        logs = self.env['nelc.xapi.event.log']
+        for index in range(count):
+            statement_uuid = str(uuid.uuid4())
+            logs |= logs.create({
+                'event_type': 'registered',
+                'verb_iri': 'http://adlnet.gov/expapi/verbs/registered',
+                'object_id': f'https://example.com/course/{index}',
+                'object_type': 'Activity',
+                'statement_uuid': statement_uuid,
+                'dedup_key': statement_uuid,
+                'payload_json': json.dumps({'id': statement_uuid}),
+            })
+        return logs
+
+    def test_pending_statements_are_delivered(self):
+        """The sender posts the queued statements and records their delivery."""
+        logs = self._queue(3)
+        self.assertEqual(set(logs.mapped('status')), {'pending'})
+
+        sent = self.env['nelc.xapi.event.log']._cron_send_pending()
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(len(self.lrs.requests), 1)
+        self.assertEqual([statement['id'] for statement in self.lrs.statements], logs.mapped('statement_uuid'))
+        self.assertEqual(set(logs.mapped('status')), {'sent'})
+        self.assertEqual(logs.mapped('response_uuid'), logs.mapped('statement_uuid'))
+
+    def test_rejected_statement_fails_at_once(self):
+        """A 4xx answer gives the statement up without retrying it."""
+        log = self._queue(1)
+        self.lrs.status = 400
+
+        self.env['nelc.xapi.event.log']._cron_send_pending()
+
+        self.assertEqual((log.status, log.attempt_count), ('failed', 1))
+        self.assertIn('HTTP 400', log.error_message)
+
+    def test_batches_isolate_rejected_statement(self):
+        """Statements go out in batches; a rejected batch is retried one by one."""
+        self.env['ir.config_parameter'].sudo().set_param('nelc.lrs.batch_size', 2)
+        logs = self._queue(5)
+        self.lrs.rejected.add(logs[2].statement_uuid)
+
+        sent = self.env['nelc.xapi.event.log']._cron_send_pending()
+
+        self.assertEqual(sent, 4)
+        # 3 batches, plus 2 single requests for the rejected batch
+        self.assertEqual(len(self.lrs.requests), 5)
+        self.assertEqual(self.lrs.requests[0], logs[:2].mapped('statement_uuid'))
+        self.assertEqual(logs.mapped('status'), ['sent', 'sent', 'failed', 'sent', 'sent'])
+
+    def test_outage_backs_off_and_opens_circuit(self):
+        """LRS outages are retried later; consecutive ones stop the sender."""
+        self.env['ir.config_parameter'].sudo().set_param('nelc.lrs.batch_size', 1)
+        logs = self._queue(CIRCUIT_FAILURE_THRESHOLD + 2)
+        self.lrs.status = 503
+        before = fields.Datetime.now()
+
+        self.env['nelc.xapi.event.log']._cron_send_pending()
+
+        attempted = logs[:CIRCUIT_FAILURE_THRESHOLD]
+        self.assertEqual(len(self.lrs.requests), CIRCUIT_FAILURE_THRESHOLD)
+        self.assertEqual(set(attempted.mapped('status')), {'pending'})
+        self.assertEqual(set(attempted.mapped('attempt_count')), {1})
+        self.assertTrue(all(log.next_attempt_at > before for log in attempted))
+        self.assertEqual(set((logs - attempted).mapped('attempt_count')), {0})
+
+        failures, open_until = self.env['nelc.xapi.event.log']._get_circuit_state()
+        self.assertEqual(failures, CIRCUIT_FAILURE_THRESHOLD)
+        self.assertGreater(open_until, before)
+        # The state lives in its own row, not in the system parameters that clear every cache
+        self.assertEqual(self.env['nelc.xapi.circuit'].search([]).failures, CIRCUIT_FAILURE_THRESHOLD)
+        self.assertFalse(self.env['ir.config_parameter'].sudo().get_param('nelc.lrs.circuit_failures'))
+
+        # While the circuit is open nothing is posted, even when the LRS is back
+        self.lrs.status = 200
+        self.assertEqual(self.env['nelc.xapi.event.log']._cron_send_pending(), 0)
+        self.assertEqual(len(self.lrs.requests), CIRCUIT_FAILURE_THRESHOLD)
+
+    def test_connections_are_reused(self):
+        """Consecutive requests share one keep-alive connection, and the pool metrics are stored."""
+        self.env['ir.config_parameter'].sudo().set_param('nelc.lrs.batch_size', 1)
+        self._queue(3)
+        stats = self.env['nelc.xapi.pool.stats'].search([])
+        stats.action_reset()
+
+        self.env['nelc.xapi.event.log']._cron_send_pending()
+
+        stats = self.env['nelc.xapi.pool.stats'].search([])
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats.requests_count, 3)
+        self.assertEqual(stats.connections_opened, 1)
+        self.assertEqual(stats.connections_reused, 2)
+        self.assertEqual(sum(stats.latency_histogram.values()), 3)
+
+    def test_session_rebuilt_on_config_change(self):
+        """A new session is built when the endpoint or the credentials change."""
+        session = nelc_lrs_pool.get_session(self.lrs.endpoint, 'Basic a')
+        self.assertIs(nelc_lrs_pool.get_session(self.lrs.endpoint, 'Basic a'), session)
+        rebuilt = nelc_lrs_pool.get_session(self.lrs.endpoint, 'Basic b')
+        self.assertIsNot(rebuilt, session)
+        self.assertEqual(rebuilt.headers['Authorization'], 'Basic b')
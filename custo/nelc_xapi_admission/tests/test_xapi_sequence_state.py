@@ -0,0 +1,144 @@
+###############################################################################
+#
+#    NELC xAPI Admission Integration - sequence state tests
+#    Copyright (C) 2024 Edafa Inc.
+#
+###############################################################################
+
+import json
+import uuid
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+from ..models.nelc_xapi_event_log import _REBUILD_ADMISSIONS_KEY
+from ..services.nelc_xapi_client import (
+    _enforce_sequence_rules,
+    _get_sequence_state,
+    _next_attempt_id,
+    _next_sequence_index,
+    send_event_statement,
+)
+
+QUIZ = 'https://example.com/course/1/quiz/final'
+
+
+class TestXapiSequenceState(TransactionCase):
+
+    def setUp(self):
+        super(TestXapiSequenceState, self).setUp()
+        department = self.env['op.department'].create({'name': 'xAPI Department', 'code': 'XAPI'})
+        course = self.env['op.course'].create({
+            'name': 'xAPI Course',
+            'code': 'XAPI-1',
+            'department_id': department.id,
+        })
+        register = self.env['op.admission.register'].create({
+            'name': 'xAPI Register',
+            'course_id': course.id,
+        })
+        self.admission = self.env['op.admission'].create({
+            'name': 'xAPI Learner',
+            'first_name': 'xAPI',
+            'last_name': 'Learner',
+            'email': 'xapi.learner@example.com',
+            'birth_date': '2000-01-01',
+            'gender': 'm',
+            'register_id': register.id,
+            'course_id': course.id,
+            'department_id': department.id,
+        })
+
+    def _record(self, event_type, statement):
+        _get_sequence_state(self.env, self.admission)._record_event(event_type, statement)
+
+    def test_events_require_registered_and_keep_timestamps_increasing(self):
+        """Later events wait for registered; same-second timestamps are moved forward."""
+        initialized = {'timestamp': '2024-05-01T10:00:00.400Z'}
+        ok, error = _enforce_sequence_rules(self.env, 'initialized', self.admission, initialized)
+        self.assertFalse(ok)
+        self.assertIn('registered', error)
+
+        self._record('registered', {'timestamp': '2024-05-01T10:00:00.100Z'})
+        ok, error = _enforce_sequence_rules(self.env, 'initialized', self.admission, initialized)
+        self.assertTrue(ok)
+        self.assertEqual(initialized['timestamp'], '2024-05-01T10:00:01.000Z')
+
+        self._record('progressed', {'timestamp': '2024-05-01T10:05:00.000Z', 'result': {'score': {'scaled': 0.2}}})
+        lower = {'timestamp': '2024-05-01T10:06:00.000Z', 'result': {'score': {'scaled': 0.1}}}
+        self.assertFalse(_enforce_sequence_rules(self.env, 'progressed', self.admission, lower)[0])
+        same_second = {'timestamp': '2024-05-01T10:05:00.900Z', 'result': {'score': {'scaled': 0.5}}}
+        self.assertTrue(_enforce_sequence_rules(self.env, 'progressed', self.admission, same_second)[0])
+        self.assertEqual(same_second['timestamp'], '2024-05-01T10:05:01.000Z')
+
+    def test_attempt_ids_and_sequence_index(self):
+        """Attempt ids increase per quiz object and each event takes the next sequence index."""
+        self._record('registered', {'timestamp': '2024-05-01T10:00:00.000Z'})
+        self.assertEqual(_next_sequence_index(self.env, self.admission), 2)
+        self.assertEqual(_next_attempt_id(self.env, self.admission, QUIZ), 1)
+
+        attempted = {
+            'object': {'id': QUIZ},
+            'context': {'extensions': {'http://id.tincanapi.com/extension/attempt-id': 1}},
+        }
+        self.assertTrue(_enforce_sequence_rules(self.env, 'attempted', self.admission, attempted)[0])
+        self._record('attempted', attempted)
+        self.assertEqual(_next_attempt_id(self.env, self.admission, QUIZ), 2)
+        self.assertEqual(_next_attempt_id(self.env, self.admission, QUIZ + '/other'), 1)
+        self.assertEqual(_next_sequence_index(self.env, self.admission), 3)
+
+        skipped = dict(attempted, context={'extensions': {'http://id.tincanapi.com/extension/attempt-id': 3}})
+        ok, error = _enforce_sequence_rules(self.env, 'attempted', self.admission, skipped)
+        self.assertFalse(ok)
+        self.assertIn('previous=1', error)
+
+    def test_given_up_event_leaves_the_state(self):
+        """The state is rebuilt from the queued and sent events when one is given up."""
+        logs = self.env['nelc.xapi.event.log']
+        for index, (event_type, scaled) in enumerate((('registered', None), ('progressed', 0.3), ('progressed', 0.6))):
+            statement = {'id': str(uuid.uuid4()), 'timestamp': f'2024-05-01T10:0{index}:00.000Z'}
+            if scaled is not None:
+                statement['result'] = {'score': {'scaled': scaled}}
+            logs |= logs.create({
+                'event_type': event_type,
+                'verb_iri': f'http://adlnet.gov/expapi/verbs/{event_type}',
+                'admission_id': self.admission.id,
+                'object_id': 'https://example.com/course/1',
+                'object_type': 'Activity',
+                'statement_uuid': statement['id'],
+                'dedup_key': statement['id'],
+                'sequence_index': index + 1,
+                'payload_json': json.dumps(statement),
+            })
+            self._record(event_type, statement)
+
+        logs[2]._mark_failed('HTTP 400: invalid', False)
+
+        # The sender transaction leaves the state alone; it is rebuilt after the commit
+        state = _get_sequence_state(self.env, self.admission)
+        self.assertAlmostEqual(state.last_progress_scaled, 0.6)
+        self.assertEqual(self.env.cr.postcommit.data[_REBUILD_ADMISSIONS_KEY], {self.admission.id})
+
+        self.env['nelc.xapi.sequence.state']._rebuild([self.admission.id])
+        self.assertAlmostEqual(state.last_progress_scaled, 0.3)
+        self.assertEqual(state.next_sequence_index, 4)
+        self.assertTrue(state.registered_at)
+
+    def test_statement_locks_the_state_once(self):
+        """Sending a statement locks the sequence state of its admission a single time."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('nelc.lrs.endpoint', 'https://lrs.example.com/xAPI/statements')
+        ICP.set_param('nelc.lrs.auth_header', 'Basic dGVzdDp0ZXN0')
+        State = self.registry['nelc.xapi.sequence.state']
+        lock = State._lock
+        locked = []
+
+        def _lock(model, admission_id):
+            locked.append(admission_id)
+            return lock(model, admission_id)
+
+        with patch.object(State, '_lock', _lock):
+            send_event_statement(self.env, 'registered', self.admission)
+            send_event_statement(self.env, 'initialized', self.admission)
+
+        self.assertEqual(locked, [self.admission.id, self.admission.id])
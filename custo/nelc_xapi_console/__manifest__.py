@@ -1,6 +1,6 @@
 {
     'name': 'NELC xAPI Console',
-    'version': '19.0.1.1.0',
+    'version': '19.0.1.3.0',
     'license': 'LGPL-3',
     'category': 'Education',
     'sequence': 15,
@@ -15,6 +15,8 @@ Features:
 - One-click sync/apply with ir.config_parameter
 - Manual statement test runner (registered/initialized/progressed/attempted/rated/earned)
 - Event log list/form access from dedicated menu
+- LRS connection pool metrics (connections opened/reused, latency histogram)
+- Backfill of historical admissions (dry-run report, rate-limited replay with checkpoint)
     """,
     'author': 'Edafa Inc',
     'website': 'https://www.edafa.org',
@@ -30,6 +32,8 @@ Features:
         'views/nelc_xapi_console_settings_views.xml',
         'views/nelc_xapi_manual_test_views.xml',
         'views/nelc_xapi_event_log_views.xml',
+        'views/nelc_xapi_pool_stats_views.xml',
+        'views/nelc_xapi_backfill_views.xml',
         'views/menu_views.xml',
     ],
     'installable': True,
@@ -14,6 +14,8 @@ class NelcXapiConsoleSettings(models.Model):
     odoo_base_url = fields.Char(string='Odoo Base URL', required=False)
     platform_name_ar = fields.Char(string='Platform Name (ar-SA)')
     platform_name_en = fields.Char(string='Platform Name (en-US)')
+    lrs_pool_size = fields.Integer(string='LRS Connection Pool Size', default=4)
+    lrs_batch_size = fields.Integer(string='Statements per LRS Request', default=50)
 
     last_synced_at = fields.Datetime(readonly=True)
     last_applied_at = fields.Datetime(readonly=True)
@@ -43,6 +45,8 @@ class NelcXapiConsoleSettings(models.Model):
                 'odoo_base_url': icp.get_param('web.base.url', ''),
                 'platform_name_ar': icp.get_param('nelc.platform.name.ar', ''),
                 'platform_name_en': icp.get_param('nelc.platform.name.en', ''),
+                'lrs_pool_size': int(icp.get_param('nelc.lrs.pool_size', 4) or 4),
+                'lrs_batch_size': int(icp.get_param('nelc.lrs.batch_size', 50) or 50),
                 'last_synced_at': now,
             })
         return True
@@ -58,5 +62,8 @@ class NelcXapiConsoleSettings(models.Model):
                 icp.set_param('web.base.url', rec.odoo_base_url)
             icp.set_param('nelc.platform.name.ar', rec.platform_name_ar or '')
             icp.set_param('nelc.platform.name.en', rec.platform_name_en or '')
+            icp.set_param('nelc.lrs.pool_size', rec.lrs_pool_size or 4)
+            icp.set_param('nelc.lrs.batch_size', rec.lrs_batch_size or 50)
             rec.last_applied_at = now
+        self.env['nelc.xapi.config']._invalidate_snapshot()
         return True